@@ -1,3 +1,8 @@
 from django.contrib import admin
 
 # Register your models here.
+from .models import RoleScoreCacheEntry, JobMatch, UserMatchState
+
+admin.site.register(RoleScoreCacheEntry)
+admin.site.register(JobMatch)
+admin.site.register(UserMatchState)
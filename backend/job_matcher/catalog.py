@@ -0,0 +1,115 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from django.conf import settings
+
+from .title_index import TitleIndex
+
+logger = logging.getLogger(__name__)
+
+# Scraped jobs served by the match endpoint
+JOBS_FILE = getattr(settings, 'JOBS_FILE', os.path.join(settings.BASE_DIR, 'scraper', 'scraped_jobs.json'))
+
+_lock = threading.Lock()
+_catalog = None
+
+
+class JobRecord:
+    """One scraped job, without the per-dict overhead of the raw JSON objects."""
+    __slots__ = ('position', 'company', 'source_url', 'apply_link')
+
+    def __init__(self, position: str, company: str, source_url: str, apply_link: str):
+        self.position = position
+        self.company = company
+        self.source_url = source_url
+        self.apply_link = apply_link
+
+    @classmethod
+    def from_dict(cls, job: dict):
+        return cls(
+            position=job.get('Job Position', '') or '',
+            company=job.get('Company', 'Unknown Company'),
+            source_url=job.get('Source URL', '#'),
+            apply_link=job.get('Apply Link', ''),
+        )
+
+    def __repr__(self):
+        return f"JobRecord({self.position!r}, {self.company!r})"
+
+
+class JobCatalog:
+    """A snapshot of the scraped jobs file, with its distinct titles and the index over them."""
+
+    def __init__(self, jobs: list, version: str, mtime: float = None, size: int = None):
+        self.records = tuple(JobRecord.from_dict(job) for job in jobs if isinstance(job, dict))
+        self.version = version
+        self.mtime = mtime
+        self.size = size
+        # Distinct non-empty titles, in catalog order
+        self.titles = tuple(dict.fromkeys(record.position for record in self.records if record.position))
+        self.title_index = TitleIndex(self.titles)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __repr__(self):
+        return f"JobCatalog(version={self.version}, jobs={len(self.records)}, titles={len(self.titles)})"
+
+
+def _checksum(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+def get_catalog() -> JobCatalog:
+    """Return the current job catalog, loading it on first use and reloading it when the file changes.
+
+    A file that changed but cannot be parsed leaves the previous catalog in
+    place. With nothing loaded yet, raises FileNotFoundError for a missing file
+    and ValueError for invalid JSON.
+    """
+    global _catalog
+
+    try:
+        stat = os.stat(JOBS_FILE)
+    except OSError:
+        if _catalog is None:
+            raise
+        logger.warning(f"Jobs file {JOBS_FILE} is gone; serving the loaded catalog")
+        return _catalog
+
+    current = _catalog
+    if current is not None and (current.mtime, current.size) == (stat.st_mtime, stat.st_size):
+        return current
+
+    with _lock:
+        current = _catalog
+        if current is not None and (current.mtime, current.size) == (stat.st_mtime, stat.st_size):
+            return current
+
+        try:
+            with open(JOBS_FILE, 'rb') as f:
+                raw = f.read()
+            version = _checksum(raw)
+            if current is not None and current.version == version:
+                # Touched but unchanged: keep the built index
+                current.mtime, current.size = stat.st_mtime, stat.st_size
+                return current
+            jobs = json.loads(raw)
+            if not isinstance(jobs, list):
+                raise ValueError(f"Expected a list of jobs, got {type(jobs).__name__}")
+        except (OSError, ValueError) as e:
+            if current is None:
+                raise
+            logger.error(f"Keeping previously loaded job catalog; {JOBS_FILE} is unusable: {e}")
+            # Do not re-read the broken file until it changes again
+            current.mtime, current.size = stat.st_mtime, stat.st_size
+            return current
+
+        # Swap in the new snapshot; requests holding the old one keep using it
+        _catalog = JobCatalog(jobs, version=version, mtime=stat.st_mtime, size=stat.st_size)
+        logger.info(f"Loaded {_catalog}")
+        return _catalog
+
@@ -0,0 +1,134 @@
+import base64
+import binascii
+import hashlib
+import json
+import logging
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils.http import quote_etag
+
+from .models import JobListing
+from .search import search_listings
+
+logger = logging.getLogger(__name__)
+
+# Listings per page when the request does not ask for a size, and the most it may ask for
+LISTING_PAGE_SIZE = getattr(settings, 'LISTING_PAGE_SIZE', 100)
+LISTING_PAGE_MAX_SIZE = getattr(settings, 'LISTING_PAGE_MAX_SIZE', 500)
+
+# Fields a request may select; the description is the bulk of a listing, so it is left out unless asked for
+LISTING_FIELDS = (
+    'id', 'title', 'company', 'location', 'description', 'required_skills', 'source', 'apply_link',
+    'created_at', 'updated_at',
+)
+DEFAULT_LISTING_FIELDS = ('id', 'title', 'company', 'location', 'required_skills', 'source')
+
+# Page order: catalog order when browsing, best rank first when searching (ties by newest)
+BROWSE_ORDERING = ('id',)
+SEARCH_ORDERING = ('-rank', '-id')
+
+
+class InvalidListingQuery(Exception):
+    """The fields list or cursor of a listings request cannot be served."""
+
+
+def page_size(value) -> int:
+    """Page size asked for by a request, clamped to 1..LISTING_PAGE_MAX_SIZE."""
+    try:
+        size = int(value) if value not in (None, '') else LISTING_PAGE_SIZE
+    except (TypeError, ValueError):
+        size = LISTING_PAGE_SIZE
+    return max(1, min(size, LISTING_PAGE_MAX_SIZE))
+
+
+def listing_fields(value) -> tuple:
+    """Fields asked for as a comma-separated list, or the defaults; ``id`` is always included."""
+    if not value or not value.strip():
+        return DEFAULT_LISTING_FIELDS
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in LISTING_FIELDS]
+    if unknown:
+        raise InvalidListingQuery(
+            f"Unknown fields: {', '.join(unknown)}; fields must be among: {', '.join(LISTING_FIELDS)}"
+        )
+    return tuple(dict.fromkeys(['id', *fields]))
+
+
+def encode_cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, ordering) -> list:
+    """Sort key of the last listing of the previous page, one value per ordering field."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        raise InvalidListingQuery(f"Malformed cursor: {cursor!r}")
+    if (not isinstance(values, list) or len(values) != len(ordering)
+            or not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values)):
+        raise InvalidListingQuery(f"Cursor {cursor!r} does not belong to this listing")
+    return values
+
+
+def _after(ordering, values) -> Q:
+    """Rows sorting after the sort key ``values``: (a, b) > (x, y) is a > x or (a = x and b > y)."""
+    clauses = []
+    equal = {}
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        clauses.append(Q(**equal, **{f'{name}__{lookup}': value}))
+        equal[name] = value
+    return reduce(or_, clauses)
+
+
+def listing_page(query: str, cursor: str, size: int):
+    """Return (keys, next cursor) for one page of listings, optionally matching a search query.
+
+    Pages are keyset-paginated: each starts right after the sort key in the
+    cursor, so listings added or removed meanwhile never shift a page, and a
+    deep page costs the same as the first. ``keys`` holds the id, updated_at
+    (and rank when searching) of each listing on the page, in page order.
+    """
+    if query:
+        queryset, ordering = search_listings(query), SEARCH_ORDERING
+    else:
+        queryset, ordering = JobListing.objects.all(), BROWSE_ORDERING
+    if cursor:
+        queryset = queryset.filter(_after(ordering, decode_cursor(cursor, ordering)))
+
+    key_fields = [field.lstrip('-') for field in ordering]
+    # One row past the page tells whether there is a next one
+    keys = list(queryset.order_by(*ordering).values(*dict.fromkeys([*key_fields, 'id', 'updated_at']))[:size + 1])
+    if len(keys) <= size:
+        return keys, None
+    keys = keys[:size]
+    return keys, encode_cursor([keys[-1][field] for field in key_fields])
+
+
+def page_etag(keys, fields, next_cursor) -> str:
+    """ETag of a page, from the fields shown and the id and updated_at of its listings.
+
+    There is no Last-Modified: the newest updated_at on a page stays the same
+    when a listing is deleted and an older one moves in.
+    """
+    raw = json.dumps([fields, next_cursor, keys], cls=DjangoJSONEncoder)
+    return quote_etag(hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32])
+
+
+def page_listings(keys, fields) -> list:
+    """The selected fields of the listings on a page, in page order, with their rank when searching."""
+    rows = {row['id']: row for row in JobListing.objects.filter(id__in=[key['id'] for key in keys]).values(*fields)}
+    listings = []
+    for key in keys:
+        # Skips a listing deleted since the page was read
+        row = rows.get(key['id'])
+        if row is not None:
+            if 'rank' in key:
+                row['rank'] = key['rank']
+            listings.append(row)
+    return listings
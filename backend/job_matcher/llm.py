@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+import weakref
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Gemini model used for role suggestions and title scoring
+GEMINI_MODEL_NAME = "gemini-1.5-pro"
+
+# Async calls in flight per event loop, and the process-wide rate limit (calls per second, burst)
+LLM_CONCURRENCY = getattr(settings, 'LLM_CONCURRENCY', 8)
+LLM_RATE_PER_SECOND = getattr(settings, 'LLM_RATE_PER_SECOND', 5)
+LLM_BURST = getattr(settings, 'LLM_BURST', 10)
+# Seconds per attempt, extra attempts after a failure, and the base backoff between them
+LLM_CALL_TIMEOUT = getattr(settings, 'LLM_CALL_TIMEOUT', 15)
+LLM_RETRIES = getattr(settings, 'LLM_RETRIES', 1)
+LLM_BACKOFF = getattr(settings, 'LLM_BACKOFF', 0.5)
+# Consecutive failures that open the circuit breaker, and seconds before it lets a trial call through
+LLM_BREAKER_FAILURES = getattr(settings, 'LLM_BREAKER_FAILURES', 5)
+LLM_BREAKER_RESET = getattr(settings, 'LLM_BREAKER_RESET', 30)
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_model():
+    """Return the Gemini model, configuring the client on first use rather than at import."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                import google.generativeai as genai
+
+                genai.configure(api_key=settings.GOOGLE_GEMINI_API_KEY)
+                _model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+    return _model
+
+
+class LLMUnavailable(Exception):
+    """Gemini is not being called: the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Stops calling a failing service for a while, then lets one trial call through.
+
+    Closed: calls go through and consecutive failures are counted. After
+    ``failure_threshold`` of them the breaker opens and rejects calls for
+    ``reset_timeout`` seconds; the first call after that is a trial that
+    closes the breaker on success or reopens it on failure. A trial that
+    never reports back, e.g. because its task was cancelled, expires after
+    another ``reset_timeout`` and the next call becomes the trial.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        # Monotonic time the half-open trial call was let through, while it runs
+        self._trial_started = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return 'open'
+            return 'half-open'
+
+    def allow(self) -> bool:
+        """Whether a call may be made now; in half-open state only one trial call is allowed."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at < self.reset_timeout:
+                return False
+            if self._trial_started is not None and now - self._trial_started < self.reset_timeout:
+                return False
+            self._trial_started = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("Gemini circuit breaker closed")
+            self._failures = 0
+            self._opened_at = None
+            self._trial_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            # A failed trial reopens; calls already in flight when it opened do not extend it
+            trial = self._trial_started is not None
+            if trial or (self._opened_at is None and self._failures >= self.failure_threshold):
+                logger.warning(f"Gemini circuit breaker opened after {self._failures} consecutive failures")
+                self._opened_at = time.monotonic()
+            self._trial_started = None
+
+
+class TokenBucket:
+    """Process-wide rate limit: ``rate`` calls per second on average, bursts up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """Take a token if one is available; otherwise return the seconds until one is."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    async def acquire(self):
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+
+breaker = CircuitBreaker(LLM_BREAKER_FAILURES, LLM_BREAKER_RESET)
+rate_limiter = TokenBucket(LLM_RATE_PER_SECOND, LLM_BURST)
+
+# asyncio semaphores belong to one event loop; each loop gets its own
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def get_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(LLM_CONCURRENCY)
+    return semaphore
+
+
+async def generate_async(prompt: str, timeout: float = None, **kwargs) -> str:
+    """Send a prompt to Gemini without blocking the event loop and return the response text.
+
+    Calls are capped by the per-loop semaphore and the process-wide rate
+    limiter, each attempt is bounded by ``timeout`` seconds, and failed
+    attempts are retried with jittered exponential backoff. Raises
+    LLMUnavailable while the circuit breaker is open, otherwise the last
+    error once retries run out.
+    """
+    timeout = timeout or LLM_CALL_TIMEOUT
+    for attempt in range(LLM_RETRIES + 1):
+        if not breaker.allow():
+            raise LLMUnavailable('Gemini circuit breaker is open')
+        try:
+            async with get_semaphore():
+                await rate_limiter.acquire()
+                response = await asyncio.wait_for(get_model().generate_content_async(prompt, **kwargs), timeout)
+                text = response.text
+        except Exception as e:
+            breaker.record_failure()
+            if attempt == LLM_RETRIES:
+                raise
+            delay = LLM_BACKOFF * 2 ** attempt * (1 + random.random())
+            logger.warning(f"Gemini call failed ({e!r}); retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        else:
+            breaker.record_success()
+            return text
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from job_matcher.models import JobListing
+from job_matcher.skill_bits import encode_required_skills
+from resume_parser.vocabulary import get_vocabulary
+
+
+class Command(BaseCommand):
+    help = 'Encode JobListing.required_skills as skill bitsets for listings without one from the current skill vocabulary'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Listings encoded per transaction',
+        )
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Re-encode every listing, not only those without a current bitset',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        vocabulary = get_vocabulary()
+        if not vocabulary.skill_names:
+            raise CommandError("The skill vocabulary is not available; nothing can be encoded")
+        listings = JobListing.objects.all()
+        if not options['all']:
+            listings = listings.filter(Q(skill_bits__isnull=True) | ~Q(skill_vocabulary_version=vocabulary.version))
+
+        encoded = 0
+        last_pk = 0
+        while True:
+            # Walk the table by primary key so each batch is an index range scan
+            batch = list(listings.filter(pk__gt=last_pk).order_by('pk').only('pk', 'required_skills')[:batch_size])
+            if not batch:
+                break
+            now = timezone.now()
+            with transaction.atomic():
+                for listing in batch:
+                    listing.skill_bits = encode_required_skills(listing.required_skills, vocabulary)
+                    listing.skill_vocabulary_version = vocabulary.version
+                    # Bumped so cached skill matrices see the change
+                    listing.updated_at = now
+                JobListing.objects.bulk_update(batch, ['skill_bits', 'skill_vocabulary_version', 'updated_at'])
+            encoded += len(batch)
+            last_pk = batch[-1].pk
+            self.stdout.write(f"Encoded {encoded} listings")
+
+        self.stdout.write(self.style.SUCCESS(f"Encoded required skills for {encoded} job listings."))
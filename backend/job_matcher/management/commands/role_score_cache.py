@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Avg, Count
+
+from job_matcher import score_cache
+from job_matcher.models import RoleScoreCacheEntry
+
+
+class Command(BaseCommand):
+    help = 'Show, prune or clear the cached Gemini role-to-job-title scores'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--evict', action='store_true', help='Delete expired and least recently used scores now')
+        parser.add_argument('--clear', action='store_true', help='Delete every cached score')
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            deleted, _ = RoleScoreCacheEntry.objects.all().delete()
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} cached scores."))
+            return
+        if options['evict']:
+            deleted = score_cache.evict()
+            self.stdout.write(f"Evicted {deleted} cached scores.")
+
+        summary = RoleScoreCacheEntry.objects.aggregate(
+            entries=Count('id'), role_sets=Count('roles', distinct=True), average_score=Avg('score')
+        )
+        self.stdout.write(
+            f"{summary['entries']} cached scores across {summary['role_sets']} role sets "
+            f"(limit {score_cache.MAX_ENTRIES}, TTL {score_cache.CACHE_TTL}s)."
+        )
+        self.stdout.write(self.style.SUCCESS(
+            "Hit/miss counters are per process and logged by job_matcher.scoring on every match request."
+        ))
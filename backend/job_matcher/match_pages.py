@@ -0,0 +1,78 @@
+import heapq
+import logging
+import uuid
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Matches per page when the request does not ask for a size, and the most it may ask for
+MATCH_PAGE_SIZE = getattr(settings, 'MATCH_PAGE_SIZE', 50)
+MATCH_PAGE_MAX_SIZE = getattr(settings, 'MATCH_PAGE_MAX_SIZE', 200)
+# Seconds a ranked result set can be paged through before the match must be run again
+MATCH_CURSOR_TTL = getattr(settings, 'MATCH_CURSOR_TTL', 15 * 60)
+
+
+class InvalidCursor(Exception):
+    """The cursor is malformed, belongs to another user, or its results have expired."""
+
+
+def top_matches(matches, limit: int) -> list:
+    """The ``limit`` best matches by percentage, best first; ties keep their original order."""
+    return heapq.nlargest(limit, matches, key=itemgetter('match_percentage'))
+
+
+def page_size(value) -> int:
+    """Page size asked for by a request, clamped to 1..MATCH_PAGE_MAX_SIZE."""
+    try:
+        size = int(value) if value not in (None, '') else MATCH_PAGE_SIZE
+    except (TypeError, ValueError):
+        size = MATCH_PAGE_SIZE
+    return max(1, min(size, MATCH_PAGE_MAX_SIZE))
+
+
+def _cache_key(user_id, token: str) -> str:
+    return f'match-results:{user_id}:{token}'
+
+
+def first_page(user_id, results: dict, size: int):
+    """Return the first page of ranked matches and the cursor to the next one.
+
+    ``results`` holds the ranked ``matches`` plus whatever else the later
+    pages repeat (roles, plan limit). Only result sets longer than one page
+    are stored; if the cache cannot store them, the first page is returned
+    without a cursor rather than failing the request.
+    """
+    matches = results['matches']
+    if len(matches) <= size:
+        return matches, None
+    token = uuid.uuid4().hex
+    try:
+        cache.set(_cache_key(user_id, token), results, MATCH_CURSOR_TTL)
+    except Exception as e:
+        # E.g. the database cache table was never created, or the cache server is down
+        logger.error(f"Could not store match results for paging: {e}")
+        return matches[:size], None
+    return matches[:size], f'{token}:{size}'
+
+
+def next_page(user_id, cursor: str, size: int):
+    """Return (results, page, next cursor) for a cursor from an earlier page."""
+    try:
+        token, offset = cursor.split(':')
+        offset = int(offset)
+    except (AttributeError, ValueError):
+        raise InvalidCursor(f"Malformed cursor: {cursor!r}")
+    try:
+        results = cache.get(_cache_key(user_id, token))
+    except Exception as e:
+        logger.error(f"Could not read match results for paging: {e}")
+        raise InvalidCursor(f"Results for cursor {cursor!r} are unavailable")
+    if results is None or offset < 0:
+        raise InvalidCursor(f"No results for cursor {cursor!r}")
+
+    end = offset + size
+    next_cursor = f'{token}:{end}' if end < len(results['matches']) else None
+    return results, results['matches'][offset:end], next_cursor
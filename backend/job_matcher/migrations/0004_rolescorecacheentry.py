@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-17 22:41
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_matcher', '0003_subscriptionplan_jobmatch_usersubscription'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoleScoreCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('roles', models.TextField()),
+                ('job_position', models.TextField()),
+                ('score', models.FloatField()),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('last_used_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
@@ -0,0 +1,92 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.db import migrations
+
+# Title outranks required skills, which outrank the description
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(NEW.required_skills, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C')
+"""
+
+CREATE_SQL = [
+    # Left in place on reverse; other database objects may rely on it
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX joblisting_search_gin ON job_matcher_joblisting USING gin (search_vector)',
+    'CREATE INDEX joblisting_title_trgm ON job_matcher_joblisting USING gin (title gin_trgm_ops)',
+    'CREATE INDEX joblisting_title_upper_trgm ON job_matcher_joblisting USING gin ((UPPER(title)) gin_trgm_ops)',
+    f"""
+    CREATE FUNCTION job_matcher_joblisting_search_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {SEARCH_VECTOR_SQL};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER joblisting_search_vector_update
+    BEFORE INSERT OR UPDATE OF title, required_skills, description ON job_matcher_joblisting
+    FOR EACH ROW EXECUTE FUNCTION job_matcher_joblisting_search_vector()
+    """,
+    # Fire the trigger once for existing rows
+    'UPDATE job_matcher_joblisting SET title = title',
+]
+
+DROP_SQL = [
+    'DROP TRIGGER IF EXISTS joblisting_search_vector_update ON job_matcher_joblisting',
+    'DROP FUNCTION IF EXISTS job_matcher_joblisting_search_vector()',
+    'DROP INDEX IF EXISTS joblisting_title_upper_trgm',
+    'DROP INDEX IF EXISTS joblisting_title_trgm',
+    'DROP INDEX IF EXISTS joblisting_search_gin',
+]
+
+
+def create_search_objects(apps, schema_editor):
+    # pg_trgm, GIN indexes and triggers only exist on Postgres; other backends
+    # (e.g. SQLite in development) fall back to unindexed LIKE queries
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in CREATE_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_search_objects(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in DROP_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_matcher', '0004_rolescorecacheentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblisting',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='joblisting',
+                    index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='joblisting_search_gin'),
+                ),
+                migrations.AddIndex(
+                    model_name='joblisting',
+                    index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='joblisting_title_trgm', opclasses=['gin_trgm_ops']),
+                ),
+                migrations.AddIndex(
+                    model_name='joblisting',
+                    index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('title'), name='gin_trgm_ops'), name='joblisting_title_upper_trgm'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_search_objects, drop_search_objects),
+            ],
+        ),
+    ]
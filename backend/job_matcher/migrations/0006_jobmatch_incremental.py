@@ -0,0 +1,56 @@
+# Generated by Django 5.2 on 2026-10-17 22:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_matcher', '0005_joblisting_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserMatchState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('search_key', models.CharField(max_length=64)),
+                ('potential_roles', models.JSONField(default=list)),
+                ('catalog_version', models.CharField(blank=True, max_length=64)),
+                ('scored_keys', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='jobmatch',
+            name='catalog_version',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='jobmatch',
+            name='is_stale',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='jobmatch',
+            name='job_key',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='jobmatch',
+            name='apply_url',
+            field=models.URLField(max_length=500),
+        ),
+        migrations.AddIndex(
+            model_name='jobmatch',
+            index=models.Index(fields=['user', 'is_stale', '-match_percentage'], name='jobmatch_user_ranked'),
+        ),
+        migrations.AddField(
+            model_name='usermatchstate',
+            name='user',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='match_state', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
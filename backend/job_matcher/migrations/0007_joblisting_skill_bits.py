@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-17 23:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_matcher', '0006_jobmatch_incremental'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblisting',
+            name='skill_bits',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
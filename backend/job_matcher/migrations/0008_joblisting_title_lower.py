@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-17 23:13
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_matcher', '0007_joblisting_skill_bits'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(django.db.models.functions.text.Lower('title'), name='joblisting_title_lower'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2 on 2026-10-17 23:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def delete_duplicate_matches(apps, schema_editor):
+    # Concurrent first matches could store a job twice for a user; keep the oldest row
+    JobMatch = apps.get_model('job_matcher', 'JobMatch')
+    duplicates = (
+        JobMatch.objects.exclude(job_key='').values('user', 'job_key')
+        .annotate(first_id=models.Min('id'), rows=models.Count('id')).filter(rows__gt=1)
+    )
+    for duplicate in duplicates:
+        JobMatch.objects.filter(user=duplicate['user'], job_key=duplicate['job_key']).exclude(
+            id=duplicate['first_id']
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_matcher', '0008_joblisting_title_lower'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='usermatchstate',
+            name='scored_keys',
+        ),
+        migrations.AddField(
+            model_name='jobmatch',
+            name='is_provisional',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='usermatchstate',
+            name='is_provisional',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='usermatchstate',
+            name='search_key',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.RunPython(delete_duplicate_matches, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='jobmatch',
+            constraint=models.UniqueConstraint(condition=models.Q(('job_key', ''), _negated=True), fields=('user', 'job_key'), name='jobmatch_user_job_unique'),
+        ),
+    ]
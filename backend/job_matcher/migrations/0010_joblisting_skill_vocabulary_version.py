@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-17 23:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_matcher', '0009_jobmatch_scored_rows'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblisting',
+            name='skill_vocabulary_version',
+            field=models.CharField(blank=True, editable=False, max_length=32, null=True),
+        ),
+    ]
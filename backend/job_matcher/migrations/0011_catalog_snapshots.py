@@ -0,0 +1,43 @@
+# Generated by Django 5.2 on 2026-10-17 23:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def delete_unmatched_matches(apps, schema_editor):
+    # Only matching and provisional jobs are stored now; rows of jobs gone from the catalog are deleted
+    JobMatch = apps.get_model('job_matcher', 'JobMatch')
+    JobMatch.objects.filter(models.Q(is_stale=True) | models.Q(match_percentage__lte=0, is_provisional=False)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_matcher', '0010_joblisting_skill_vocabulary_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(max_length=64, unique=True)),
+                ('job_keys', models.JSONField(default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='jobmatch',
+            name='jobmatch_user_ranked',
+        ),
+        migrations.RunPython(delete_unmatched_matches, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='jobmatch',
+            name='is_stale',
+        ),
+        migrations.AddIndex(
+            model_name='jobmatch',
+            index=models.Index(fields=['user', '-match_percentage'], name='jobmatch_user_ranked'),
+        ),
+    ]
@@ -1,4 +1,9 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Lower, Upper
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -13,12 +18,26 @@ class JobListing(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     source = models.CharField(max_length=200, blank=True)
     apply_link = models.URLField(max_length=200, blank=True, null=True)  # New field for apply link
+    # Weighted title/skills/description lexemes, kept current by a database trigger on Postgres
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Bitset of required skills, bit n for the n-th skill of the skill vocabulary; see skill_bits
+    skill_bits = models.BinaryField(null=True, blank=True, editable=False)
+    # Version of the skill vocabulary skill_bits was encoded with; others are re-encoded when the matrix is built
+    skill_vocabulary_version = models.CharField(max_length=32, null=True, blank=True, editable=False)
 
     def __str__(self):
         return f"{self.title} at {self.company}"
 
     class Meta:
         unique_together = ('title', 'company', 'location')
+        indexes = [
+            GinIndex(fields=['search_vector'], name='joblisting_search_gin'),
+            # Trigram indexes: similarity (%) on the title, and case-insensitive LIKE, which Django writes as UPPER(title) LIKE
+            GinIndex(fields=['title'], name='joblisting_title_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='joblisting_title_upper_trgm'),
+            # Exact lookups of lowercased titles, for titles contained in a role variation
+            models.Index(Lower('title'), name='joblisting_title_lower'),
+        ]
 
 class SubscriptionPlan(models.Model):
     name = models.CharField(max_length=50)
@@ -44,9 +63,63 @@ class JobMatch(models.Model):
     job_position = models.CharField(max_length=200)
     company = models.CharField(max_length=200)
     match_percentage = models.FloatField()
-    apply_url = models.URLField()
+    apply_url = models.URLField(max_length=500)
     created_at = models.DateTimeField(auto_now_add=True)
     is_viewed = models.BooleanField(default=False)
+    # The scraped job this match is for, and the catalog version it was scored against
+    job_key = models.CharField(max_length=64, blank=True, db_index=True)
+    catalog_version = models.CharField(max_length=64, blank=True)
+    # Scored by the basic fallback while Gemini was unavailable; kept even at 0% so the next match scores it again
+    is_provisional = models.BooleanField(default=False)
 
     def __str__(self):
-        return f"{self.job_position} at {self.company} - {self.match_percentage}% match"
\ No newline at end of file
+        return f"{self.job_position} at {self.company} - {self.match_percentage}% match"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-match_percentage'], name='jobmatch_user_ranked'),
+        ]
+        constraints = [
+            # One row per catalog job; rows from before job keys existed have none
+            models.UniqueConstraint(fields=['user', 'job_key'], condition=~Q(job_key=''), name='jobmatch_user_job_unique'),
+        ]
+
+class UserMatchState(models.Model):
+    """What a user's stored JobMatch rows were computed for, so repeating the search only scores new jobs.
+
+    Only matching (and provisional) jobs have a JobMatch row. Jobs new since
+    ``catalog_version`` are found from its CatalogSnapshot.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='match_state')
+    # SHA-256 of the canonical skills and match options of the stored search; empty before the first match
+    search_key = models.CharField(max_length=64, blank=True, default='')
+    potential_roles = models.JSONField(default=list)
+    catalog_version = models.CharField(max_length=64, blank=True)
+    # Some stored rows are provisional, so the next match scores them again even if the catalog is unchanged
+    is_provisional = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user} - catalog {self.catalog_version}"
+
+class CatalogSnapshot(models.Model):
+    """The job keys of one version of the scraped jobs catalog, shared by every user's stored matches."""
+    version = models.CharField(max_length=64, unique=True)
+    job_keys = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"Catalog {self.version} ({len(self.job_keys)} jobs)"
+
+class RoleScoreCacheEntry(models.Model):
+    """Gemini's score for a job title against a set of potential roles."""
+    # SHA-256 of the normalized role set and job title
+    key = models.CharField(max_length=64, unique=True)
+    roles = models.TextField()
+    job_position = models.TextField()
+    score = models.FloatField()
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+    last_used_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"{self.job_position} for [{self.roles}] - {self.score}"
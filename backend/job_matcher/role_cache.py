@@ -0,0 +1,141 @@
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Seconds inferred roles are reused for the same skill set
+CACHE_TTL = getattr(settings, 'POTENTIAL_ROLES_CACHE_TTL', 24 * 3600)
+# Longest a worker waits for another worker already computing the same key
+LOCK_TIMEOUT = getattr(settings, 'POTENTIAL_ROLES_LOCK_TIMEOUT', 30)
+POLL_INTERVAL = 0.1
+
+# Striped locks coalesce concurrent misses within a process without one lock per key
+_local_locks = [threading.Lock() for _ in range(64)]
+
+
+def canonical_skills(skills) -> list:
+    """Skills lowercased, deduplicated and sorted; accepts a list or a comma-separated string."""
+    if isinstance(skills, str):
+        skills = skills.split(',')
+    return sorted({' '.join(str(skill).lower().split()) for skill in skills if str(skill).strip()})
+
+
+def cache_key(skills: list) -> str:
+    digest = hashlib.sha256(','.join(skills).encode('utf-8')).hexdigest()
+    return f"potential_roles:{digest}"
+
+
+def _cache_get(key: str):
+    try:
+        return cache.get(key)
+    except Exception as e:
+        logger.error(f"Role cache read failed: {e}")
+        return None
+
+
+def get_or_compute(skills: list, compute):
+    """Return cached roles for a canonical skill list, or compute them once and cache them.
+
+    Concurrent misses for the same key are coalesced: threads in this process
+    share a lock, and across workers the first to ``cache.add`` a lock key
+    computes while the others wait for its result. ``compute`` may raise to
+    signal a result that must not be cached.
+    """
+    key = cache_key(skills)
+    roles = _cache_get(key)
+    if roles is not None:
+        logger.debug(f"Potential roles cache hit for {key}")
+        return roles
+
+    with _local_locks[hash(key) % len(_local_locks)]:
+        roles = _cache_get(key)
+        if roles is not None:
+            return roles
+
+        lock_key = f"{key}:lock"
+        try:
+            acquired = cache.add(lock_key, 1, LOCK_TIMEOUT)
+        except Exception as e:
+            logger.error(f"Role cache lock failed: {e}")
+            acquired = True
+
+        if not acquired:
+            # Another worker is asking Gemini about these skills; wait for its answer
+            deadline = time.monotonic() + LOCK_TIMEOUT
+            while time.monotonic() < deadline:
+                time.sleep(POLL_INTERVAL)
+                roles = _cache_get(key)
+                if roles is not None:
+                    return roles
+            logger.warning(f"Timed out waiting for potential roles {key}; computing them here")
+
+        try:
+            roles = compute(skills)
+            try:
+                cache.set(key, roles, CACHE_TTL)
+            except Exception as e:
+                logger.error(f"Role cache write failed: {e}")
+            return roles
+        finally:
+            if acquired:
+                try:
+                    cache.delete(lock_key)
+                except Exception:
+                    pass
+
+
+async def aget_or_compute(skills: list, compute):
+    """Async ``get_or_compute`` for an async ``compute``.
+
+    Concurrent misses are coalesced through the ``cache.add`` lock alone,
+    which covers coroutines in this process as well as other workers.
+    """
+    key = cache_key(skills)
+    try:
+        roles = await cache.aget(key)
+    except Exception as e:
+        logger.error(f"Role cache read failed: {e}")
+        roles = None
+    if roles is not None:
+        logger.debug(f"Potential roles cache hit for {key}")
+        return roles
+
+    lock_key = f"{key}:lock"
+    try:
+        acquired = await cache.aadd(lock_key, 1, LOCK_TIMEOUT)
+    except Exception as e:
+        logger.error(f"Role cache lock failed: {e}")
+        acquired = True
+
+    if not acquired:
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(POLL_INTERVAL)
+            try:
+                roles = await cache.aget(key)
+            except Exception as e:
+                logger.error(f"Role cache read failed: {e}")
+                roles = None
+            if roles is not None:
+                return roles
+        logger.warning(f"Timed out waiting for potential roles {key}; computing them here")
+
+    try:
+        roles = await compute(skills)
+        try:
+            await cache.aset(key, roles, CACHE_TTL)
+        except Exception as e:
+            logger.error(f"Role cache write failed: {e}")
+        return roles
+    finally:
+        if acquired:
+            try:
+                await cache.adelete(lock_key)
+            except Exception:
+                pass
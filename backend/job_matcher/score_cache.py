@@ -0,0 +1,169 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import RoleScoreCacheEntry
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached score stays valid
+CACHE_TTL = getattr(settings, 'ROLE_SCORE_CACHE_TTL', 7 * 24 * 3600)
+# Upper bound on stored scores; the least recently used are evicted first
+MAX_ENTRIES = getattr(settings, 'ROLE_SCORE_CACHE_MAX_ENTRIES', 200000)
+# Scores kept in each process in front of the database
+LRU_SIZE = getattr(settings, 'ROLE_SCORE_CACHE_LRU_SIZE', 20000)
+# Scores stored by a process between evictions; 0 leaves eviction to ``manage.py role_score_cache --evict``
+EVICT_EVERY = getattr(settings, 'ROLE_SCORE_CACHE_EVICT_EVERY', 5000)
+
+_lru = OrderedDict()  # key -> (score, expires_at on the monotonic clock)
+_lock = threading.Lock()
+_stats = {'lru_hits': 0, 'db_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+_stores_since_evict = 0
+
+
+def normalize_roles(potential_roles) -> str:
+    """Order- and case-insensitive form of a role set, e.g. "backend developer|python developer"."""
+    return '|'.join(sorted({' '.join(role.lower().split()) for role in potential_roles if role.strip()}))
+
+
+def normalize_title(job_position: str) -> str:
+    return ' '.join(job_position.lower().split())
+
+
+def make_key(roles_key: str, job_position: str) -> str:
+    return hashlib.sha256(f"{roles_key}\n{normalize_title(job_position)}".encode('utf-8')).hexdigest()
+
+
+def _count(name: str, amount: int = 1):
+    with _lock:
+        _stats[name] += amount
+
+
+def get_stats() -> dict:
+    """Hit/miss counters for this process, plus the hit rate over all lookups."""
+    with _lock:
+        stats = dict(_stats)
+    lookups = stats['lru_hits'] + stats['db_hits'] + stats['misses']
+    stats['hit_rate'] = round((stats['lru_hits'] + stats['db_hits']) / lookups, 4) if lookups else None
+    stats['lru_size'] = len(_lru)
+    return stats
+
+
+def _lru_get(key: str):
+    with _lock:
+        item = _lru.get(key)
+        if item is None:
+            return None
+        if item[1] < time.monotonic():
+            del _lru[key]
+            return None
+        _lru.move_to_end(key)
+        return item[0]
+
+
+def _lru_put(key: str, score: float, expires_in: float):
+    with _lock:
+        _lru[key] = (score, time.monotonic() + expires_in)
+        _lru.move_to_end(key)
+        while len(_lru) > LRU_SIZE:
+            _lru.popitem(last=False)
+
+
+def get_many(potential_roles, job_positions) -> dict:
+    """Cached scores for the given titles as {job_position: score}; titles not cached are absent."""
+    roles_key = normalize_roles(potential_roles)
+    # Titles differing only in case or spacing share a key
+    keys = {}
+    for job_position in job_positions:
+        keys.setdefault(make_key(roles_key, job_position), []).append(job_position)
+
+    scores = {}
+    remaining = []
+    for key, titles in keys.items():
+        score = _lru_get(key)
+        if score is None:
+            remaining.append(key)
+        else:
+            scores.update(dict.fromkeys(titles, score))
+    _count('lru_hits', len(keys) - len(remaining))
+
+    if remaining:
+        now = timezone.now()
+        entries = list(RoleScoreCacheEntry.objects.filter(
+            key__in=remaining, created_at__gte=now - timedelta(seconds=CACHE_TTL)
+        ).values_list('key', 'score', 'created_at'))
+        for key, score, created_at in entries:
+            scores.update(dict.fromkeys(keys[key], score))
+            _lru_put(key, score, CACHE_TTL - (now - created_at).total_seconds())
+        if entries:
+            RoleScoreCacheEntry.objects.filter(key__in=[key for key, _, _ in entries]).update(last_used_at=now)
+        _count('db_hits', len(entries))
+        _count('misses', len(remaining) - len(entries))
+    return scores
+
+
+def _evict_due(stored: int) -> bool:
+    """Count stored scores; True once every EVICT_EVERY of them."""
+    global _stores_since_evict
+    if not EVICT_EVERY:
+        return False
+    with _lock:
+        _stores_since_evict += stored
+        if _stores_since_evict < EVICT_EVERY:
+            return False
+        _stores_since_evict = 0
+    return True
+
+
+def set_many(potential_roles, scores: dict):
+    """Store freshly computed {job_position: score} pairs, enforcing the size bound every EVICT_EVERY stores."""
+    if not scores:
+        return
+    roles_key = normalize_roles(potential_roles)
+    now = timezone.now()
+    # One entry per key: an upsert may not touch the same row twice, so the last title sharing a key wins
+    entries = {}
+    for job_position, score in scores.items():
+        key = make_key(roles_key, job_position)
+        _lru_put(key, score, CACHE_TTL)
+        entries[key] = RoleScoreCacheEntry(
+            key=key, roles=roles_key, job_position=job_position, score=score, created_at=now, last_used_at=now,
+        )
+    entries = list(entries.values())
+    RoleScoreCacheEntry.objects.bulk_create(
+        entries, update_conflicts=True, unique_fields=['key'], update_fields=['score', 'created_at', 'last_used_at'],
+    )
+    _count('stores', len(entries))
+    # Eviction scans the table, so it runs once per many stores rather than on each
+    if _evict_due(len(entries)):
+        evict()
+
+
+def evict(max_entries: int = None) -> int:
+    """Delete expired scores and the least recently used beyond the size bound; returns how many were removed."""
+    max_entries = MAX_ENTRIES if max_entries is None else max_entries
+    deleted, _ = RoleScoreCacheEntry.objects.filter(
+        created_at__lt=timezone.now() - timedelta(seconds=CACHE_TTL)
+    ).delete()
+    excess = RoleScoreCacheEntry.objects.count() - max_entries
+    if excess > 0:
+        stale_ids = list(
+            RoleScoreCacheEntry.objects.order_by('last_used_at').values_list('pk', flat=True)[:excess]
+        )
+        deleted += RoleScoreCacheEntry.objects.filter(pk__in=stale_ids).delete()[0]
+    if deleted:
+        _count('evictions', deleted)
+        logger.info(f"Evicted {deleted} role score cache entries")
+    return deleted
+
+
+def clear_local():
+    """Drop this process's in-memory scores (the database copy is kept)."""
+    with _lock:
+        _lru.clear()
@@ -0,0 +1,258 @@
+import asyncio
+import json
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from . import score_cache
+from .llm import generate_async, get_model
+
+logger = logging.getLogger(__name__)
+
+# Rough prompt budget per batch; titles are added until the estimate reaches it
+SCORE_BATCH_TOKENS = getattr(settings, 'ROLE_SCORE_BATCH_TOKENS', 2000)
+# Hard cap on titles per prompt, so one bad response loses at most this many scores
+SCORE_BATCH_MAX_TITLES = getattr(settings, 'ROLE_SCORE_BATCH_MAX_TITLES', 50)
+# Batches scored at the same time, shared by all requests in the process
+SCORE_CONCURRENCY = getattr(settings, 'ROLE_SCORE_CONCURRENCY', 4)
+# Seconds to wait for all batches of one request before falling back; also the most one model call may take
+SCORE_TIMEOUT = getattr(settings, 'ROLE_SCORE_TIMEOUT', 20)
+# Scores below this are not considered a match
+MIN_MATCH_SCORE = 40
+
+# English text averages about four characters per token
+CHARS_PER_TOKEN = 4
+
+SCORE_PROMPT = """
+Compare these potential roles with each numbered job position and determine how well each one matches.
+
+Potential Roles: {roles}
+
+Job Positions:
+{positions}
+
+Instructions:
+1. Be lenient in matching - consider related roles and variations
+2. If the job position is in the same domain as any role, consider it a match
+3. Score each position from 0 to 100:
+   - 100 for exact matches
+   - 80-90 for very close matches
+   - 60-70 for related roles
+   - 40-50 for same domain but different focus
+   - 0 for completely unrelated
+
+Return ONLY a JSON array with one object per position, like [{{"id": 1, "score": 85}}].
+"""
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide pool that sends scoring batches, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=SCORE_CONCURRENCY, thread_name_prefix='role-score')
+    return _executor
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def chunk_titles(titles, roles_text: str, token_budget: int = None, max_titles: int = None) -> list:
+    """Split titles into batches whose prompts stay within the token budget."""
+    token_budget = token_budget or SCORE_BATCH_TOKENS
+    max_titles = max_titles or SCORE_BATCH_MAX_TITLES
+    base_tokens = estimate_tokens(SCORE_PROMPT) + estimate_tokens(roles_text)
+
+    chunks = []
+    chunk, chunk_tokens = [], base_tokens
+    for title in titles:
+        # "12. Title" on its own line, plus the id/score object in the answer
+        title_tokens = estimate_tokens(title) + 10
+        if chunk and (chunk_tokens + title_tokens > token_budget or len(chunk) == max_titles):
+            chunks.append(chunk)
+            chunk, chunk_tokens = [], base_tokens
+        chunk.append(title)
+        chunk_tokens += title_tokens
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def parse_scores(text: str, count: int) -> dict:
+    """Read ``[{"id": n, "score": s}, ...]`` from a model response into {index: score}."""
+    match = re.search(r'\[.*\]', text, re.DOTALL)
+    if not match:
+        raise ValueError(f"No JSON array in response: {text[:200]}")
+    scores = {}
+    for item in json.loads(match.group(0)):
+        try:
+            index = int(item['id']) - 1
+            score = float(item['score'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if 0 <= index < count:
+            scores[index] = max(0.0, min(100.0, score))
+    return scores
+
+
+class TitleScores(dict):
+    """{title: score}, plus ``fallback``: the titles scored by ``fallback_score`` instead of the model."""
+
+    def __init__(self, scores=(), fallback=()):
+        super().__init__(scores)
+        self.fallback = set(fallback)
+
+
+def fallback_score(potential_roles, job_position: str) -> float:
+    """Score used when the model is unavailable: a role named in the title is a strong match."""
+    job_position_lower = job_position.lower()
+    if any(role.lower() in job_position_lower for role in potential_roles):
+        return 80.0  # High confidence for partial matches
+    return 0
+
+
+def fill_missing(potential_roles, chunk, result: dict, scores: dict) -> list:
+    """Give the titles of a batch the model left out of its answer ``fallback_score`` in ``scores``; returns them.
+
+    A truncated or partial answer must not hide those titles; their fallback
+    scores are not cached, so the next request asks the model again.
+    """
+    missing = [title for title in chunk if title not in result]
+    if missing:
+        logger.warning(f"Gemini left out {len(missing)} of {len(chunk)} job positions; using basic matching for them")
+        scores.update({title: fallback_score(potential_roles, title) for title in missing})
+    return missing
+
+
+def score_batch(roles_text: str, titles) -> dict:
+    """Score one batch of titles with a single model call; returns {title: score} for the titles the model scored."""
+    positions = '\n'.join(f"{index}. {title}" for index, title in enumerate(titles, 1))
+    prompt = SCORE_PROMPT.format(roles=roles_text, positions=positions)
+    # Cancelling a timed-out batch does not stop a call already running; its own timeout frees the thread
+    response = get_model().generate_content(
+        prompt, generation_config={'response_mime_type': 'application/json'}, request_options={'timeout': SCORE_TIMEOUT}
+    )
+    scores = parse_scores(response.text, len(titles))
+    logger.info(f"Gemini scored {len(scores)} of {len(titles)} job positions")
+    return {titles[index]: score for index, score in scores.items()}
+
+
+def score_titles(potential_roles, titles) -> dict:
+    """Score job titles against the potential roles in a few concurrent batched prompts.
+
+    Scores cached for the same role set are reused; only the rest are sent to
+    Gemini. Returns TitleScores with scores below MIN_MATCH_SCORE reported as 0.
+    Batches that fail or miss the deadline, and titles the model left out of
+    its answer, fall back to ``fallback_score``, are not cached, and are
+    listed in the result's ``fallback``.
+    """
+    titles = list(dict.fromkeys(titles))
+    if not titles:
+        return TitleScores()
+    try:
+        scores = score_cache.get_many(potential_roles, titles)
+    except Exception as e:
+        logger.error(f"Role score cache lookup failed: {e}")
+        scores = {}
+    to_score = [title for title in titles if title not in scores]
+    logger.info(f"Role score cache: {len(scores)} of {len(titles)} titles cached; {score_cache.get_stats()}")
+    fallback = set()
+
+    if to_score:
+        roles_text = ', '.join(potential_roles)
+        chunks = chunk_titles(to_score, roles_text)
+        logger.info(f"Scoring {len(to_score)} job positions in {len(chunks)} batches")
+
+        futures = {get_executor().submit(score_batch, roles_text, chunk): chunk for chunk in chunks}
+        done, not_done = wait(futures, timeout=SCORE_TIMEOUT)
+        for future in not_done:
+            future.cancel()
+        if not_done:
+            logger.warning(f"{len(not_done)} of {len(futures)} scoring batches timed out")
+
+        fresh_scores = {}
+        for future, chunk in futures.items():
+            try:
+                if future not in done:
+                    raise TimeoutError('Scoring batch timed out')
+                result = future.result()
+            except Exception as e:
+                logger.warning(f"Gemini API error, falling back to basic matching: {str(e)}")
+                scores.update({title: fallback_score(potential_roles, title) for title in chunk})
+                fallback.update(chunk)
+                continue
+            fresh_scores.update(result)
+            fallback.update(fill_missing(potential_roles, chunk, result, scores))
+        try:
+            score_cache.set_many(potential_roles, fresh_scores)
+        except Exception as e:
+            logger.error(f"Failed to cache role scores: {e}")
+        scores.update(fresh_scores)
+
+    return TitleScores({title: score if score >= MIN_MATCH_SCORE else 0 for title, score in scores.items()}, fallback)
+
+
+async def score_batch_async(roles_text: str, titles) -> dict:
+    """Async ``score_batch``: one rate-limited, circuit-broken model call for a batch of titles.
+
+    Titles the model left out of its answer are absent from the result.
+    """
+    positions = '\n'.join(f"{index}. {title}" for index, title in enumerate(titles, 1))
+    prompt = SCORE_PROMPT.format(roles=roles_text, positions=positions)
+    text = await generate_async(prompt, generation_config={'response_mime_type': 'application/json'})
+    scores = parse_scores(text, len(titles))
+    logger.info(f"Gemini scored {len(scores)} of {len(titles)} job positions")
+    return {titles[index]: score for index, score in scores.items()}
+
+
+async def score_titles_async(potential_roles, titles) -> dict:
+    """Async ``score_titles``: batches are sent concurrently from the event loop.
+
+    Batches that fail, time out or are refused by the open circuit breaker,
+    and titles the model left out, fall back to ``fallback_score``, are not
+    cached, and are listed in the result's ``fallback``.
+    """
+    titles = list(dict.fromkeys(titles))
+    if not titles:
+        return TitleScores()
+    try:
+        scores = await sync_to_async(score_cache.get_many)(potential_roles, titles)
+    except Exception as e:
+        logger.error(f"Role score cache lookup failed: {e}")
+        scores = {}
+    to_score = [title for title in titles if title not in scores]
+    fallback = set()
+
+    if to_score:
+        roles_text = ', '.join(potential_roles)
+        chunks = chunk_titles(to_score, roles_text)
+        logger.info(f"Scoring {len(to_score)} job positions in {len(chunks)} async batches")
+        results = await asyncio.gather(
+            *(score_batch_async(roles_text, chunk) for chunk in chunks), return_exceptions=True
+        )
+
+        fresh_scores = {}
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Gemini API error, falling back to basic matching: {str(result)}")
+                scores.update({title: fallback_score(potential_roles, title) for title in chunk})
+                fallback.update(chunk)
+            else:
+                fresh_scores.update(result)
+                fallback.update(fill_missing(potential_roles, chunk, result, scores))
+        try:
+            await sync_to_async(score_cache.set_many)(potential_roles, fresh_scores)
+        except Exception as e:
+            logger.error(f"Failed to cache role scores: {e}")
+        scores.update(fresh_scores)
+
+    return TitleScores({title: score if score >= MIN_MATCH_SCORE else 0 for title, score in scores.items()}, fallback)
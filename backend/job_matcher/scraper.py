@@ -2,6 +2,8 @@ import requests
 from bs4 import BeautifulSoup
 import time
 from .models import JobListing
+from .skill_bits import encode_required_skills
+from resume_parser.vocabulary import get_vocabulary
 
 def scrape_company_jobs(company_name, careers_url):
     """
@@ -30,6 +32,7 @@ def scrape_company_jobs(company_name, careers_url):
     # Find job listings (adjust selectors based on the website's structure)
     job_listings = soup.find_all('div', class_='job-listing')  # Hypothetical class name
     new_listings = 0
+    vocabulary = get_vocabulary()
 
     for job in job_listings:
         title = job.find('h2', class_='job-title').text.strip() if job.find('h2', class_='job-title') else 'N/A'
@@ -45,6 +48,8 @@ def scrape_company_jobs(company_name, careers_url):
                 location=location,
                 description=description,
                 required_skills=skills,
+                skill_bits=encode_required_skills(skills, vocabulary),
+                skill_vocabulary_version=vocabulary.version,
                 source=careers_url
             )
             new_listings += 1
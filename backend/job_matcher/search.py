@@ -0,0 +1,103 @@
+import logging
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Cast, Greatest, Lower
+
+from .models import JobListing
+
+logger = logging.getLogger(__name__)
+
+# Where MatchJobsView reads jobs from: 'file' (the scraped JSON catalog) or 'database' (JobListing)
+JOB_MATCH_SOURCE = getattr(settings, 'JOB_MATCH_SOURCE', 'file')
+# Most non-direct-match titles per request handed on to Gemini, best ranked first
+MATCH_CANDIDATE_LIMIT = getattr(settings, 'JOB_MATCH_CANDIDATE_LIMIT', 500)
+SEARCH_CONFIG = 'english'
+
+
+def is_postgres() -> bool:
+    return connection.vendor == 'postgresql'
+
+
+def search_listings(query: str, queryset=None):
+    """Listings matching a free-text query, best first, each annotated with ``rank``.
+
+    On Postgres this is a websearch-syntax full-text query over the indexed
+    search vector (title weighted over skills over description); elsewhere it
+    falls back to case-insensitive substring matching, newest first.
+    """
+    queryset = JobListing.objects.all() if queryset is None else queryset
+    if not is_postgres():
+        return queryset.filter(
+            Q(title__icontains=query) | Q(required_skills__icontains=query) | Q(description__icontains=query)
+        ).annotate(rank=Value(1.0)).order_by('-rank', '-id')
+
+    search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+    return queryset.filter(search_vector=search_query).annotate(
+        # ts_rank is a real; as double precision it round-trips exactly through a page cursor
+        rank=Cast(SearchRank(F('search_vector'), search_query), FloatField())
+    ).order_by('-rank', '-id')
+
+
+def _substrings(text: str) -> set:
+    return {text[start:end] for start in range(len(text)) for end in range(start + 1, len(text) + 1)}
+
+
+def direct_match_listings(variations, queryset=None):
+    """Listings whose title contains, or is contained in, one of the variations (case-insensitive).
+
+    Both halves are index lookups, ORed into one bitmap scan on Postgres:
+    "variation in title" is a LIKE served by the trigram index on UPPER(title),
+    and "title in variation" is LOWER(title) IN every substring of the
+    variations, served by the b-tree index on LOWER(title).
+    """
+    queryset = JobListing.objects.all() if queryset is None else queryset
+    variations = [variation.lower() for variation in dict.fromkeys(variations) if variation]
+    if not variations:
+        return queryset.none()
+
+    contains_variation = reduce(or_, (Q(title__icontains=variation) for variation in variations))
+    substrings = set().union(*(_substrings(variation) for variation in variations))
+    return queryset.exclude(title='').alias(title_lower=Lower('title')).filter(
+        contains_variation | Q(title_lower__in=sorted(substrings))
+    )
+
+
+def rank_candidate_titles(potential_roles, limit: int = None, queryset=None) -> list:
+    """Distinct titles most related to the roles, ranked in the database, for Gemini to score.
+
+    On Postgres a title is a candidate when it matches a role in full text or is
+    trigram-similar to one (``pg_trgm.similarity_threshold``, 0.3 by default),
+    both answered from GIN indexes, and candidates are ranked by full-text rank
+    then similarity to the closest role; elsewhere every title is returned in
+    catalog order.
+    """
+    limit = limit or MATCH_CANDIDATE_LIMIT
+    queryset = (JobListing.objects.all() if queryset is None else queryset).exclude(title='')
+    roles = [role for role in potential_roles if role.strip()]
+    if not is_postgres() or not roles:
+        return list(dict.fromkeys(queryset.order_by('id').values_list('title', flat=True)))[:limit]
+
+    search_query = reduce(or_, (SearchQuery(role, config=SEARCH_CONFIG) for role in roles))
+    similarity = Greatest(*[TrigramSimilarity('title', role) for role in roles]) if len(roles) > 1 \
+        else TrigramSimilarity('title', roles[0])
+    ranked = queryset.annotate(
+        rank=SearchRank(F('search_vector'), search_query), similarity=similarity,
+    ).filter(
+        reduce(or_, (Q(title__trigram_similar=role) for role in roles), Q(search_vector=search_query))
+    ).order_by('-rank', '-similarity', 'id').values_list('title', flat=True)
+
+    titles = []
+    seen = set()
+    # Duplicate titles across companies are common; read a little past the limit
+    for title in ranked[:limit * 2]:
+        if title not in seen:
+            seen.add(title)
+            titles.append(title)
+            if len(titles) == limit:
+                break
+    return titles
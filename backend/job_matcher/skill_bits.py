@@ -0,0 +1,202 @@
+import logging
+import re
+import threading
+
+import numpy as np
+from django.conf import settings
+
+from resume_parser.vocabulary import get_vocabulary
+
+from .models import JobListing
+from .vector_match import listings_version
+
+logger = logging.getLogger(__name__)
+
+# Share of a listing's match percentage that comes from how many of its required skills the resume has
+SKILL_SCORE_WEIGHT = getattr(settings, 'JOB_SKILL_SCORE_WEIGHT', 0.3)
+
+# Scraped skill lists come comma-, semicolon-, pipe-, newline- or bullet-separated
+SEPARATORS_RE = re.compile(r'[,;|\n•]+')
+
+# Listings whose required skills are read per query when encoding outdated bitsets
+ENCODE_BATCH_SIZE = 1000
+
+_lock = threading.Lock()
+_matrix = None
+
+
+def split_required_skills(text: str) -> set:
+    """Normalized skill names from a JobListing.required_skills string, as ``split_skills`` does for resumes."""
+    if not text or text.strip() == 'N/A':
+        return set()
+    return {name.strip().lower() for name in SEPARATORS_RE.split(text) if name.strip()}
+
+
+def encode(positions) -> bytes:
+    """Bitset with bit ``position`` set for each skill position, least significant bit first."""
+    positions = list(positions)
+    if not positions:
+        return b''
+    bits = bytearray(max(positions) // 8 + 1)
+    for position in positions:
+        bits[position // 8] |= 1 << (position % 8)
+    return bytes(bits)
+
+
+def decode(bits) -> list:
+    """Skill positions set in a bitset."""
+    if not bits:
+        return []
+    return np.flatnonzero(np.unpackbits(np.frombuffer(bytes(bits), dtype=np.uint8), bitorder='little')).tolist()
+
+
+def skill_positions(names, vocabulary) -> set:
+    """Positions in ``vocabulary.skill_names`` of the given skill names; names not in the vocabulary are left out."""
+    return {vocabulary.skill_index[name] for name in names if name in vocabulary.skill_index}
+
+
+def encode_required_skills(text: str, vocabulary) -> bytes:
+    """Bitset of the required skills of a listing that are in the vocabulary; fragments that are not are ignored."""
+    return encode(skill_positions(split_required_skills(text), vocabulary))
+
+
+def vocabulary_width(vocabulary) -> int:
+    """64-bit words needed for a bit per skill in the vocabulary."""
+    return (len(vocabulary.skill_names) + 63) // 64
+
+
+def _words(bits, width: int) -> np.ndarray:
+    """A bitset as ``width`` little-endian 64-bit words."""
+    padded = bytes(bits or b'')[:width * 8].ljust(width * 8, b'\0')
+    return np.frombuffer(padded, dtype='<u8')
+
+
+class SkillMatrix:
+    """Required-skill bitsets of every listing as one uint64 matrix.
+
+    Overlap with a resume is ``popcount(listing & resume)``, computed for all
+    listings at once one 64-skill word at a time.
+    """
+
+    def __init__(self, ids, bitsets, width: int, version=None):
+        self.version = version
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.width = width
+        words = np.zeros((len(self.ids), self.width), dtype=np.uint64)
+        for row, bits in enumerate(bitsets):
+            if bits:
+                words[row] = _words(bits, self.width)
+        self.counts = np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+        # Stored word-major: each word of every listing is one contiguous array
+        self.columns = np.ascontiguousarray(words.T)
+
+    def __repr__(self):
+        return f"SkillMatrix(version={self.version}, listings={len(self.ids)}, words={self.width})"
+
+    def rows(self, listing_ids) -> np.ndarray:
+        """Row numbers of listing ids (rows are in id order); ids not in the matrix get -1."""
+        listing_ids = np.asarray(listing_ids, dtype=np.int64)
+        if not len(self.ids):
+            return np.full(len(listing_ids), -1)
+        rows = np.minimum(np.searchsorted(self.ids, listing_ids), len(self.ids) - 1)
+        return np.where(self.ids[rows] == listing_ids, rows, -1)
+
+    def overlap(self, resume_bits) -> np.ndarray:
+        """Number of each listing's required skills the resume has."""
+        overlap = np.zeros(len(self.ids), dtype=np.int64)
+        resume_words = _words(resume_bits, self.width)
+        # A resume has a handful of skills, so most of its words are zero and skipped
+        for column in np.flatnonzero(resume_words):
+            overlap += np.bitwise_count(self.columns[column] & resume_words[column])
+        return overlap
+
+    def missing(self, row: int, resume_bits) -> list:
+        """Skill positions a listing requires that the resume lacks."""
+        missing = self.columns[:, row] & ~_words(resume_bits, self.width)
+        return decode(missing.astype('<u8').tobytes())
+
+
+def get_skill_matrix(vocabulary) -> SkillMatrix:
+    """Skill matrix over all listings, rebuilt when listings are added, removed or updated or the vocabulary changes.
+
+    Bitsets missing or encoded with another vocabulary are encoded from the
+    listing's required skills while building; ``encode_job_skills`` stores
+    them so later builds can skip that.
+    """
+    global _matrix
+    version = (listings_version(), vocabulary.version)
+    matrix = _matrix
+    if matrix is None or matrix.version != version:
+        with _lock:
+            matrix = _matrix
+            if matrix is None or matrix.version != version:
+                rows = list(
+                    JobListing.objects.order_by('id').values_list('id', 'skill_bits', 'skill_vocabulary_version')
+                )
+                bitsets = {
+                    listing_id: bits for listing_id, bits, bits_version in rows if bits_version == vocabulary.version
+                }
+                outdated = [listing_id for listing_id, _, _ in rows if listing_id not in bitsets]
+                for start in range(0, len(outdated), ENCODE_BATCH_SIZE):
+                    batch = JobListing.objects.filter(id__in=outdated[start:start + ENCODE_BATCH_SIZE])
+                    for listing_id, text in batch.values_list('id', 'required_skills'):
+                        bitsets[listing_id] = encode_required_skills(text, vocabulary)
+                if outdated:
+                    logger.warning(
+                        f"Encoded {len(outdated)} listings without a current skill bitset; "
+                        f"run encode_job_skills to store them"
+                    )
+                matrix = _matrix = SkillMatrix(
+                    [row[0] for row in rows],
+                    [bitsets.get(row[0]) for row in rows],
+                    vocabulary_width(vocabulary),
+                    version=version,
+                )
+                logger.info(f"Built {matrix}")
+    return matrix
+
+
+def resume_skill_bits(skills, vocabulary):
+    """Bitset of the resume skills known to the vocabulary, and the number of distinct resume skills."""
+    if isinstance(skills, str):
+        skills = skills.split(',')
+    names = {str(skill).strip().lower() for skill in skills if str(skill).strip()}
+    return encode(skill_positions(names, vocabulary)), len(names)
+
+
+def score_listings(listing_ids, skills) -> dict:
+    """Skill fit of each listing for the resume skills, keyed by listing id.
+
+    Overlap, Jaccard similarity and coverage (share of the listing's required
+    skills the resume has) are computed for the whole catalog at once; the
+    names of missing skills only for the listings asked for. Listings with no
+    encoded required skills are left out.
+    """
+    vocabulary = get_vocabulary()
+    matrix = get_skill_matrix(vocabulary)
+    resume_bits, resume_count = resume_skill_bits(skills, vocabulary)
+    overlap = matrix.overlap(resume_bits)
+    union = matrix.counts + resume_count - overlap
+    jaccard = np.divide(overlap, union, out=np.zeros(len(overlap)), where=union > 0)
+    coverage = np.divide(overlap, matrix.counts, out=np.zeros(len(overlap)), where=matrix.counts > 0)
+
+    listing_ids = list(listing_ids)
+    found = [(listing_id, row) for listing_id, row in zip(listing_ids, matrix.rows(listing_ids).tolist())
+             if row >= 0 and matrix.counts[row]]
+    missing = {listing_id: matrix.missing(row, resume_bits) for listing_id, row in found}
+    names = vocabulary.skill_names
+    return {
+        listing_id: {
+            'required_skills': int(matrix.counts[row]),
+            'skill_overlap': int(overlap[row]),
+            'skill_jaccard': round(float(jaccard[row]), 3),
+            'skill_coverage': round(float(coverage[row]), 3),
+            'missing_skills': sorted(names[position] for position in missing[listing_id] if position < len(names)),
+        }
+        for listing_id, row in found
+    }
+
+
+def blend(match_percentage: float, coverage: float) -> float:
+    """Match percentage with SKILL_SCORE_WEIGHT of it replaced by required-skill coverage."""
+    return match_percentage * (1 - SKILL_SCORE_WEIGHT) + coverage * 100 * SKILL_SCORE_WEIGHT
@@ -0,0 +1,151 @@
+import hashlib
+import logging
+
+from django.conf import settings
+from django.db import transaction
+
+from . import role_cache
+from .models import CatalogSnapshot, JobMatch, UserMatchState
+
+logger = logging.getLogger(__name__)
+
+BULK_BATCH_SIZE = 1000
+# Catalog versions whose job keys are kept for finding the jobs new since a user's last match
+SNAPSHOTS_KEPT = getattr(settings, 'CATALOG_SNAPSHOTS_KEPT', 10)
+
+
+def job_key(job) -> str:
+    """Stable key for a catalog job, from the fields that identify it."""
+    raw = '\x1f'.join(str(value or '') for value in (job.position, job.company, job.source_url, job.apply_link))
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+
+def search_key(skills, *options) -> str:
+    """Key for a search: the canonical skills plus the options (source, matcher) it ran with."""
+    raw = '\x1f'.join([','.join(role_cache.canonical_skills(skills)), *options])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def get_state(user):
+    """The user's match state, created empty before the first match so concurrent refreshes share one row to lock."""
+    state, _ = UserMatchState.objects.get_or_create(user=user)
+    return state
+
+
+def needs_refresh(state, catalog) -> bool:
+    """Whether the stored matches of ``state``'s search must be brought up to date before being served."""
+    return state.catalog_version != catalog.version or state.is_provisional
+
+
+def stored_matches(user, limit: int) -> list:
+    """The user's best ``limit`` current matches, best first."""
+    return list(
+        JobMatch.objects.filter(user=user, match_percentage__gt=0)
+        .order_by('-match_percentage', 'id')
+        .values('job_position', 'company', 'match_percentage', 'apply_url')[:limit]
+    )
+
+
+def catalog_keys(catalog) -> dict:
+    """{job key: record} for a catalog, first record winning for repeated jobs."""
+    jobs = {}
+    for job in catalog.records:
+        jobs.setdefault(job_key(job), job)
+    return jobs
+
+
+def record_snapshot(version: str, keys):
+    """Store the job keys of a catalog version once, keeping only the newest SNAPSHOTS_KEPT versions."""
+    _, created = CatalogSnapshot.objects.get_or_create(version=version, defaults={'job_keys': sorted(keys)})
+    if created:
+        old = CatalogSnapshot.objects.order_by('-created_at', '-id').values_list('pk', flat=True)[SNAPSHOTS_KEPT:]
+        deleted, _ = CatalogSnapshot.objects.filter(pk__in=list(old)).delete()
+        logger.info(f"Recorded catalog snapshot {version} ({len(keys)} jobs); removed {deleted} old snapshots")
+
+
+def snapshot_keys(version: str):
+    """Job keys of a recorded catalog version, or None if it was never recorded or was removed."""
+    snapshot = CatalogSnapshot.objects.filter(version=version).values_list('job_keys', flat=True).first()
+    return None if snapshot is None else set(snapshot)
+
+
+def _in_batches(keys):
+    keys = list(keys)
+    for start in range(0, len(keys), BULK_BATCH_SIZE):
+        yield keys[start:start + BULK_BATCH_SIZE]
+
+
+def refresh(user, state, search, catalog, potential_roles, score_positions) -> dict:
+    """Bring the user's stored matches up to date with the catalog and return counts of what changed.
+
+    Only matching jobs are stored. For the same search as ``state``, the jobs
+    scored are those not in the catalog version ``state`` was refreshed
+    against (from its CatalogSnapshot) plus provisional ones, and rows of jobs
+    that left the catalog are deleted. For a different search, or when that
+    snapshot is gone, every job is scored and the rows are replaced.
+
+    ``score_positions(potential_roles, titles)`` returns {title: match
+    percentage}, optionally with a ``fallback`` set of titles it could not
+    score with Gemini; their rows are stored as provisional, even at 0%, so
+    the next match scores them again. Scoring runs outside the transaction.
+    If another request refreshed the state meanwhile, its result is kept and
+    nothing is written.
+    """
+    current = catalog_keys(catalog)
+    record_snapshot(catalog.version, current)
+    previous = snapshot_keys(state.catalog_version) if state.search_key == search else None
+    if previous is None:
+        to_score, removed = list(current), None
+    else:
+        provisional_keys = set(JobMatch.objects.filter(user=user, is_provisional=True).values_list('job_key', flat=True))
+        to_score = [key for key in current if key not in previous or key in provisional_keys]
+        removed = previous.difference(current)
+
+    titles = list(dict.fromkeys(current[key].position for key in to_score if current[key].position))
+    scores = score_positions(potential_roles, titles) if titles else {}
+    fallback = getattr(scores, 'fallback', set())
+    rows = []
+    for key in to_score:
+        job = current[key]
+        match_percentage = round(scores.get(job.position, 0), 1)
+        is_provisional = job.position in fallback
+        if match_percentage > 0 or is_provisional:
+            rows.append(JobMatch(
+                user=user,
+                job_key=key,
+                job_position=job.position[:200],
+                company=str(job.company or '')[:200],
+                match_percentage=match_percentage,
+                apply_url=str(job.source_url or '')[:500],
+                catalog_version=catalog.version,
+                is_provisional=is_provisional,
+            ))
+    provisional = sum(1 for row in rows if row.is_provisional)
+
+    with transaction.atomic():
+        # The row exists (get_state), so concurrent refreshes queue on this lock
+        locked = UserMatchState.objects.select_for_update().get(pk=state.pk)
+        if locked.updated_at != state.updated_at:
+            logger.info(f"Stored matches for user {user.pk} were refreshed by another request")
+            return {'scored': 0, 'added': 0, 'deleted': 0, 'provisional': 0}
+
+        stored = JobMatch.objects.filter(user=user)
+        deleted = 0
+        if removed is None:
+            deleted, _ = stored.delete()
+        else:
+            # Jobs that left the catalog, and rows about to be replaced by a new score
+            for batch in _in_batches(removed.union(to_score)):
+                deleted += stored.filter(job_key__in=batch).delete()[0]
+        JobMatch.objects.bulk_create(rows, batch_size=BULK_BATCH_SIZE)
+        locked.search_key = search
+        locked.potential_roles = list(potential_roles)
+        locked.catalog_version = catalog.version
+        locked.is_provisional = bool(provisional)
+        locked.save()
+
+    logger.info(
+        f"Stored matches for user {user.pk}: scored {len(to_score)} jobs ({len(titles)} titles, "
+        f"{provisional} provisional), stored {len(rows)}, deleted {deleted}"
+    )
+    return {'scored': len(to_score), 'added': len(rows), 'deleted': deleted, 'provisional': provisional}
@@ -1,3 +1,607 @@
-from django.test import TestCase
+import asyncio
+import base64
+import math
+import random
+from unittest import mock
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from resume_parser.vocabulary import Vocabulary
+
+from . import llm, score_cache, scoring, skill_bits, stored_matches, vector_match
+from .catalog import JobCatalog
+from .listing_pages import DEFAULT_LISTING_FIELDS, encode_cursor
+from .models import CatalogSnapshot, JobListing, JobMatch, RoleScoreCacheEntry
+from .scoring import TitleScores
+from .title_index import TitleIndex
+from .views import AsyncMatchJobsView, MatchJobsView
 
 # Create your tests here.
+
+
+def brute_force_matches(variations, titles) -> set:
+    """Titles that contain, or are contained in, a variation, checked pair by pair."""
+    return {
+        title for title in titles
+        if any(variation.lower() in title.lower() or title.lower() in variation.lower() for variation in variations)
+    }
+
+
+class TitleIndexTests(SimpleTestCase):
+    """The title index direct-matches exactly the titles ``MatchJobsView.direct_role_match`` does."""
+
+    TITLES = [
+        'Python Developer', 'Senior Python Developer', 'Developer', 'Dev', 'Go Developer', 'Golang Engineer',
+        'AI Engineer', 'Data Scientist', 'Scientist', 'Data', 'C# .NET Developer', 'R', 'QA', 'qa analyst',
+        'Backend Engineer (Python)', 'Engineer', 'Machine Learning Engineer', 'ML', 'Web Developer', 'web',
+        'UX/UI Designer', 'Ai', 'Sr. Software Engineer', 'Software Engineer II',
+    ]
+
+    def assertSameAsView(self, potential_roles, titles=None):
+        titles = self.TITLES if titles is None else titles
+        view = MatchJobsView()
+        expected = {title for title in titles if view.direct_role_match(potential_roles, title)}
+        scores = view.direct_scores(potential_roles, titles, TitleIndex(titles))
+        self.assertEqual({title for title, score in scores.items() if score}, expected, potential_roles)
+
+    def test_short_variations(self):
+        for variation in ['R', 'Go', 'AI', 'ai', 'QA', 'ML', 'C#', 'a', 'de']:
+            self.assertSameAsView([variation])
+
+    def test_titles_contained_in_variation(self):
+        for role in ['Senior Python Developer', 'Lead Data Scientist', 'Machine Learning Engineer', 'Web Developer']:
+            self.assertSameAsView([role])
+
+    def test_known_role_variations(self):
+        self.assertSameAsView(['Software Engineer', 'Data Scientist', 'Python Developer', 'Unknown Role'])
+
+    def test_remembered_variations_are_bounded(self):
+        index = TitleIndex(self.TITLES)
+        with mock.patch('job_matcher.title_index.MATCH_CACHE_SIZE', 3):
+            for variation in ['python', 'go', 'qa', 'ai']:
+                index.match_variation(variation)
+            index.match_variation('qa')
+            index.match_variation('data')
+        self.assertEqual(list(index._matches), ['ai', 'qa', 'data'])
+        self.assertEqual(index.matching_titles(['python']), brute_force_matches(['python'], self.TITLES))
+
+    def test_random_titles(self):
+        rng = random.Random(7)
+        alphabet = 'abcAB .#'
+        titles = list({''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 8))) for _ in range(200)})
+        index = TitleIndex(titles)
+        for _ in range(200):
+            variations = [''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 6))) for _ in range(2)]
+            self.assertEqual(index.matching_titles(variations), brute_force_matches(variations, titles), variations)
+
+
+def dense_cosine_scores(texts, query) -> list:
+    """Cosine similarity of the query to each text, with the TF-IDF weights computed text by text."""
+    docs = [vector_match.ngrams(text) for text in texts]
+    doc_freq = {}
+    for grams in docs:
+        for gram in grams:
+            doc_freq[gram] = doc_freq.get(gram, 0) + 1
+
+    def vector(grams):
+        weights = {
+            gram: (1 + math.log(count)) * (math.log((1 + len(texts)) / (1 + doc_freq.get(gram, 0))) + 1)
+            for gram, count in grams.items()
+        }
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        return {gram: weight / norm for gram, weight in weights.items()} if norm else {}
+
+    query_vector = vector(vector_match.ngrams(query))
+    return [sum(weight * query_vector.get(gram, 0) for gram, weight in vector(grams).items()) for grams in docs]
+
+
+class VectorIndexTests(SimpleTestCase):
+    """Cosine ranking of the n-gram index, its empty inputs, and ``top_k``."""
+
+    TITLES = ['Python Developer', 'Senior Python Developer', 'Java Developer', 'Data Scientist', 'Chef', '!!!']
+
+    def test_scores_match_dense_cosine(self):
+        index = vector_match.VectorIndex(self.TITLES)
+        for query in ['Python Developer', 'python dev', 'Data Engineer', 'Java', 'Pastry Chef']:
+            expected = dense_cosine_scores(self.TITLES, query)
+            for score, value in zip(index.scores(query), expected):
+                self.assertAlmostEqual(float(score), value, places=5, msg=query)
+
+    def test_closest_title_ranks_first(self):
+        index = vector_match.VectorIndex(self.TITLES)
+        scores = index.scores('Python Developer')
+        self.assertAlmostEqual(float(scores[0]), 1.0, places=5)
+        ranked = [self.TITLES[position] for position in vector_match.top_k(scores, 3)]
+        self.assertEqual(ranked, ['Python Developer', 'Senior Python Developer', 'Java Developer'])
+        self.assertEqual(float(scores[4]), 0.0)
+
+    def test_empty_and_unknown_inputs(self):
+        index = vector_match.VectorIndex(self.TITLES)
+        for query in ['', '   ', '!!!', 'zzzz']:
+            self.assertEqual(index.scores(query).tolist(), [0.0] * len(self.TITLES), query)
+        self.assertEqual(index.match_scores([' ', '']).tolist(), [0.0] * len(self.TITLES))
+        self.assertEqual(float(index.scores('Chef !!!')[5]), 0.0)
+
+        empty = vector_match.VectorIndex([])
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(len(empty.scores('Python Developer')), 0)
+        self.assertEqual(len(empty.match_scores(['Python Developer'], ['SQL'])), 0)
+        self.assertEqual(len(vector_match.top_k(empty.scores('Python'), 5)), 0)
+
+    def test_top_k(self):
+        scores = np.array([0.2, 0.9, 0.5, 0.9, 0.0, 0.7], dtype=np.float32)
+        self.assertEqual(vector_match.top_k(scores, 3).tolist(), [1, 3, 5])
+        self.assertEqual(vector_match.top_k(scores, 10).tolist(), [1, 3, 5, 2, 0, 4])
+        self.assertEqual(vector_match.top_k(scores, 10, min_score=0.5).tolist(), [1, 3, 5, 2])
+        self.assertEqual(vector_match.top_k(scores, 2, min_score=0.95).tolist(), [])
+        self.assertEqual(vector_match.top_k(scores, 0).tolist(), [])
+        self.assertEqual(vector_match.top_k(scores, -1).tolist(), [])
+
+    def test_catalog_index_is_rebuilt_when_the_catalog_changes(self):
+        with mock.patch.object(vector_match, '_catalog_index', None):
+            first = vector_match.get_catalog_index(make_catalog(['Python Developer', 'Chef'], 'v1'))
+            self.assertIs(vector_match.get_catalog_index(make_catalog(['Python Developer', 'Chef'], 'v1')), first)
+            second = vector_match.get_catalog_index(make_catalog(['Data Scientist'], 'v2'))
+        self.assertIsNot(second, first)
+        self.assertEqual(second.keys, ['Data Scientist'])
+        self.assertEqual(second.version, 'v2')
+
+
+class ScoreCacheTests(TestCase):
+    """Titles that differ only in case or spacing share one cached score."""
+
+    ROLES = ['Python Developer']
+
+    def tearDown(self):
+        score_cache.clear_local()
+
+    def test_titles_differing_in_case_share_an_entry(self):
+        score_cache.set_many(self.ROLES, {'Software Engineer': 80.0, 'software  engineer': 80.0, 'Designer': 0})
+        self.assertEqual(RoleScoreCacheEntry.objects.count(), 2)
+
+        titles = ['Software Engineer', 'software engineer', 'SOFTWARE ENGINEER', 'Designer', 'Chef']
+        expected = {'Software Engineer': 80.0, 'software engineer': 80.0, 'SOFTWARE ENGINEER': 80.0, 'Designer': 0}
+        self.assertEqual(score_cache.get_many(self.ROLES, titles), expected)
+        # Served from the database once the in-process copy is gone
+        score_cache.clear_local()
+        self.assertEqual(score_cache.get_many(self.ROLES, titles), expected)
+
+
+class JobListingsApiTests(TestCase):
+    """Keyset pages, cursors, conditional GETs and field selection of the listings endpoint."""
+
+    def setUp(self):
+        self.listings = [
+            JobListing.objects.create(
+                title=f'Developer {number}', company='Acme', location='Remote',
+                description=f'Description {number}', required_skills='Python', source='https://acme.example',
+            )
+            for number in range(7)
+        ]
+
+    def get(self, **params):
+        return self.client.get(reverse('job_listings_api'), params)
+
+    def test_pages_cover_every_listing_once(self):
+        ids, cursor, pages = [], None, 0
+        while True:
+            response = self.get(page_size=3, **({'cursor': cursor} if cursor else {}))
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertLessEqual(len(data['listings']), 3)
+            ids.extend(listing['id'] for listing in data['listings'])
+            cursor, pages = data['next_cursor'], pages + 1
+            if cursor is None:
+                break
+        self.assertEqual(ids, [listing.id for listing in self.listings])
+        self.assertEqual(pages, 3)
+
+    def test_next_page_is_not_shifted_by_changes_before_it(self):
+        first = self.get(page_size=3).json()
+        self.listings[0].delete()
+        JobListing.objects.create(title='Late Developer', company='Acme', location='Remote', description='New')
+        second = self.get(page_size=3, cursor=first['next_cursor']).json()
+        self.assertEqual([listing['id'] for listing in second['listings']], [listing.id for listing in self.listings[3:6]])
+
+    def test_tampered_cursor_is_rejected(self):
+        not_json = base64.urlsafe_b64encode(b'not json').decode('ascii')
+        for cursor in ['!!!', not_json, encode_cursor([1, 2]), encode_cursor(['1']), encode_cursor([True]),
+                       encode_cursor({'id': 1})]:
+            response = self.get(cursor=cursor)
+            self.assertEqual(response.status_code, 400, cursor)
+            self.assertEqual(set(response.json()), {'error', 'detail'})
+
+    def test_unchanged_page_is_not_modified(self):
+        response = self.get(page_size=3)
+        etag = response.headers['ETag']
+
+        not_modified = self.client.get(reverse('job_listings_api'), {'page_size': 3}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+        # The same listings with other fields are another representation
+        other_fields = self.client.get(reverse('job_listings_api'), {'page_size': 3, 'fields': 'title'},
+                                       HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(other_fields.status_code, 200)
+
+        listing = self.listings[1]
+        listing.title = 'Senior Developer 1'
+        listing.save()
+        changed = self.client.get(reverse('job_listings_api'), {'page_size': 3}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers['ETag'], etag)
+
+    def test_page_membership_change_is_modified(self):
+        etag = self.get(page_size=3).headers['ETag']
+        # A later listing moves onto the page without changing the newest updated_at on it
+        self.listings[1].delete()
+        for headers in [{'HTTP_IF_NONE_MATCH': etag}, {'HTTP_IF_MODIFIED_SINCE': 'Fri, 01 Jan 2100 00:00:00 GMT'}]:
+            response = self.client.get(reverse('job_listings_api'), {'page_size': 3}, **headers)
+            self.assertEqual(response.status_code, 200, headers)
+            self.assertNotIn('Last-Modified', response.headers)
+            self.assertEqual([listing['id'] for listing in response.json()['listings']],
+                             [self.listings[0].id, self.listings[2].id, self.listings[3].id])
+
+    def test_default_fields_leave_out_the_description(self):
+        listing = self.get(page_size=1).json()['listings'][0]
+        self.assertEqual(set(listing), set(DEFAULT_LISTING_FIELDS))
+
+    def test_selected_fields(self):
+        listing = self.get(page_size=1, fields='title, description').json()['listings'][0]
+        self.assertEqual(listing, {'id': self.listings[0].id, 'title': 'Developer 0', 'description': 'Description 0'})
+
+    def test_unknown_field_is_rejected(self):
+        response = self.get(fields='title,salary')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('salary', response.json()['detail'])
+
+
+class FakeClock:
+    """Replaces ``time.monotonic`` in llm with a clock the test advances."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    """The breaker opens after consecutive failures and lets one trial call through once the reset time is up."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(llm, 'time', mock.Mock(monotonic=self.clock))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = llm.CircuitBreaker(failure_threshold=3, reset_timeout=30)
+
+    def open_breaker(self):
+        for _ in range(3):
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, 'open')
+
+    def test_success_resets_the_failure_count(self):
+        for _ in range(2):
+            self.breaker.record_failure()
+        self.breaker.record_success()
+        for _ in range(2):
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, 'closed')
+        self.assertTrue(self.breaker.allow())
+
+    def test_open_breaker_rejects_calls_until_the_reset_time(self):
+        self.open_breaker()
+        self.clock.now += 29
+        self.assertFalse(self.breaker.allow())
+        self.clock.now += 1
+        self.assertEqual(self.breaker.state, 'half-open')
+
+    def test_one_trial_call_closes_or_reopens(self):
+        self.open_breaker()
+        self.clock.now += 30
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, 'open')
+
+        self.clock.now += 30
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, 'closed')
+        self.assertTrue(self.breaker.allow())
+
+    def test_trial_that_never_reports_back_expires(self):
+        self.open_breaker()
+        self.clock.now += 30
+        self.assertTrue(self.breaker.allow())
+        # The trial's task is cancelled: neither record_success nor record_failure is called
+        self.clock.now += 29
+        self.assertFalse(self.breaker.allow())
+        self.clock.now += 1
+        self.assertTrue(self.breaker.allow())
+
+    def test_cancelled_async_trial_does_not_wedge_the_breaker(self):
+        self.open_breaker()
+        self.clock.now += 30
+
+        async def cancelled_call():
+            model = mock.Mock()
+            model.generate_content_async = mock.AsyncMock(side_effect=asyncio.CancelledError)
+            with mock.patch.multiple(llm, breaker=self.breaker, rate_limiter=llm.TokenBucket(rate=1, capacity=1),
+                                     get_model=mock.Mock(return_value=model)):
+                await llm.generate_async('prompt')
+
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(cancelled_call())
+        self.clock.now += 30
+        self.assertTrue(self.breaker.allow())
+
+
+class TokenBucketTests(SimpleTestCase):
+    """The bucket allows bursts up to its capacity, then refills at its rate."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(llm, 'time', mock.Mock(monotonic=self.clock))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_then_wait_for_refill(self):
+        bucket = llm.TokenBucket(rate=2, capacity=3)
+        self.assertEqual([bucket._take() for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(bucket._take(), 0.5)
+        self.clock.now += 0.5
+        self.assertEqual(bucket._take(), 0)
+
+    def test_refill_is_capped_at_capacity(self):
+        bucket = llm.TokenBucket(rate=2, capacity=3)
+        for _ in range(3):
+            bucket._take()
+        self.clock.now += 60
+        self.assertEqual([bucket._take() for _ in range(3)], [0, 0, 0])
+        self.assertGreater(bucket._take(), 0)
+
+    def test_acquire_sleeps_until_a_token_is_available(self):
+        bucket = llm.TokenBucket(rate=4, capacity=1)
+        sleeps = []
+
+        async def sleep(seconds):
+            sleeps.append(seconds)
+            self.clock.now += seconds
+
+        async def acquire_twice():
+            await bucket.acquire()
+            await bucket.acquire()
+
+        with mock.patch.object(llm.asyncio, 'sleep', sleep):
+            asyncio.run(acquire_twice())
+        self.assertEqual(sleeps, [0.25])
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class PotentialRolesTests(SimpleTestCase):
+    """Basic roles used when Gemini names none are provisional and never cached."""
+
+    SKILLS = ['Python', 'Django']
+
+    def setUp(self):
+        cache.clear()
+        self.model = mock.Mock()
+        self.model.generate_content.return_value = mock.Mock(text=' , ')
+        patcher = mock.patch('job_matcher.views.get_model', return_value=self.model)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_empty_answers_fall_back_without_caching(self):
+        view = MatchJobsView()
+        roles, provisional = view.resolve_potential_roles(self.SKILLS)
+        self.assertTrue(provisional)
+        self.assertEqual(sorted(roles), sorted(view.get_basic_roles(['python', 'django'])))
+
+        self.model.generate_content.return_value = mock.Mock(text='Python Developer, Django Developer')
+        self.assertEqual(view.resolve_potential_roles(self.SKILLS), (['Python Developer', 'Django Developer'], False))
+        # The Gemini answer is cached; the basic roles were not
+        self.model.generate_content.return_value = mock.Mock(text=' , ')
+        self.assertEqual(view.resolve_potential_roles(self.SKILLS), (['Python Developer', 'Django Developer'], False))
+
+    def test_async_empty_answers_fall_back_without_caching(self):
+        answers = [' , ', ' , ', 'Backend Developer']
+
+        async def generate(prompt, **kwargs):
+            return answers.pop(0)
+
+        view = AsyncMatchJobsView()
+        with mock.patch('job_matcher.views.generate_async', generate):
+            roles = asyncio.run(view.determine_potential_roles(self.SKILLS))
+            self.assertEqual(sorted(roles), sorted(MatchJobsView().get_basic_roles(['python', 'django'])))
+            self.assertEqual(asyncio.run(view.determine_potential_roles(self.SKILLS)), ['Backend Developer'])
+
+
+def make_catalog(titles, version):
+    return JobCatalog([{'Job Position': title, 'Company': 'Acme', 'Source URL': f'https://acme.example/{title}'}
+                       for title in titles], version=version)
+
+
+class FakeScorer:
+    """Scores titles containing "Python" 80 and the rest 0, recording which titles it was asked about."""
+
+    def __init__(self, fallback=()):
+        self.fallback = set(fallback)
+        self.calls = []
+
+    def __call__(self, potential_roles, titles):
+        self.calls.append(sorted(titles))
+        scores = {title: 80.0 if 'Python' in title else 0 for title in titles}
+        return TitleScores(scores, self.fallback.intersection(titles))
+
+
+class StoredMatchesRefreshTests(TestCase):
+    """Stored matches keep only matching jobs and score only what changed since the last refresh."""
+
+    ROLES = ['Python Developer']
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='ann', email='ann@example.com', password='x')
+        self.search = stored_matches.search_key(['python'], 'file', 'gemini')
+
+    def refresh(self, catalog, scorer, search=None):
+        state = stored_matches.get_state(self.user)
+        return stored_matches.refresh(self.user, state, search or self.search, catalog, self.ROLES, scorer)
+
+    def stored(self):
+        return dict(JobMatch.objects.filter(user=self.user).values_list('job_position', 'match_percentage'))
+
+    def test_first_refresh_stores_only_matches(self):
+        scorer = FakeScorer()
+        self.refresh(make_catalog(['Python Dev', 'Chef', 'Senior Python Dev'], 'v1'), scorer)
+        self.assertEqual(scorer.calls, [['Chef', 'Python Dev', 'Senior Python Dev']])
+        self.assertEqual(self.stored(), {'Python Dev': 80.0, 'Senior Python Dev': 80.0})
+        state = stored_matches.get_state(self.user)
+        self.assertEqual((state.search_key, state.catalog_version, state.is_provisional), (self.search, 'v1', False))
+
+    def test_catalog_change_scores_only_new_jobs_and_deletes_removed(self):
+        self.refresh(make_catalog(['Python Dev', 'Chef', 'Senior Python Dev'], 'v1'), FakeScorer())
+        scorer = FakeScorer()
+        counts = self.refresh(make_catalog(['Python Dev', 'Chef', 'Python Lead', 'Baker'], 'v2'), scorer)
+        self.assertEqual(scorer.calls, [['Baker', 'Python Lead']])
+        self.assertEqual(self.stored(), {'Python Dev': 80.0, 'Python Lead': 80.0})
+        self.assertEqual(counts['scored'], 2)
+
+    def test_missing_snapshot_scores_everything(self):
+        self.refresh(make_catalog(['Python Dev', 'Chef'], 'v1'), FakeScorer())
+        CatalogSnapshot.objects.filter(version='v1').delete()
+        scorer = FakeScorer()
+        self.refresh(make_catalog(['Python Dev', 'Chef', 'Python Lead'], 'v2'), scorer)
+        self.assertEqual(scorer.calls, [['Chef', 'Python Dev', 'Python Lead']])
+        self.assertEqual(self.stored(), {'Python Dev': 80.0, 'Python Lead': 80.0})
+
+    def test_provisional_jobs_are_scored_again(self):
+        catalog = make_catalog(['Python Dev', 'Chef'], 'v1')
+        self.refresh(catalog, FakeScorer(fallback={'Python Dev', 'Chef'}))
+        self.assertEqual(self.stored(), {'Python Dev': 80.0, 'Chef': 0})
+        state = stored_matches.get_state(self.user)
+        self.assertTrue(stored_matches.needs_refresh(state, catalog))
+
+        scorer = FakeScorer()
+        self.refresh(catalog, scorer)
+        self.assertEqual(scorer.calls, [['Chef', 'Python Dev']])
+        self.assertEqual(self.stored(), {'Python Dev': 80.0})
+        self.assertFalse(JobMatch.objects.filter(user=self.user, is_provisional=True).exists())
+        self.assertFalse(stored_matches.needs_refresh(stored_matches.get_state(self.user), catalog))
+
+    def test_new_search_replaces_matches(self):
+        self.refresh(make_catalog(['Python Dev', 'Chef'], 'v1'), FakeScorer())
+        scorer = FakeScorer()
+        self.refresh(make_catalog(['Python Dev', 'Chef'], 'v1'), scorer, search='another search')
+        self.assertEqual(scorer.calls, [['Chef', 'Python Dev']])
+        self.assertEqual(self.stored(), {'Python Dev': 80.0})
+
+    def test_concurrent_refresh_is_skipped(self):
+        stale_state = stored_matches.get_state(self.user)
+        self.refresh(make_catalog(['Python Dev'], 'v1'), FakeScorer())
+        counts = stored_matches.refresh(
+            self.user, stale_state, self.search, make_catalog(['Python Lead'], 'v2'), self.ROLES, FakeScorer()
+        )
+        self.assertEqual(counts['added'], 0)
+        self.assertEqual(self.stored(), {'Python Dev': 80.0})
+        self.assertEqual(stored_matches.get_state(self.user).catalog_version, 'v1')
+
+    def test_old_snapshots_are_removed(self):
+        with mock.patch.object(stored_matches, 'SNAPSHOTS_KEPT', 2):
+            for version in ('v1', 'v2', 'v3'):
+                stored_matches.record_snapshot(version, ['a'])
+        self.assertEqual(sorted(CatalogSnapshot.objects.values_list('version', flat=True)), ['v2', 'v3'])
+
+
+def make_vocabulary(skills, version):
+    return Vocabulary({'skills': skills, 'degrees': []}, version=version)
+
+
+class SkillBitsTests(SimpleTestCase):
+    """Bitsets round-trip skill positions, and the matrix counts overlaps the way sets do."""
+
+    def test_encode_decode_round_trip(self):
+        for positions in ([], [0], [7, 8], [1, 63, 64, 200], list(range(0, 300, 3))):
+            self.assertEqual(skill_bits.decode(skill_bits.encode(positions)), sorted(positions))
+        self.assertEqual(skill_bits.encode([0, 9]), bytes([1, 2]))
+
+    def test_encode_required_skills_ignores_unknown_fragments(self):
+        vocabulary = make_vocabulary(['Python', 'SQL', 'Docker'], 'v1')
+        bits = skill_bits.encode_required_skills('python; SQL | 3+ years of experience, N/A', vocabulary)
+        self.assertEqual([vocabulary.skill_names[position] for position in skill_bits.decode(bits)], ['python', 'sql'])
+        self.assertEqual(skill_bits.encode_required_skills('N/A', vocabulary), b'')
+
+    def test_matrix_overlap_matches_set_intersection(self):
+        rng = random.Random(3)
+        listings = [set(rng.sample(range(150), rng.randint(0, 20))) for _ in range(40)]
+        resume = set(rng.sample(range(150), 12))
+        matrix = skill_bits.SkillMatrix(
+            list(range(1, 41)), [skill_bits.encode(skills) or None for skills in listings], width=3
+        )
+        resume_bits = skill_bits.encode(resume)
+        self.assertEqual(matrix.overlap(resume_bits).tolist(), [len(skills & resume) for skills in listings])
+        self.assertEqual(matrix.counts.tolist(), [len(skills) for skills in listings])
+        for row, skills in enumerate(listings):
+            self.assertEqual(matrix.missing(row, resume_bits), sorted(skills - resume))
+
+    def test_rows_of_listing_ids(self):
+        matrix = skill_bits.SkillMatrix([2, 5, 9], [None, None, None], width=1)
+        self.assertEqual(matrix.rows([9, 1, 5, 10]).tolist(), [2, -1, 1, -1])
+        self.assertEqual(skill_bits.SkillMatrix([], [], width=1).rows([1]).tolist(), [-1])
+
+
+class ScoreListingsTests(TestCase):
+    """Skill fit of listings against resume skills, including after the vocabulary changes."""
+
+    def setUp(self):
+        self.vocabulary = make_vocabulary(['Python', 'SQL', 'Docker', 'React'], 'v1')
+        self.python = JobListing.objects.create(
+            title='Python Developer', company='Acme', location='Remote', description='',
+            required_skills='Python, SQL, Docker',
+        )
+        self.frontend = JobListing.objects.create(
+            title='Frontend Developer', company='Acme', location='Remote', description='', required_skills='React',
+        )
+        self.unknown = JobListing.objects.create(
+            title='Chef', company='Acme', location='Remote', description='', required_skills='Knife skills',
+        )
+
+    def score(self, vocabulary, skills):
+        with mock.patch.object(skill_bits, 'get_vocabulary', return_value=vocabulary):
+            return skill_bits.score_listings([self.python.id, self.frontend.id, self.unknown.id], skills)
+
+    def test_skill_fit(self):
+        fits = self.score(self.vocabulary, ['python', 'Docker', 'Go'])
+        self.assertEqual(set(fits), {self.python.id, self.frontend.id})
+        self.assertEqual(fits[self.python.id], {
+            'required_skills': 3, 'skill_overlap': 2, 'skill_jaccard': 0.5, 'skill_coverage': 0.667,
+            'missing_skills': ['sql'],
+        })
+        self.assertEqual(fits[self.frontend.id]['skill_overlap'], 0)
+
+    def test_outdated_bitsets_are_encoded_with_the_loaded_vocabulary(self):
+        JobListing.objects.filter(pk=self.python.pk).update(
+            skill_bits=skill_bits.encode([0, 1, 2]), skill_vocabulary_version='old'
+        )
+        # Positions moved: "aws" sorts before the others
+        reloaded = make_vocabulary(['Python', 'SQL', 'Docker', 'React', 'AWS'], 'v2')
+        fits = self.score(reloaded, 'python,aws')
+        self.assertEqual(fits[self.python.id]['skill_overlap'], 1)
+        self.assertEqual(fits[self.python.id]['missing_skills'], ['docker', 'sql'])
+
+
+class ScoreBatchTests(SimpleTestCase):
+    """One scoring call per batch, bounded by its own timeout."""
+
+    def test_call_has_a_timeout(self):
+        model = mock.Mock()
+        model.generate_content.return_value = mock.Mock(text='[{"id": 1, "score": 90}, {"id": 2, "score": 10}]')
+        with mock.patch.object(scoring, 'get_model', return_value=model):
+            scores = scoring.score_batch('Python Developer', ['Python Dev', 'Chef'])
+        self.assertEqual(scores, {'Python Dev': 90.0, 'Chef': 10.0})
+        self.assertEqual(model.generate_content.call_args.kwargs['request_options'], {'timeout': scoring.SCORE_TIMEOUT})
@@ -0,0 +1,89 @@
+import functools
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+NGRAM = 3
+# Variations whose matches each index remembers; Gemini's free-text roles keep adding new ones
+MATCH_CACHE_SIZE = 1024
+
+
+class TitleIndex:
+    """Index of job titles answering, per role variation, which titles it direct-matches.
+
+    A title matches a variation when either lowercased string contains the other,
+    exactly like the per-job check in ``MatchJobsView.direct_role_match``.
+    "Variation in title" is answered from a trigram index and verified on the
+    few candidates; "title in variation" by looking up the variation's
+    substrings among the titles. Results for the MATCH_CACHE_SIZE most
+    recently used variations are kept.
+    """
+
+    def __init__(self, titles):
+        self.titles = [title for title in dict.fromkeys(titles) if title]
+        self._lowered = [title.lower() for title in self.titles]
+        self._ids_by_title = {}
+        self._ngrams = {}
+        for title_id, title in enumerate(self._lowered):
+            self._ids_by_title.setdefault(title, []).append(title_id)
+            for start in range(len(title) - NGRAM + 1):
+                self._ngrams.setdefault(title[start:start + NGRAM], set()).add(title_id)
+        self._title_lengths = {len(title) for title in self._ids_by_title}
+        self._matches = OrderedDict()
+        self._matches_lock = threading.Lock()
+
+    def _titles_containing(self, variation: str) -> set:
+        if len(variation) < NGRAM:
+            return {title_id for title_id, title in enumerate(self._lowered) if variation in title}
+        postings = []
+        for start in range(len(variation) - NGRAM + 1):
+            posting = self._ngrams.get(variation[start:start + NGRAM])
+            if not posting:
+                return set()
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                return candidates
+        return {title_id for title_id in candidates if variation in self._lowered[title_id]}
+
+    def _titles_contained_in(self, variation: str) -> set:
+        found = set()
+        for length in self._title_lengths:
+            for start in range(len(variation) - length + 1):
+                found.update(self._ids_by_title.get(variation[start:start + length], ()))
+        return found
+
+    def match_variation(self, variation: str) -> frozenset:
+        """Ids of titles that contain, or are contained in, the variation."""
+        variation = variation.lower()
+        with self._matches_lock:
+            matches = self._matches.get(variation)
+            if matches is not None:
+                self._matches.move_to_end(variation)
+                return matches
+        matches = frozenset(self._titles_containing(variation) | self._titles_contained_in(variation))
+        with self._matches_lock:
+            self._matches[variation] = matches
+            while len(self._matches) > MATCH_CACHE_SIZE:
+                self._matches.popitem(last=False)
+        return matches
+
+    def matching_titles(self, variations) -> set:
+        """Titles direct-matched by any of the variations."""
+        title_ids = set()
+        for variation in variations:
+            title_ids |= self.match_variation(variation)
+        return {self.titles[title_id] for title_id in title_ids}
+
+
+@functools.lru_cache(maxsize=4)
+def build_title_index(titles: tuple) -> TitleIndex:
+    """Build (or reuse) the index for a catalog's titles; the same catalog yields the same index."""
+    index = TitleIndex(titles)
+    logger.info(f"Built title index over {len(index.titles)} job titles")
+    return index
@@ -4,4 +4,5 @@ from . import views
 urlpatterns = [
     path('api/listings/', views.job_listings_api, name='job_listings_api'),
     path('api/match-jobs/', views.MatchJobsView.as_view(), name='match_jobs'),
+    path('api/match-jobs/async/', views.AsyncMatchJobsView.as_view(), name='match_jobs_async'),
 ]
\ No newline at end of file
@@ -0,0 +1,168 @@
+import logging
+import math
+import re
+import threading
+from collections import Counter
+
+import numpy as np
+from django.db.models import Count, Max
+
+from .models import JobListing
+
+logger = logging.getLogger(__name__)
+
+NGRAM = 3
+# How much the resume skills can lift a title's similarity to the closest role
+SKILL_WEIGHT = 0.5
+
+WORD_RE = re.compile(r'[a-z0-9+#.]+')
+
+_lock = threading.Lock()
+_catalog_index = None
+_listing_index = None
+
+
+def ngrams(text: str) -> Counter:
+    """Character trigrams of each word, padded with spaces so word starts and ends count."""
+    grams = Counter()
+    for word in WORD_RE.findall(text.lower()):
+        padded = f' {word} '
+        grams.update(padded[start:start + NGRAM] for start in range(len(padded) - NGRAM + 1))
+    return grams
+
+
+class VectorIndex:
+    """TF-IDF vectors of character n-grams for a fixed set of documents.
+
+    Vectors are L2-normalized and stored column-wise (for each n-gram, the
+    documents containing it and their weights), so scoring a query against
+    every document is one gather over the query's n-grams and a bincount.
+    """
+
+    def __init__(self, texts, keys=None, version=None):
+        self.version = version
+        self.size = len(texts)
+        # What each document stands for (a title, a row id), in document order
+        self.keys = list(range(self.size)) if keys is None else list(keys)
+        self._positions = None
+        vocabulary = {}
+        rows, columns, counts = [], [], []
+        for doc_id, text in enumerate(texts):
+            for gram, count in ngrams(text).items():
+                rows.append(doc_id)
+                columns.append(vocabulary.setdefault(gram, len(vocabulary)))
+                counts.append(count)
+        self.vocabulary = vocabulary
+
+        rows = np.asarray(rows, dtype=np.int32)
+        columns = np.asarray(columns, dtype=np.int32)
+        doc_freq = np.bincount(columns, minlength=len(vocabulary))
+        self.idf = np.log((1 + self.size) / (1 + doc_freq)) + 1
+        self.missing_idf = math.log(1 + self.size) + 1
+
+        weights = (1 + np.log(np.asarray(counts, dtype=np.float64))) * self.idf[columns]
+        norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=self.size))
+        weights /= norms[rows]
+
+        order = np.argsort(columns, kind='stable')
+        self.indptr = np.concatenate(([0], np.cumsum(doc_freq))).astype(np.int64)
+        self.indices = rows[order]
+        self.data = weights[order].astype(np.float32)
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return f"VectorIndex(version={self.version}, docs={self.size}, features={len(self.vocabulary)})"
+
+    def positions(self, keys) -> list:
+        """Document ids of the given keys; unknown keys are skipped."""
+        if self._positions is None:
+            self._positions = {key: position for position, key in enumerate(self.keys)}
+        return [self._positions[key] for key in keys if key in self._positions]
+
+    def scores(self, text: str) -> np.ndarray:
+        """Cosine similarity of the text to every document."""
+        known, weights, norm = [], [], 0.0
+        for gram, count in ngrams(text).items():
+            feature = self.vocabulary.get(gram)
+            weight = (1 + math.log(count)) * (self.idf[feature] if feature is not None else self.missing_idf)
+            norm += weight * weight
+            if feature is not None:
+                known.append(feature)
+                weights.append(weight)
+        if not known:
+            return np.zeros(self.size, dtype=np.float32)
+
+        known = np.asarray(known, dtype=np.int64)
+        starts = self.indptr[known]
+        lengths = self.indptr[known + 1] - starts
+        # Positions of every (document, weight) entry in the query's columns
+        offsets = np.cumsum(lengths) - lengths
+        positions = np.arange(lengths.sum()) - np.repeat(offsets - starts, lengths)
+        products = self.data[positions] * np.repeat(np.asarray(weights) / math.sqrt(norm), lengths)
+        return np.bincount(self.indices[positions], weights=products, minlength=self.size).astype(np.float32)
+
+    def match_scores(self, potential_roles, skills=()) -> np.ndarray:
+        """Match percentage (0-100) of every document for the roles and resume skills.
+
+        A document scores its similarity to the closest role, lifted by its
+        similarity to the skills taken together.
+        """
+        role_scores = [self.scores(role) for role in potential_roles if role.strip()]
+        scores = np.max(role_scores, axis=0) if role_scores else np.zeros(self.size, dtype=np.float32)
+        skills_text = skills if isinstance(skills, str) else ' '.join(str(skill) for skill in skills)
+        if skills_text.strip():
+            scores = scores + (1 - scores) * SKILL_WEIGHT * self.scores(skills_text)
+        return np.clip(scores * 100, 0, 100)
+
+
+def top_k(scores: np.ndarray, k: int, min_score: float = 0) -> np.ndarray:
+    """Ids of the k highest scores at or above min_score, best first."""
+    if k <= 0 or not len(scores):
+        return np.empty(0, dtype=np.int64)
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    candidates = candidates[scores[candidates] >= min_score]
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+def get_catalog_index(catalog) -> VectorIndex:
+    """Vector index over the catalog's distinct titles, rebuilt when the catalog changes."""
+    global _catalog_index
+    index = _catalog_index
+    if index is None or index.version != catalog.version:
+        with _lock:
+            index = _catalog_index
+            if index is None or index.version != catalog.version:
+                index = _catalog_index = VectorIndex(catalog.titles, keys=catalog.titles, version=catalog.version)
+                logger.info(f"Built {index} for the job catalog")
+    return index
+
+
+def listings_version() -> tuple:
+    """Changes whenever listings are added, removed or updated."""
+    stats = JobListing.objects.aggregate(count=Count('id'), updated=Max('updated_at'), last_id=Max('id'))
+    return stats['count'], stats['updated'], stats['last_id']
+
+
+def get_listing_index() -> VectorIndex:
+    """Vector index over JobListing titles and required skills, keyed by row id.
+
+    Rebuilt when listings are added, removed or updated.
+    """
+    global _listing_index
+    version = listings_version()
+    index = _listing_index
+    if index is None or index.version != version:
+        with _lock:
+            index = _listing_index
+            if index is None or index.version != version:
+                rows = list(JobListing.objects.order_by('id').values_list('id', 'title', 'required_skills'))
+                index = _listing_index = VectorIndex(
+                    [f"{title} {skills}" for _, title, skills in rows], keys=[row[0] for row in rows], version=version
+                )
+                logger.info(f"Built {index} for job listings")
+    return index
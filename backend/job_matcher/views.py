@@ -1,29 +1,111 @@
+from asgiref.sync import sync_to_async
 from django.http import JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from .models import JobListing
-import json
-import os
-import re
-from django.conf import settings
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
-import google.generativeai as genai
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
 from .models import SubscriptionPlan, UserSubscription, JobMatch
+from .llm import LLMUnavailable, generate_async, get_model
+from .scoring import TitleScores, score_titles, score_titles_async
+from .title_index import build_title_index
+from .catalog import JOBS_FILE, get_catalog
+from .search import JOB_MATCH_SOURCE, direct_match_listings, rank_candidate_titles
+from . import role_cache, stored_matches
+from .match_pages import InvalidCursor, first_page, next_page, page_size, top_matches
+from .listing_pages import InvalidListingQuery, listing_fields, listing_page, page_listings, page_etag
+from .listing_pages import page_size as listing_page_size
+from django.conf import settings
+import json
 import logging
 import traceback
 import random
 
 logger = logging.getLogger(__name__)
 
-# Configure Gemini API
-genai.configure(api_key=settings.GOOGLE_GEMINI_API_KEY)
-# Use the correct model name
-model = genai.GenerativeModel("gemini-1.5-pro")
+# Variations and synonyms matched directly against job titles before asking Gemini
+ROLE_VARIATIONS = {
+    'Web Developer': ['Web Developer', 'Website Developer', 'Web Programmer', 'Web Engineer', 'Web Application Developer'],
+    'Frontend Developer': ['Frontend Developer', 'Front-end Developer', 'Front End Developer', 'UI Developer', 'Frontend Engineer', 'UI Engineer', 'JavaScript Developer'],
+    'Backend Developer': ['Backend Developer', 'Back-end Developer', 'Back End Developer', 'Backend Engineer', 'Server-side Developer', 'API Developer'],
+    'Full Stack Developer': ['Full Stack Developer', 'Full-Stack Developer', 'Full Stack Engineer', 'Full-Stack Engineer', 'Full Stack Web Developer'],
+    'Python Developer': ['Python Developer', 'Python Engineer', 'Python Programmer', 'Django Developer', 'Flask Developer', 'Python Backend Developer'],
+    'Node.js Developer': ['Node.js Developer', 'Node Developer', 'Node Engineer', 'Node Programmer', 'Express Developer', 'JavaScript Backend Developer']
+}
+
+JOB_SOURCES = ('file', 'database')
+JOB_MATCHERS = ('gemini', 'vector')
+JOB_MATCHER = getattr(settings, 'JOB_MATCHER', 'gemini')
+VECTOR_MIN_SCORE = getattr(settings, 'JOB_VECTOR_MIN_SCORE', 20)
+
+ROLES_PROMPT = """
+        TASK: Convert these technical skills into job roles.
+        SKILLS: {skills}
+
+        RULES:
+        1. Return ONLY a comma-separated list of job roles
+        2. Do not include any other text
+        3. Each role should be a standard tech industry job title
+        4. Include both specific and general roles
+        5. Maximum 5 roles
+
+        EXAMPLE:
+        Input: "Python, Django, HTML, CSS, JavaScript"
+        Output: "Web Developer,Full Stack Developer,Python Developer,Backend Developer,Frontend Developer"
+
+        YOUR RESPONSE MUST BE ONLY THE COMMA-SEPARATED LIST OF ROLES.
+        """
+
+ROLES_FALLBACK_PROMPT = """
+            List job roles for someone with these skills: {skills}
+            Format: role1,role2,role3
+            """
+
+def parse_roles(text):
+    """Roles from a comma-separated model response."""
+    return [role.strip() for role in text.split(',') if role.strip()]
+
+class NoRolesFound(Exception):
+    """Gemini answered both role prompts without naming any role."""
 
 def job_listings_api(request):
-    listings = JobListing.objects.values('id', 'title', 'company', 'location', 'description', 'required_skills', 'source')
-    return JsonResponse(list(listings), safe=False)
+    """One page of job listings, optionally searched with ``q``.
+
+    ``fields`` selects a comma-separated subset of fields (the description is
+    left out by default), ``page_size`` the page length and ``cursor`` the
+    page after an earlier one. Pages carry an ETag, so a page that has not
+    changed is answered with 304 Not Modified.
+
+    The response is ``{"listings": [...], "next_cursor": ...}``, no longer
+    the bare list of every listing; clients must follow ``next_cursor`` and
+    ask for ``description`` in ``fields`` to get it.
+    """
+    query = request.GET.get('q', '').strip()
+    try:
+        fields = listing_fields(request.GET.get('fields'))
+        keys, next_cursor = listing_page(query, request.GET.get('cursor'), listing_page_size(request.GET.get('page_size')))
+    except InvalidListingQuery as e:
+        logger.info(f"Rejected listings request: {e}")
+        return JsonResponse({
+            'error': 'Invalid listings request',
+            'detail': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    etag = page_etag(keys, fields, next_cursor)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = JsonResponse({'listings': page_listings(keys, fields), 'next_cursor': next_cursor})
+    response.headers['ETag'] = etag
+    # Cacheable, but checked with the server on every use
+    patch_cache_control(response, no_cache=True)
+    return response
 
 class MatchJobsView(APIView):
     permission_classes = [IsAuthenticated]
@@ -36,63 +118,52 @@ class MatchJobsView(APIView):
             return 10  # Default to free plan
 
     def determine_potential_roles(self, skills):
-        """Use Gemini to determine potential roles based on skills."""
+        """Use Gemini to determine potential roles based on skills, reusing the result for the same skill set."""
+        return self.resolve_potential_roles(skills)[0]
+
+    def resolve_potential_roles(self, skills):
+        """Return (roles, provisional): provisional when Gemini failed and the roles are the basic fallback."""
+        # Lowercased, deduplicated and sorted, so equivalent skill lists share a cache entry
+        skills = role_cache.canonical_skills(skills)
         try:
-            # Convert skills list to string if it's a list
-            skills_text = ', '.join(skills) if isinstance(skills, list) else str(skills)
-            
-            prompt = f"""
-            TASK: Convert these technical skills into job roles.
-            SKILLS: {skills_text}
-
-            RULES:
-            1. Return ONLY a comma-separated list of job roles
-            2. Do not include any other text
-            3. Each role should be a standard tech industry job title
-            4. Include both specific and general roles
-            5. Maximum 5 roles
-
-            EXAMPLE:
-            Input: "Python, Django, HTML, CSS, JavaScript"
-            Output: "Web Developer,Full Stack Developer,Python Developer,Backend Developer,Frontend Developer"
-
-            YOUR RESPONSE MUST BE ONLY THE COMMA-SEPARATED LIST OF ROLES.
-            """
-            
-            response = model.generate_content(prompt)
-            text = response.text.strip()
-            logger.info(f"Raw Gemini response for roles: {text}")
-            
-            # Clean and validate the response
-            roles = [role.strip() for role in text.split(',') if role.strip()]
-            
-            # If no roles found, try a fallback approach
-            if not roles:
-                logger.warning("No roles found in primary response, trying fallback...")
-                # Fallback: Use a simpler prompt
-                fallback_prompt = f"""
-                List job roles for someone with these skills: {skills_text}
-                Format: role1,role2,role3
-                """
-                fallback_response = model.generate_content(fallback_prompt)
-                fallback_text = fallback_response.text.strip()
-                logger.info(f"Fallback response: {fallback_text}")
-                roles = [role.strip() for role in fallback_text.split(',') if role.strip()]
-            
-            # If still no roles, use a basic set based on common skills
-            if not roles:
-                logger.warning("No roles found in fallback, using basic role mapping...")
-                basic_roles = self.get_basic_roles(skills)
-                roles = basic_roles
-            
-            logger.info(f"Final roles determined: {roles}")
-            return roles
-            
+            return role_cache.get_or_compute(skills, self.infer_potential_roles), False
+        except NoRolesFound as e:
+            logger.warning(f"{e}; using basic role mapping")
+            return self.get_basic_roles(skills), True
         except Exception as e:
             logger.error(f"Error determining potential roles: {str(e)}")
             logger.error(traceback.format_exc())
-            # Return basic roles as last resort
-            return self.get_basic_roles(skills)
+            # Return basic roles as last resort; not cached, so the next request asks Gemini again
+            return self.get_basic_roles(skills), True
+
+    def infer_potential_roles(self, skills):
+        """Ask Gemini for job roles matching a canonical skill list; raises if the API fails or names no roles."""
+        skills_text = ', '.join(skills)
+
+        prompt = ROLES_PROMPT.format(skills=skills_text)
+
+        response = get_model().generate_content(prompt)
+        text = response.text.strip()
+        logger.info(f"Raw Gemini response for roles: {text}")
+
+        # Clean and validate the response
+        roles = parse_roles(text)
+
+        # If no roles found, try a fallback approach
+        if not roles:
+            logger.warning("No roles found in primary response, trying fallback...")
+            # Fallback: Use a simpler prompt
+            fallback_response = get_model().generate_content(ROLES_FALLBACK_PROMPT.format(skills=skills_text))
+            fallback_text = fallback_response.text.strip()
+            logger.info(f"Fallback response: {fallback_text}")
+            roles = parse_roles(fallback_text)
+
+        # If still no roles, the caller falls back to a basic set based on common skills, which is not cached
+        if not roles:
+            raise NoRolesFound(f"No roles found for skills: {skills_text}")
+
+        logger.info(f"Final roles determined: {roles}")
+        return roles
 
     def get_basic_roles(self, skills):
         """Fallback method to determine basic roles based on common skill patterns."""
@@ -122,76 +193,290 @@ class MatchJobsView(APIView):
 
     def get_role_variations(self, role):
         """Get variations and synonyms for a given role."""
-        variations = {
-            'Web Developer': ['Web Developer', 'Website Developer', 'Web Programmer', 'Web Engineer', 'Web Application Developer'],
-            'Frontend Developer': ['Frontend Developer', 'Front-end Developer', 'Front End Developer', 'UI Developer', 'Frontend Engineer', 'UI Engineer', 'JavaScript Developer'],
-            'Backend Developer': ['Backend Developer', 'Back-end Developer', 'Back End Developer', 'Backend Engineer', 'Server-side Developer', 'API Developer'],
-            'Full Stack Developer': ['Full Stack Developer', 'Full-Stack Developer', 'Full Stack Engineer', 'Full-Stack Engineer', 'Full Stack Web Developer'],
-            'Python Developer': ['Python Developer', 'Python Engineer', 'Python Programmer', 'Django Developer', 'Flask Developer', 'Python Backend Developer'],
-            'Node.js Developer': ['Node.js Developer', 'Node Developer', 'Node Engineer', 'Node Programmer', 'Express Developer', 'JavaScript Backend Developer']
-        }
-        return variations.get(role, [role])
+        return ROLE_VARIATIONS.get(role, [role])
+
+    def direct_role_match(self, potential_roles, job_position):
+        """Return 100.0 if the job position contains, or is contained in, a variation of a role, else 0."""
+        job_position_lower = job_position.lower()
+        for role in potential_roles:
+            for variation in self.get_role_variations(role):
+                if variation.lower() in job_position_lower or job_position_lower in variation.lower():
+                    logger.info(f"Direct match found: {job_position} matches {variation}")
+                    return 100.0
+        return 0
 
     def check_role_match(self, potential_roles, job_position):
         """Check if a job position matches any of the potential roles."""
         try:
-            job_position_lower = job_position.lower()
-            
-            # First try direct matching with variations
-            for role in potential_roles:
-                for variation in self.get_role_variations(role):
-                    if variation.lower() in job_position_lower or job_position_lower in variation.lower():
-                        logger.info(f"Direct match found: {job_position} matches {variation}")
-                        return 100.0
-
-            # If no direct match, try to use Gemini (but don't fail if it's not available)
-            try:
-                roles_text = ', '.join(potential_roles)
-                prompt = f"""
-                Compare these potential roles with a job position and determine if there's a match.
-                
-                Potential Roles: {roles_text}
-                Job Position: {job_position}
-
-                Instructions:
-                1. Be lenient in matching - consider related roles and variations
-                2. If the job position is in the same domain as any role, consider it a match
-                3. Return a number between 0 and 100:
-                   - 100 for exact matches
-                   - 80-90 for very close matches
-                   - 60-70 for related roles
-                   - 40-50 for same domain but different focus
-                   - 0 for completely unrelated
-
-                Return ONLY the number.
-                """
-                
-                response = model.generate_content(prompt)
-                text = response.text.strip()
-                logger.info(f"Gemini response for {job_position}: {text}")
-                
-                number_match = re.search(r'\d+', text)
-                if number_match:
-                    match_percentage = float(number_match.group())
-                    if match_percentage >= 40:
-                        return match_percentage
-            except Exception as e:
-                logger.warning(f"Gemini API error, falling back to basic matching: {str(e)}")
-                # Fallback to basic matching if Gemini fails
-                if any(role.lower() in job_position_lower for role in potential_roles):
-                    return 80.0  # High confidence for partial matches
-                return 0
-
-            return 0
+            # First try direct matching with variations, then ask Gemini
+            return self.direct_role_match(potential_roles, job_position) or \
+                score_titles(potential_roles, [job_position]).get(job_position, 0)
         except Exception as e:
             logger.error(f"Error checking role match: {str(e)}")
             logger.error(traceback.format_exc())
             return 0
 
+    def direct_scores(self, potential_roles, job_positions, index=None):
+        """Score 100 for each job position that directly matches a role variation, 0 for the rest."""
+        scores = dict.fromkeys(job_positions, 0)
+        try:
+            # Only titles containing (or contained in) a role variation are touched
+            index = index or build_title_index(tuple(scores))
+            variations = [variation for role in potential_roles for variation in self.get_role_variations(role)]
+            for job_position in index.matching_titles(variations):
+                scores[job_position] = 100.0
+            logger.info(f"Direct matches found for {sum(1 for score in scores.values() if score)} job positions")
+        except Exception as e:
+            logger.error(f"Error checking direct role matches: {str(e)}")
+        return scores
+
+    def score_job_positions(self, potential_roles, job_positions, index=None):
+        """Match percentage for each job position: direct matches first, the rest scored by Gemini in batches.
+
+        Titles Gemini could not score are in the result's ``fallback`` set.
+        """
+        scores = TitleScores(self.direct_scores(potential_roles, job_positions, index))
+        unmatched = [job_position for job_position, score in scores.items() if not score]
+        if unmatched:
+            try:
+                scored = score_titles(potential_roles, unmatched)
+                scores.update(scored)
+                scores.fallback.update(scored.fallback)
+            except Exception as e:
+                logger.error(f"Error scoring job positions: {str(e)}")
+                logger.error(traceback.format_exc())
+                scores.fallback.update(unmatched)
+        return scores
+
+    def match_listings(self, potential_roles, skills=()):
+        """Match JobListing rows: direct matches found by the database, then its best ranked titles scored by Gemini."""
+        direct, candidates = self.listing_candidates(potential_roles)
+        scores = {}
+        if candidates:
+            try:
+                scores = score_titles(potential_roles, candidates)
+            except Exception as e:
+                logger.error(f"Error scoring job positions: {str(e)}")
+                logger.error(traceback.format_exc())
+        return self.listing_matches(direct, scores, skills)
+
+    def listing_candidates(self, potential_roles):
+        """Direct-match listings as a queryset, and the titles of the rest the database ranks closest to the roles."""
+        variations = [variation for role in potential_roles for variation in self.get_role_variations(role)]
+        direct = direct_match_listings(variations)
+        # Only the titles the database ranks closest to the roles go to Gemini
+        candidates = rank_candidate_titles(
+            potential_roles, queryset=JobListing.objects.exclude(pk__in=direct.values('pk'))
+        )
+        return direct, candidates
+
+    def listing_matches(self, direct, scores, skills=()):
+        """Matches for the direct-match listings (100) and the other listings whose titles scored above 0."""
+        fields = ('id', 'title', 'company', 'apply_link', 'source')
+        matches = [(listing, 100.0) for listing in direct.values(*fields)]
+        logger.info(f"Direct matches found for {len(matches)} job listings")
+
+        matched_titles = [title for title, score in scores.items() if score > 0]
+        if matched_titles:
+            scored = JobListing.objects.exclude(pk__in=direct.values('pk')).filter(title__in=matched_titles)
+            matches.extend((listing, scores[listing['title']]) for listing in scored.values(*fields))
+
+        return self.add_skill_scores([{
+            'job_id': listing['id'],
+            'job_position': listing['title'],
+            'company': listing['company'],
+            'match_percentage': round(match_percentage, 1),
+            'apply_url': listing['apply_link'] or listing['source'] or '#'
+        } for listing, match_percentage in matches], skills)
+
+    def add_skill_scores(self, matches, skills):
+        """Blend each listing match with how many of the listing's required skills the resume has.
+
+        Adds the overlap, Jaccard similarity and missing skills to matches for
+        listings with encoded required skills; the others are left as they are.
+        """
+        if not matches or not skills:
+            return matches
+        from . import skill_bits  # numpy is only loaded when listings are matched
+
+        fits = skill_bits.score_listings([match['job_id'] for match in matches], skills)
+        for match in matches:
+            fit = fits.get(match['job_id'])
+            if fit:
+                match['match_percentage'] = round(skill_bits.blend(match['match_percentage'], fit['skill_coverage']), 1)
+                match['skill_overlap'] = fit['skill_overlap']
+                match['skill_match'] = round(fit['skill_jaccard'] * 100, 1)
+                match['missing_skills'] = fit['missing_skills']
+        return matches
+
+    def catalog_matches(self, catalog, scores):
+        """Yield a match for every catalog job whose title scored above 0."""
+        for job in catalog.records:
+            match_percentage = scores.get(job.position, 0)
+            if match_percentage > 0:
+                yield {
+                    'job_position': job.position,
+                    'company': job.company,
+                    'match_percentage': round(match_percentage, 1),
+                    'apply_url': job.source_url
+                }
+
+    def match_stored(self, user, skills, catalog, max_matches):
+        """The user's best stored matches and their roles, after scoring any catalog jobs new since the last match.
+
+        Repeating the last search against an unchanged catalog reads JobMatch
+        only; a new search infers roles and replaces the stored matches.
+        Matches scored by a fallback are stored as provisional and scored
+        again on the next request. Fallback roles are never stored: the
+        matches are computed for this response only.
+        """
+        search = stored_matches.search_key(skills, 'file', 'gemini')
+        state = stored_matches.get_state(user)
+        if state.search_key == search:
+            potential_roles = state.potential_roles
+            if stored_matches.needs_refresh(state, catalog):
+                stored_matches.refresh(user, state, search, catalog, potential_roles, self.score_job_positions)
+            return stored_matches.stored_matches(user, max_matches), potential_roles
+
+        potential_roles, provisional = self.resolve_potential_roles(skills)
+        if not potential_roles:
+            return [], potential_roles
+        if provisional:
+            scores = self.score_job_positions(potential_roles, catalog.titles, catalog.title_index)
+            return top_matches(self.catalog_matches(catalog, scores), max_matches), potential_roles
+        stored_matches.refresh(user, state, search, catalog, potential_roles, self.score_job_positions)
+        return stored_matches.stored_matches(user, max_matches), potential_roles
+
+    def match_by_vectors(self, potential_roles, skills, limit, catalog=None):
+        """Match jobs locally with TF-IDF vectors instead of Gemini: direct matches score 100, the rest their similarity.
+
+        Reads the catalog when one is given, JobListing otherwise, and returns
+        the jobs behind the ``limit`` best scores.
+        """
+        from . import vector_match  # numpy is only loaded when this matcher is used
+
+        variations = [variation for role in potential_roles for variation in self.get_role_variations(role)]
+        if catalog is not None:
+            index = vector_match.get_catalog_index(catalog)
+            direct = catalog.title_index.matching_titles(variations)
+        else:
+            index = vector_match.get_listing_index()
+            direct = direct_match_listings(variations).values_list('id', flat=True)
+
+        scores = index.match_scores(potential_roles, skills)
+        scores[index.positions(direct)] = 100.0
+        top = {index.keys[doc_id]: float(scores[doc_id]) for doc_id in vector_match.top_k(scores, limit, VECTOR_MIN_SCORE)}
+        logger.info(f"Vector matcher kept {len(top)} of {len(index)} jobs")
+
+        if catalog is not None:
+            return [{
+                'job_position': job.position,
+                'company': job.company,
+                'match_percentage': round(top[job.position], 1),
+                'apply_url': job.source_url
+            } for job in catalog.records if job.position in top]
+        return self.add_skill_scores([{
+            'job_id': listing['id'],
+            'job_position': listing['title'],
+            'company': listing['company'],
+            'match_percentage': round(top[listing['id']], 1),
+            'apply_url': listing['apply_link'] or listing['source'] or '#'
+        } for listing in JobListing.objects.filter(id__in=list(top)).values('id', 'title', 'company', 'apply_link', 'source')], skills)
+
+    def match_options(self, data):
+        """Job source and matcher asked for, defaulting to settings; or an error body and status for unknown ones."""
+        source = data.get('source') or JOB_MATCH_SOURCE
+        if source not in JOB_SOURCES:
+            return source, None, ({
+                'error': 'Invalid source',
+                'detail': f"source must be one of: {', '.join(JOB_SOURCES)}"
+            }, status.HTTP_400_BAD_REQUEST)
+        matcher = data.get('matcher') or JOB_MATCHER
+        if matcher not in JOB_MATCHERS:
+            return source, matcher, ({
+                'error': 'Invalid matcher',
+                'detail': f"matcher must be one of: {', '.join(JOB_MATCHERS)}"
+            }, status.HTTP_400_BAD_REQUEST)
+        return source, matcher, None
+
+    def load_catalog(self):
+        """The scraped jobs catalog; or an error body and status when the jobs file is missing or invalid."""
+        # Parsed once per process and reloaded when the file changes
+        try:
+            return get_catalog(), None
+        except FileNotFoundError:
+            logger.error(f"Jobs file not found at: {JOBS_FILE}")
+            return None, ({
+                'error': 'Jobs data not found',
+                'detail': 'The jobs database is currently unavailable'
+            }, status.HTTP_503_SERVICE_UNAVAILABLE)
+        except ValueError as e:
+            logger.error(f"Invalid JSON in jobs file: {str(e)}")
+            return None, ({
+                'error': 'Invalid jobs data',
+                'detail': 'Error reading jobs database'
+            }, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def next_page_body(self, user, cursor, size):
+        """Response body and status for a later page of an earlier match, served from its cursor without matching again."""
+        try:
+            results, matches, next_cursor = next_page(user.pk, cursor, page_size(size))
+        except InvalidCursor as e:
+            logger.info(f"Rejected match cursor: {e}")
+            return {
+                'error': 'Invalid cursor',
+                'detail': 'The cursor is invalid or its results have expired; run the match again'
+            }, status.HTTP_400_BAD_REQUEST
+        return {
+            'matches': matches,
+            'total_matches': len(results['matches']),
+            'max_matches': results['max_matches'],
+            'potential_roles': results['potential_roles'],
+            'next_cursor': next_cursor
+        }, status.HTTP_200_OK
+
+    def results_body(self, user, matches, max_matches, potential_roles, size, catalog=None):
+        """Response body and status for the first page of the best ``max_matches`` matches."""
+        # Best matches first, limited by subscription; only the kept ones are ever sorted
+        matches = top_matches(matches, max_matches)
+
+        if not matches:
+            logger.warning("No matches found for roles: %s", potential_roles)
+            return {
+                'matches': [],
+                'total_matches': 0,
+                'max_matches': max_matches,
+                'message': 'No matching jobs found',
+                'potential_roles': potential_roles,
+                'sample_jobs': [job.position for job in catalog.records[:5]] if catalog else
+                    list(JobListing.objects.order_by('id').values_list('title', flat=True)[:5])
+            }, status.HTTP_200_OK
+
+        # Return the first page; the rest is kept for the cursor
+        page, next_cursor = first_page(user.pk, {
+            'matches': matches,
+            'max_matches': max_matches,
+            'potential_roles': potential_roles
+        }, page_size(size))
+
+        return {
+            'matches': page,
+            'total_matches': len(matches),
+            'max_matches': max_matches,
+            'potential_roles': potential_roles,
+            'next_cursor': next_cursor
+        }, status.HTTP_200_OK
+
     def post(self, request):
         try:
             logger.info("Incoming request data: %s", request.data)
-            
+
+            # Later pages come from the results ranked for the first one
+            cursor = request.data.get('cursor')
+            if cursor:
+                body, status_code = self.next_page_body(request.user, cursor, request.data.get('page_size'))
+                return Response(body, status=status_code)
+
             # Get data from request
             resume_skills = request.data.get('skills', [])
             if not resume_skills:
@@ -208,9 +493,29 @@ class MatchJobsView(APIView):
             logger.info(f"Processing request for user: {user_email}")
             logger.info(f"Skills: {resume_skills}")
             logger.info(f"Experience: {experience}")
+            max_matches = self.get_max_matches(user)
+
+            source, matcher, error = self.match_options(request.data)
+            if error:
+                return Response(error[0], status=error[1])
+
+            catalog = None
+            if source == 'file':
+                catalog, error = self.load_catalog()
+                if error:
+                    return Response(error[0], status=error[1])
+
+            if source == 'file' and matcher == 'gemini':
+                # Served from the user's stored matches; only jobs new to the catalog are scored
+                matches, potential_roles = self.match_stored(user, resume_skills, catalog, max_matches)
+            else:
+                # First, determine potential roles based on skills
+                potential_roles = self.determine_potential_roles(resume_skills)
+                if source == 'database' and matcher == 'gemini':
+                    matches = self.match_listings(potential_roles, resume_skills)
+                else:
+                    matches = self.match_by_vectors(potential_roles, resume_skills, max_matches, catalog)
 
-            # First, determine potential roles based on skills
-            potential_roles = self.determine_potential_roles(resume_skills)
             if not potential_roles:
                 return Response({
                     'error': 'Could not determine potential roles',
@@ -219,78 +524,133 @@ class MatchJobsView(APIView):
 
             logger.info(f"Determined potential roles: {potential_roles}")
 
-            # Load scraped jobs
-            jobs_file = os.path.join(settings.BASE_DIR, 'scraper', 'scraped_jobs.json')
-            if not os.path.exists(jobs_file):
-                logger.error(f"Jobs file not found at: {jobs_file}")
-                return Response({
-                    'error': 'Jobs data not found',
-                    'detail': 'The jobs database is currently unavailable'
-                }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
-
-            try:
-                with open(jobs_file, 'r', encoding='utf-8') as f:
-                    jobs = json.load(f)
-                logger.info(f"Successfully loaded {len(jobs)} jobs")
-                # Log the first few job positions to verify data
-                logger.info("Sample job positions:")
-                for job in jobs[:5]:
-                    logger.info(f"- {job.get('Job Position', 'No position')}")
-            except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON in jobs file: {str(e)}")
-                return Response({
-                    'error': 'Invalid jobs data',
-                    'detail': 'Error reading jobs database'
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-            # Calculate matches based on potential roles
-            matches = []
-            for job in jobs:
-                try:
-                    job_position = job.get('Job Position', '')
-                    if not job_position:
-                        continue
-
-                    match_percentage = self.check_role_match(potential_roles, job_position)
-                    if match_percentage > 0:
-                        matches.append({
-                            'job_position': job_position,
-                            'company': job.get('Company', 'Unknown Company'),
-                            'match_percentage': round(match_percentage, 1),
-                            'apply_url': job.get('Source URL', '#')
-                        })
-                except Exception as e:
-                    logger.error(f"Error processing job {job.get('Job Position', 'unknown')}: {str(e)}")
-                    continue
-
-            if not matches:
-                logger.warning("No matches found for roles: %s", potential_roles)
-                return Response({
-                    'matches': [],
-                    'total_matches': 0,
-                    'max_matches': self.get_max_matches(user),
-                    'message': 'No matching jobs found',
-                    'potential_roles': potential_roles,
-                    'sample_jobs': [job.get('Job Position', '') for job in jobs[:5]]
-                }, status=status.HTTP_200_OK)
-
-            # Sort matches by percentage
-            matches.sort(key=lambda x: x['match_percentage'], reverse=True)
-
-            # Limit matches based on subscription
-            max_matches = self.get_max_matches(user)
-            matches = matches[:max_matches]
+            body, status_code = self.results_body(
+                user, matches, max_matches, potential_roles, request.data.get('page_size'), catalog
+            )
+            return Response(body, status=status_code)
 
+        except Exception as e:
+            logger.error("Unexpected error: %s", traceback.format_exc())
             return Response({
-                'matches': matches,
-                'total_matches': len(matches),
-                'max_matches': max_matches,
-                'potential_roles': potential_roles
-            }, status=status.HTTP_200_OK)
+                'error': 'An unexpected error occurred',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncMatchJobsView(View):
+    """ASGI version of MatchJobsView: Gemini is called concurrently from the event loop.
+
+    Calls go through ``llm.generate_async`` (semaphore, rate limit, timeouts,
+    circuit breaker). While Gemini is unhealthy, roles fall back to
+    ``get_basic_roles`` and titles to direct variation matching, so requests
+    keep being answered without waiting on it. Takes the same request body and
+    returns the same response as MatchJobsView.
+    """
+    matching = MatchJobsView()
+
+    async def authenticate(self, request):
+        """The user behind the request's JWT, or None."""
+        try:
+            result = await sync_to_async(JWTAuthentication().authenticate)(request)
+        except (AuthenticationFailed, InvalidToken):
+            return None
+        return result[0] if result else None
+
+    async def infer_potential_roles(self, skills):
+        """Async ``MatchJobsView.infer_potential_roles``; raises if Gemini fails, is unavailable or names no roles."""
+        skills_text = ', '.join(skills)
+        text = (await generate_async(ROLES_PROMPT.format(skills=skills_text))).strip()
+        logger.info(f"Raw Gemini response for roles: {text}")
+        roles = parse_roles(text)
+        if not roles:
+            logger.warning("No roles found in primary response, trying fallback...")
+            text = (await generate_async(ROLES_FALLBACK_PROMPT.format(skills=skills_text))).strip()
+            logger.info(f"Fallback response: {text}")
+            roles = parse_roles(text)
+        if not roles:
+            raise NoRolesFound(f"No roles found for skills: {skills_text}")
+        logger.info(f"Final roles determined: {roles}")
+        return roles
+
+    async def determine_potential_roles(self, skills):
+        skills = role_cache.canonical_skills(skills)
+        try:
+            return await role_cache.aget_or_compute(skills, self.infer_potential_roles)
+        except LLMUnavailable:
+            logger.warning("Gemini circuit breaker is open; using basic role mapping")
+        except NoRolesFound as e:
+            logger.warning(f"{e}; using basic role mapping")
+        except Exception as e:
+            logger.error(f"Error determining potential roles: {e!r}")
+        # Not cached, so the next request asks Gemini again
+        return self.matching.get_basic_roles(skills)
+
+    async def post(self, request):
+        user = await self.authenticate(request)
+        if user is None:
+            return JsonResponse({
+                'error': 'Authentication required',
+                'detail': 'A valid access token is required'
+            }, status=status.HTTP_401_UNAUTHORIZED)
+        try:
+            data = json.loads(request.body or b'{}')
+            if not isinstance(data, dict):
+                raise ValueError('Expected a JSON object')
+        except ValueError:
+            return JsonResponse({
+                'error': 'Invalid request body',
+                'detail': 'Expected a JSON object'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            cursor = data.get('cursor')
+            if cursor:
+                body, status_code = await sync_to_async(self.matching.next_page_body)(user, cursor, data.get('page_size'))
+                return JsonResponse(body, status=status_code)
+
+            resume_skills = data.get('skills', [])
+            if not resume_skills:
+                return JsonResponse({
+                    'error': 'No skills provided',
+                    'detail': 'Resume skills are required'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            source, matcher, error = self.matching.match_options(data)
+            if error:
+                return JsonResponse(error[0], status=error[1])
+
+            logger.info(f"Processing async match for user: {getattr(user, 'email', 'Anonymous')}")
+            max_matches = await sync_to_async(self.matching.get_max_matches)(user)
+            potential_roles = await self.determine_potential_roles(resume_skills)
+            logger.info(f"Determined potential roles: {potential_roles}")
+
+            catalog = None
+            if source == 'file':
+                catalog, error = await sync_to_async(self.matching.load_catalog)()
+                if error:
+                    return JsonResponse(error[0], status=error[1])
+
+            if matcher == 'vector':
+                matches = await sync_to_async(self.matching.match_by_vectors)(
+                    potential_roles, resume_skills, max_matches, catalog
+                )
+            elif catalog is not None:
+                scores = self.matching.direct_scores(potential_roles, catalog.titles, catalog.title_index)
+                unmatched = [title for title, score in scores.items() if not score]
+                scores.update(await score_titles_async(potential_roles, unmatched))
+                matches = self.matching.catalog_matches(catalog, scores)
+            else:
+                direct, candidates = await sync_to_async(self.matching.listing_candidates)(potential_roles)
+                scores = await score_titles_async(potential_roles, candidates)
+                matches = await sync_to_async(self.matching.listing_matches)(direct, scores, resume_skills)
+
+            body, status_code = await sync_to_async(self.matching.results_body)(
+                user, matches, max_matches, potential_roles, data.get('page_size'), catalog
+            )
+            return JsonResponse(body, status=status_code)
 
         except Exception as e:
             logger.error("Unexpected error: %s", traceback.format_exc())
-            return Response({
+            return JsonResponse({
                 'error': 'An unexpected error occurred',
                 'detail': str(e)
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework_simplejwt',
     'corsheaders',
@@ -97,6 +98,24 @@ DATABASES = {
     }
 }
 
+# Cache shared by all workers: Redis when REDIS_URL is set, otherwise a database
+# table (create it once with `python manage.py createcachetable`)
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -167,14 +186,83 @@ CORS_ALLOW_HEADERS = [
 ]
 
 import os
-import nltk
 
 
 # Google Gemini API Key
 GOOGLE_GEMINI_API_KEY = os.getenv('GOOGLE_GEMINI_API_KEY')
+# Async Gemini calls (AsyncMatchJobsView): calls in flight per event loop, process-wide
+# rate limit (calls per second and burst), seconds per attempt, retries with
+# backoff (base seconds), and the circuit breaker's failure threshold and
+# seconds before a trial call
+LLM_CONCURRENCY = int(os.getenv('LLM_CONCURRENCY', 8))
+LLM_RATE_PER_SECOND = float(os.getenv('LLM_RATE_PER_SECOND', 5))
+LLM_BURST = int(os.getenv('LLM_BURST', 10))
+LLM_CALL_TIMEOUT = float(os.getenv('LLM_CALL_TIMEOUT', 15))
+LLM_RETRIES = int(os.getenv('LLM_RETRIES', 1))
+LLM_BACKOFF = float(os.getenv('LLM_BACKOFF', 0.5))
+LLM_BREAKER_FAILURES = int(os.getenv('LLM_BREAKER_FAILURES', 5))
+LLM_BREAKER_RESET = float(os.getenv('LLM_BREAKER_RESET', 30))
+# Batched Gemini scoring of job titles: prompt token budget and title cap per
+# batch, batches in flight per process, and seconds to wait before falling back
+# (also the timeout of each scoring call)
+ROLE_SCORE_BATCH_TOKENS = int(os.getenv('ROLE_SCORE_BATCH_TOKENS', 2000))
+ROLE_SCORE_BATCH_MAX_TITLES = int(os.getenv('ROLE_SCORE_BATCH_MAX_TITLES', 50))
+ROLE_SCORE_CONCURRENCY = int(os.getenv('ROLE_SCORE_CONCURRENCY', 4))
+ROLE_SCORE_TIMEOUT = float(os.getenv('ROLE_SCORE_TIMEOUT', 20))
+# Cached title scores: lifetime in seconds, rows kept in the database, entries
+# held in each process's in-memory LRU, and scores a process stores between
+# evictions (0: only `manage.py role_score_cache --evict`, e.g. from cron)
+ROLE_SCORE_CACHE_TTL = int(os.getenv('ROLE_SCORE_CACHE_TTL', 7 * 24 * 3600))
+ROLE_SCORE_CACHE_MAX_ENTRIES = int(os.getenv('ROLE_SCORE_CACHE_MAX_ENTRIES', 200000))
+ROLE_SCORE_CACHE_LRU_SIZE = int(os.getenv('ROLE_SCORE_CACHE_LRU_SIZE', 20000))
+ROLE_SCORE_CACHE_EVICT_EVERY = int(os.getenv('ROLE_SCORE_CACHE_EVICT_EVERY', 5000))
+# Seconds the roles inferred for a skill set are reused, and how long other
+# workers wait for the one worker already asking Gemini about the same skills
+POTENTIAL_ROLES_CACHE_TTL = int(os.getenv('POTENTIAL_ROLES_CACHE_TTL', 24 * 3600))
+POTENTIAL_ROLES_LOCK_TIMEOUT = int(os.getenv('POTENTIAL_ROLES_LOCK_TIMEOUT', 30))
+# Where job matching reads jobs from: 'file' (JOBS_FILE) or 'database' (JobListing,
+# ranked with Postgres full-text and trigram indexes), and how many ranked
+# titles beyond the direct matches are sent to Gemini per request
+JOB_MATCH_SOURCE = os.getenv('JOB_MATCH_SOURCE', 'file')
+JOB_MATCH_CANDIDATE_LIMIT = int(os.getenv('JOB_MATCH_CANDIDATE_LIMIT', 500))
+# How jobs are scored against the inferred roles: 'gemini', or 'vector' for local
+# TF-IDF character n-gram similarity with no network calls, and the lowest
+# vector match percentage reported
+JOB_MATCHER = os.getenv('JOB_MATCHER', 'gemini')
+JOB_VECTOR_MIN_SCORE = float(os.getenv('JOB_VECTOR_MIN_SCORE', 20))
+# Match results per page (default and largest a request may ask for), and seconds
+# a ranked result set stays available to page through with a cursor
+MATCH_PAGE_SIZE = int(os.getenv('MATCH_PAGE_SIZE', 50))
+MATCH_PAGE_MAX_SIZE = int(os.getenv('MATCH_PAGE_MAX_SIZE', 200))
+MATCH_CURSOR_TTL = int(os.getenv('MATCH_CURSOR_TTL', 15 * 60))
+# Catalog versions whose job keys are kept, so users last matched against one of
+# them only have the jobs added since scored; older users are scored in full
+CATALOG_SNAPSHOTS_KEPT = int(os.getenv('CATALOG_SNAPSHOTS_KEPT', 10))
+# Job listings API page size (default and largest a request may ask for)
+LISTING_PAGE_SIZE = int(os.getenv('LISTING_PAGE_SIZE', 100))
+LISTING_PAGE_MAX_SIZE = int(os.getenv('LISTING_PAGE_MAX_SIZE', 500))
 
 # Tesseract OCR path
 TESSERACT_CMD = os.getenv('TESSERACT_CMD')
+# OCR process pool size (defaults to the CPU count) and per-document budget in seconds
+OCR_WORKERS = int(os.getenv('OCR_WORKERS', 0)) or None
+OCR_DOCUMENT_TIMEOUT = float(os.getenv('OCR_DOCUMENT_TIMEOUT', 60))
+# Render resolution for OCR and the cap on memory used by rendered pages per document
+OCR_DPI = int(os.getenv('OCR_DPI', 300))
+OCR_MAX_MEMORY_MB = int(os.getenv('OCR_MAX_MEMORY_MB', 256))
+# PDF pages with less text than this in their text layer are OCR'd
+PDF_MIN_PAGE_TEXT_CHARS = int(os.getenv('PDF_MIN_PAGE_TEXT_CHARS', 50))
+
+# Background resume parsing
+RESUME_PARSE_WORKERS = int(os.getenv('RESUME_PARSE_WORKERS', 2))
+# Uploads remembered by content hash so identical files skip extraction
+PARSE_CACHE_MAX_ENTRIES = int(os.getenv('PARSE_CACHE_MAX_ENTRIES', 10000))
+
+# Bulk resume ingestion: parse processes (defaults to the CPU count), rows per
+# bulk insert, and the most files one batch upload may carry
+INGEST_WORKERS = int(os.getenv('INGEST_WORKERS', 0)) or None
+INGEST_CHUNK_SIZE = int(os.getenv('INGEST_CHUNK_SIZE', 500))
+BATCH_MAX_FILES = int(os.getenv('BATCH_MAX_FILES', 200))
 
 LOGGING = {
     'version': 1,
@@ -204,9 +292,8 @@ LOGGING = {
     },
 }
 
+# Where nltk data is looked up and downloaded; resume_parser.utils registers it on first use
 NLTK_DATA_PATH = os.path.join(os.path.expanduser("~"), "nltk_data")
-os.makedirs(NLTK_DATA_PATH, exist_ok=True)
-nltk.data.path.append(NLTK_DATA_PATH)
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
@@ -2,6 +2,9 @@ from django.contrib import admin
 
 # Register your models here.
 from django.contrib import admin
-from .models import Resume
+from .models import Resume, ParseJob, ParseCacheEntry, Skill
 
 admin.site.register(Resume)
+admin.site.register(ParseJob)
+admin.site.register(ParseCacheEntry)
+admin.site.register(Skill)
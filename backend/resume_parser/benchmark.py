@@ -0,0 +1,262 @@
+import io
+import math
+import platform
+import random
+import time
+from collections import namedtuple
+
+import docx
+from PIL import Image, ImageDraw, ImageFont
+
+# Length classes of generated resumes, as (label, number of experience entries)
+CORPUS_LENGTHS = [('short', 2), ('medium', 6), ('long', 16)]
+LINES_PER_PAGE = 48
+# Render resolution of the generated scanned PDFs
+SCAN_DPI = 150
+
+FIRST_NAMES = ['Aarav', 'Priya', 'John', 'Maria', 'Wei', 'Fatima', 'Liam', 'Sofia', 'Rahul', 'Emma']
+LAST_NAMES = ['Sharma', 'Patel', 'Smith', 'Garcia', 'Chen', 'Khan', 'Brown', 'Rossi', 'Mehta', 'Jones']
+SKILL_POOL = [
+    'Python', 'Django', 'JavaScript', 'React', 'Node.js', 'SQL', 'PostgreSQL', 'Docker',
+    'Kubernetes', 'AWS', 'Azure', 'Java', 'Spring Boot', 'C++', 'Machine Learning',
+    'TensorFlow', 'Pandas', 'Git', 'Linux', 'REST APIs', 'HTML', 'CSS', 'TypeScript', 'Redis',
+]
+DEGREES = [
+    'Bachelor of Engineering in Computer Engineering', 'B.Tech in Information Technology',
+    'Master of Science in Computer Science', 'MBA', 'Bachelor of Science in Mathematics',
+]
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Stark Industries', 'Wayne Tech']
+ROLES = ['Software Engineer', 'Data Analyst', 'Backend Developer', 'DevOps Engineer', 'ML Engineer']
+
+CorpusDocument = namedtuple('CorpusDocument', ['name', 'kind', 'length', 'pages', 'data'])
+
+
+def resume_lines(rng: random.Random, experience_entries: int) -> list:
+    """Plain-text lines of a plausible resume with the given number of experience entries."""
+    first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    skills = rng.sample(SKILL_POOL, rng.randint(5, 12))
+    lines = [
+        f"{first_name} {last_name}",
+        f"{first_name.lower()}.{last_name.lower()}@example.com | +91 98{rng.randint(10000000, 99999999)}",
+        'SUMMARY',
+        f"{rng.choice(ROLES)} with {rng.randint(1, 15)} years of experience in {', '.join(skills[:3])}.",
+        'SKILLS',
+        ', '.join(skills),
+        'EXPERIENCE',
+    ]
+    for _ in range(experience_entries):
+        start = rng.randint(2005, 2020)
+        lines.append(f"{rng.choice(ROLES)} - {rng.choice(COMPANIES)} ({start} - {start + rng.randint(1, 4)})")
+        for _ in range(rng.randint(2, 4)):
+            lines.append(
+                f"- Built and maintained services using {rng.choice(skills)} and {rng.choice(skills)}, "
+                f"improving throughput by {rng.randint(5, 60)}%."
+            )
+    lines += ['EDUCATION', rng.choice(DEGREES), f"Graduated {rng.randint(2000, 2022)}"]
+    return lines
+
+
+def _pages(lines: list) -> list:
+    return [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+
+
+def _escape_pdf_text(line: str) -> str:
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def text_pdf(lines: list) -> bytes:
+    """A PDF with a real text layer, written directly so no PDF library is needed."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page_lines in _pages(lines):
+        ops = ["BT /F1 10 Tf 14 TL 50 760 Td"]
+        ops += [f"({_escape_pdf_text(line)}) Tj T*" for line in page_lines]
+        ops.append("ET")
+        stream = "\n".join(ops).encode('latin-1', errors='replace')
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        page_ids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % page_id for page_id in page_ids), len(page_ids)
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def scanned_pdf(lines: list, dpi: int = SCAN_DPI) -> bytes:
+    """A PDF of rendered page images with no text layer, like a scanned resume."""
+    width, height = int(8.5 * dpi), int(11 * dpi)
+    try:
+        font = ImageFont.load_default(size=dpi // 7)
+    except TypeError:
+        # Pillow built without FreeType only has the fixed-size bitmap font
+        font = ImageFont.load_default()
+    line_height = height // (LINES_PER_PAGE + 6)
+
+    images = []
+    for page_lines in _pages(lines):
+        img = Image.new('L', (width, height), 255)
+        draw = ImageDraw.Draw(img)
+        for index, line in enumerate(page_lines):
+            draw.text((dpi // 2, dpi // 2 + index * line_height), line, fill=0, font=font)
+        images.append(img)
+
+    buffer = io.BytesIO()
+    images[0].save(buffer, 'PDF', resolution=dpi, save_all=True, append_images=images[1:])
+    return buffer.getvalue()
+
+
+def docx_file(lines: list) -> bytes:
+    """A DOCX with one paragraph per line and the skills repeated in a table."""
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    table = document.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = 'Skills'
+    table.cell(0, 1).text = lines[5] if len(lines) > 5 else ''
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def generate_corpus(docs_per_length: int = 3, seed: int = 0, kinds=('text_pdf', 'scanned_pdf', 'docx')) -> list:
+    """Deterministically generate resumes of every kind and length class."""
+    rng = random.Random(seed)
+    builders = {'text_pdf': text_pdf, 'scanned_pdf': scanned_pdf, 'docx': docx_file}
+    corpus = []
+    for length, experience_entries in CORPUS_LENGTHS:
+        for index in range(docs_per_length):
+            lines = resume_lines(rng, experience_entries)
+            for kind in kinds:
+                extension = 'docx' if kind == 'docx' else 'pdf'
+                corpus.append(CorpusDocument(
+                    name=f"{length}-{index}-{kind}.{extension}", kind=kind, length=length,
+                    pages=len(_pages(lines)), data=builders[kind](lines),
+                ))
+    return corpus
+
+
+def percentile(sorted_samples: list, q: float) -> float:
+    """Linearly interpolated percentile (0-100) of already sorted samples."""
+    if not sorted_samples:
+        return 0.0
+    position = (len(sorted_samples) - 1) * q / 100
+    lower, upper = math.floor(position), math.ceil(position)
+    return sorted_samples[lower] + (sorted_samples[upper] - sorted_samples[lower]) * (position - lower)
+
+
+def summarize(samples: list, total_bytes: int = 0) -> dict:
+    """Latency percentiles in milliseconds and throughput for one stage's per-call timings."""
+    samples = sorted(samples)
+    total = sum(samples)
+    summary = {
+        'calls': len(samples),
+        'total_s': round(total, 6),
+        'mean_ms': round(total / len(samples) * 1e3, 4) if samples else 0.0,
+        'p50_ms': round(percentile(samples, 50) * 1e3, 4),
+        'p90_ms': round(percentile(samples, 90) * 1e3, 4),
+        'p99_ms': round(percentile(samples, 99) * 1e3, 4),
+        'max_ms': round(samples[-1] * 1e3, 4) if samples else 0.0,
+        'calls_per_s': round(len(samples) / total, 2) if total else None,
+    }
+    if total_bytes:
+        summary['mb_per_s'] = round(total_bytes / (1024 * 1024) / total, 3) if total else None
+    return summary
+
+
+def time_stage(func, inputs: list, repeat: int = 1, warmup: bool = True) -> dict:
+    """Time ``func`` once per input per repeat; inputs are (args, size_in_bytes) pairs."""
+    if warmup and inputs:
+        func(*inputs[0][0])
+    samples = []
+    total_bytes = 0
+    for _ in range(repeat):
+        for args, size in inputs:
+            started = time.perf_counter()
+            func(*args)
+            samples.append(time.perf_counter() - started)
+            total_bytes += size
+    return summarize(samples, total_bytes)
+
+
+def run_benchmark(corpus: list, repeat: int = 3, stages=None, log=None) -> dict:
+    """Time each parser stage over the corpus and return a JSON-serializable report.
+
+    Extraction stages read their own document kind; ``preprocess_text`` and the
+    field extractors run on the text extracted from every document.
+    """
+    from . import views
+    from .contact import extract_contact_info
+
+    by_kind = {}
+    for doc in corpus:
+        by_kind.setdefault(doc.kind, []).append(doc)
+
+    def file_inputs(kind):
+        # A fresh file object per call, built outside the timed region
+        return [((io.BytesIO(doc.data),), len(doc.data)) for doc in by_kind.get(kind, [])]
+
+    extraction_stages = [
+        ('extract_text_from_pdf', views.extract_text_from_pdf, 'text_pdf'),
+        ('extract_text_with_ocr', views.extract_text_with_ocr, 'scanned_pdf'),
+        ('extract_text_from_docx', views.extract_text_from_docx, 'docx'),
+    ]
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'documents': {kind: len(docs) for kind, docs in sorted(by_kind.items())},
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        },
+        'stages': {},
+    }
+
+    def selected(name):
+        return stages is None or name in stages
+
+    texts = []
+    for name, func, kind in extraction_stages:
+        if kind not in by_kind:
+            continue
+        # Extract once untimed: warms the stage up and gives the text-level stages their input
+        texts.extend(func(io.BytesIO(doc.data)) for doc in by_kind[kind])
+        if not selected(name):
+            continue
+        if log:
+            log(f"Timing {name} over {len(by_kind[kind])} documents")
+        # Each repeat needs unread file objects
+        inputs = [item for _ in range(repeat) for item in file_inputs(kind)]
+        report['stages'][name] = time_stage(func, inputs, repeat=1, warmup=False)
+
+    texts = [text for text in texts if text.strip()]
+    cleaned_texts = [views.preprocess_text(text) for text in texts]
+    text_stages = [
+        ('preprocess_text', views.preprocess_text, texts),
+        ('extract_contact_info', extract_contact_info, texts),
+        ('extract_skills', views.extract_skills, cleaned_texts),
+        ('extract_education', views.extract_education, cleaned_texts),
+        ('extract_name', views.extract_name, cleaned_texts),
+        ('extract_email', views.extract_email, cleaned_texts),
+        ('extract_phone', views.extract_phone, cleaned_texts),
+    ]
+    for name, func, stage_texts in text_stages:
+        if not selected(name) or not stage_texts:
+            continue
+        if log:
+            log(f"Timing {name} over {len(stage_texts)} texts")
+        inputs = [((text,), len(text.encode('utf-8'))) for text in stage_texts]
+        report['stages'][name] = time_stage(func, inputs, repeat=repeat)
+    return report
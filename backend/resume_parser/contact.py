@@ -0,0 +1,105 @@
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Contact details usually live in the resume header; it is scanned first
+HEADER_MAX_LINES = 15
+HEADER_MAX_CHARS = 2000
+
+EMAIL_RE = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-z]{2,}', re.IGNORECASE)
+# Country code, then groups of digits separated by spaces, dots, dashes or parentheses
+PHONE_RE = re.compile(r'(?:\+\d{1,3}[\s.-]?)?\(?\d[\d\s().-]{7,}\d')
+NAME_LABEL_RE = re.compile(r'^\s*(?:full\s+)?name\s*[:\-]\s*(.+)$', re.IGNORECASE)
+NAME_RE = re.compile(r"[A-Z][A-Za-z.'-]*(?:\s+[A-Z][A-Za-z.'-]*){1,3}")
+NAME_SUFFIX_RE = re.compile(r'\s+(?:resume|cv|curriculum vitae)$', re.IGNORECASE)
+# Separators commonly used between name, email and phone on one header line
+SEGMENT_SPLIT_RE = re.compile(r'\s*[|•·,;]\s*|\s{2,}|\t')
+
+NOT_A_NAME = {
+    'resume', 'curriculum vitae', 'cv', 'summary', 'objective', 'experience',
+    'education', 'skills', 'contact', 'profile', 'personal details',
+}
+MIN_PHONE_DIGITS = 10
+MAX_PHONE_DIGITS = 15
+
+
+def _header_lines(text: str):
+    lines = []
+    for line in text[:HEADER_MAX_CHARS].splitlines():
+        line = line.strip()
+        if line:
+            lines.append(line)
+            if len(lines) == HEADER_MAX_LINES:
+                break
+    return lines
+
+
+def _match_phone(line: str):
+    for match in PHONE_RE.finditer(line):
+        cleaned_phone = re.sub(r'[^\d+]', '', match.group(0))
+        digits = len(cleaned_phone.lstrip('+'))
+        if MIN_PHONE_DIGITS <= digits <= MAX_PHONE_DIGITS:
+            return cleaned_phone
+    return None
+
+
+def _match_name(line: str):
+    label = NAME_LABEL_RE.match(line)
+    candidates = [label.group(1)] if label else SEGMENT_SPLIT_RE.split(line)
+    for segment in candidates:
+        segment = NAME_SUFFIX_RE.sub('', segment.strip())
+        if not segment or segment.lower() in NOT_A_NAME:
+            continue
+        match = NAME_RE.fullmatch(segment)
+        if match:
+            return match.group(0)
+    return None
+
+
+def _scan(lines, contact: dict, missing: set):
+    """Fill the ``missing`` fields of ``contact`` from ``lines``, stopping once none are missing."""
+    for line in lines:
+        if 'email' in missing:
+            match = EMAIL_RE.search(line)
+            if match:
+                contact['email'] = match.group(0).lower()
+                missing.discard('email')
+        if 'phone' in missing:
+            # Digits inside an email address are not a phone number
+            phone = _match_phone(EMAIL_RE.sub(' ', line) if '@' in line else line)
+            if phone:
+                contact['phone'] = phone
+                missing.discard('phone')
+        if 'name' in missing:
+            name = _match_name(line)
+            if name:
+                contact['name'] = name
+                missing.discard('name')
+        if not missing:
+            break
+
+
+def extract_contact_info(text: str) -> dict:
+    """Extract name, email and phone from the header of raw (unpreprocessed) resume text.
+
+    Patterns are compiled once at import and each header line is visited once,
+    stopping as soon as all three fields have been found. When the header has
+    no email, the rest of the text (a footer, say) is searched for the email
+    and a missing phone.
+    """
+    contact = {'name': "N/A", 'email': "N/A", 'phone': "N/A"}
+    if not text:
+        return contact
+
+    missing = set(contact)
+    try:
+        _scan(_header_lines(text), contact, missing)
+        if 'email' in missing:
+            # Not the name: past the header a capitalized line is more likely a heading or an employer
+            _scan((line.strip() for line in text.splitlines() if line.strip()), contact, missing - {'name'})
+    except Exception as e:
+        logger.error(f"Error extracting contact info: {e}")
+
+    logger.debug(f"Contact info: {contact}")
+    return contact
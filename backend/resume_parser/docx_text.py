@@ -0,0 +1,107 @@
+import logging
+import re
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+logger = logging.getLogger(__name__)
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+DOCUMENT_PART = 'word/document.xml'
+HEADER_PART_RE = re.compile(r'word/header\d*\.xml$')
+FOOTER_PART_RE = re.compile(r'word/footer\d*\.xml$')
+
+# Run content that stands for a character of its own
+SPECIAL_CHARACTERS = {
+    W + 'tab': '\t',
+    W + 'br': '\n',
+    W + 'cr': '\n',
+    W + 'noBreakHyphen': '-',
+}
+
+
+def _part_order(name: str) -> int:
+    match = re.search(r'(\d+)\.xml$', name)
+    return int(match.group(1)) if match else 0
+
+
+def iter_part_paragraphs(xml_file):
+    """Yield the text of each non-empty paragraph of a WordprocessingML part, in document order.
+
+    Table cells are visited once each, so a cell spanning several grid columns
+    is not repeated, and the continuation cells of a vertical merge are skipped.
+    Elements are cleared as soon as they are consumed, keeping memory flat for
+    large documents.
+    """
+    paragraphs = []       # text buffers of the open paragraphs (text boxes nest them)
+    merged_cells = []     # per open table cell: is it a vertical-merge continuation
+    fallback_depth = 0    # inside mc:Fallback, which repeats the mc:Choice content
+
+    for event, elem in iterparse(xml_file, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            if tag == MC_FALLBACK:
+                fallback_depth += 1
+            elif fallback_depth:
+                continue
+            elif tag == W + 'p':
+                paragraphs.append([])
+            elif tag == W + 'tc':
+                merged_cells.append(False)
+            continue
+
+        if tag == MC_FALLBACK:
+            fallback_depth -= 1
+            elem.clear()
+        elif fallback_depth:
+            continue
+        elif tag == W + 't':
+            if paragraphs and elem.text:
+                paragraphs[-1].append(elem.text)
+        elif tag in SPECIAL_CHARACTERS:
+            if paragraphs:
+                paragraphs[-1].append(SPECIAL_CHARACTERS[tag])
+        elif tag == W + 'vMerge':
+            # <w:vMerge w:val="restart"/> starts a merge; a bare <w:vMerge/> continues it
+            if merged_cells and elem.get(W + 'val', 'continue') != 'restart':
+                merged_cells[-1] = True
+        elif tag == W + 'p':
+            text = ''.join(paragraphs.pop())
+            elem.clear()
+            if text.strip() and not (merged_cells and merged_cells[-1]):
+                yield text
+        elif tag == W + 'tc':
+            merged_cells.pop()
+            elem.clear()
+        elif tag == W + 'tbl':
+            elem.clear()
+
+
+def extract_docx_text(docx_file) -> str:
+    """Extract text from a DOCX by streaming its XML parts: headers, body, then footers.
+
+    Header and footer parts with identical text (first-page, even and default
+    variants are often the same) are emitted once.
+    """
+    with zipfile.ZipFile(docx_file) as archive:
+        names = archive.namelist()
+        headers = sorted((name for name in names if HEADER_PART_RE.match(name)), key=_part_order)
+        footers = sorted((name for name in names if FOOTER_PART_RE.match(name)), key=_part_order)
+
+        lines = []
+        seen_parts = set()
+        for name in headers + [DOCUMENT_PART] + footers:
+            if name not in names:
+                continue
+            with archive.open(name) as xml_file:
+                part_lines = list(iter_part_paragraphs(xml_file))
+            if name != DOCUMENT_PART:
+                key = tuple(part_lines)
+                if key in seen_parts:
+                    continue
+                seen_parts.add(key)
+            lines.extend(part_lines)
+
+    logger.debug(f"Extracted {len(lines)} paragraphs from DOCX")
+    return "\n".join(lines)
@@ -0,0 +1,250 @@
+import io
+import logging
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+from . import parse_cache
+from .ocr import init_worker
+from .models import ParseCacheEntry, Resume
+from .skills import sync_skills_bulk
+from .vocabulary import get_vocabulary
+
+logger = logging.getLogger(__name__)
+
+# Parse processes for bulk ingestion
+INGEST_WORKERS = getattr(settings, 'INGEST_WORKERS', None) or os.cpu_count() or 1
+# Rows per bulk_create statement
+INGEST_CHUNK_SIZE = getattr(settings, 'INGEST_CHUNK_SIZE', 500)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _file_type(name: str) -> str:
+    return name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+
+
+def _is_resume_file(name: str) -> bool:
+    # Imported here because the views import this module for the batch endpoint
+    from .views import ALLOWED_EXTENSIONS
+    return not os.path.basename(name).startswith('.') and _file_type(name) in ALLOWED_EXTENSIONS
+
+
+class TooManyFiles(Exception):
+    """A zip archive holds more resume files than one batch may carry."""
+
+
+def zip_resume_entries(archive: zipfile.ZipFile, max_files: int = None) -> list:
+    """The PDF/DOCX entries of an open archive, from its directory alone, so nothing is decompressed yet.
+
+    Raises TooManyFiles when there are more than ``max_files``. An entry's
+    ``file_size`` bounds what reading it can return: zipfile never inflates an
+    entry past its declared size.
+    """
+    entries = [info for info in archive.infolist() if not info.is_dir() and _is_resume_file(info.filename)]
+    if max_files is not None and len(entries) > max_files:
+        raise TooManyFiles(f"Archive holds {len(entries)} resume files; at most {max_files} allowed")
+    return entries
+
+
+def iter_zip_files(zip_file):
+    """Yield (name, bytes) for every PDF/DOCX in a zip archive (path or file object)."""
+    with zipfile.ZipFile(zip_file) as archive:
+        for info in zip_resume_entries(archive):
+            yield info.filename, archive.read(info)
+
+
+def iter_resume_files(path: str):
+    """Yield (name, bytes) for every PDF/DOCX in a zip archive or directory tree."""
+    if zipfile.is_zipfile(path):
+        yield from iter_zip_files(path)
+        return
+
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for file_name in sorted(files):
+            if not _is_resume_file(file_name):
+                continue
+            file_path = os.path.join(root, file_name)
+            with open(file_path, 'rb') as f:
+                yield os.path.relpath(file_path, path), f.read()
+
+
+def parse_resume_bytes(name: str, file_bytes: bytes) -> dict:
+    """Extract and parse one file; runs in a worker process and never raises."""
+    from .views import MAX_FILE_SIZE, extract_resume_text, parse_resume_text
+
+    result = {'file': name}
+    if len(file_bytes) > MAX_FILE_SIZE:
+        result['error'] = f"File too large. Maximum size allowed is {MAX_FILE_SIZE / (1024 * 1024)} MB."
+        return result
+    try:
+        file_type = _file_type(name)
+        file_text = extract_resume_text(io.BytesIO(file_bytes), file_type)
+        if not file_text.strip():
+            result['error'] = 'Unable to extract text from the file.'
+            return result
+        result.update(file_type=file_type, text=file_text, parsed_data=parse_resume_text(file_text))
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+def create_pool(workers: int) -> ProcessPoolExecutor:
+    # Spawn rather than fork: forking a threaded web worker can deadlock
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context('spawn'), initializer=init_worker
+    )
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Return the process-wide ingestion pool used by the batch endpoint, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = create_pool(INGEST_WORKERS)
+    return _pool
+
+
+def _retire_pool(pool: ProcessPoolExecutor):
+    """Stop using a pool whose worker process died; the next get_pool() starts a fresh one.
+
+    Only ``pool`` is retired, so a caller holding an older pool cannot discard
+    one another caller just made.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _save_chunk(parsed, vocabulary_version: str):
+    """Write one chunk of parsed files with a single INSERT per table, then enforce the parse cache bound."""
+    resumes = Resume.objects.bulk_create([Resume(**item['parsed_data']) for item in parsed])
+    sync_skills_bulk(resumes)
+    ParseCacheEntry.objects.bulk_create([
+        ParseCacheEntry(
+            content_hash=item['content_hash'],
+            file_type=item['file_type'],
+            text=item['text'],
+            parsed_data=item['parsed_data'],
+            resume=resume,
+            vocabulary_version=vocabulary_version,
+        )
+        for item, resume in zip(parsed, resumes)
+    ], ignore_conflicts=True)
+    parse_cache.evict()
+    for item, resume in zip(parsed, resumes):
+        item['resume_id'] = resume.pk
+
+
+def ingest_files(files, pool: ProcessPoolExecutor = None, chunk_size: int = None, progress=None) -> list:
+    """Parse (name, bytes) pairs on a process pool and bulk-insert the resulting resumes.
+
+    Without a pool, files are parsed in the calling process. Files already in
+    the parse cache for the current vocabulary are not parsed again. Returns one
+    result dict per file with either ``resume_id`` or ``error``; ``progress`` is
+    called as ``progress(done, results)`` after every file.
+
+    If a worker process dies (e.g. killed for memory), the files it was
+    parsing get an error and the rest go to a fresh pool.
+    """
+    chunk_size = chunk_size or INGEST_CHUNK_SIZE
+    vocabulary_version = get_vocabulary().version
+    workers = pool._max_workers if pool else 1
+    max_in_flight = 2 * workers
+    replacement = None
+
+    results = []
+    pending_save = []
+    seen_hashes = {}
+    in_flight = {}
+
+    def record(result):
+        results.append(result)
+        if 'parsed_data' in result:
+            try:
+                Resume(**result['parsed_data']).clean_fields()
+            except ValidationError as ve:
+                result['error'] = str(ve)
+            else:
+                pending_save.append(result)
+                if len(pending_save) >= chunk_size:
+                    _save_chunk(pending_save, vocabulary_version)
+                    pending_save.clear()
+        if progress:
+            progress(len(results), results)
+
+    def replace_pool(broken):
+        nonlocal pool, replacement
+        if pool is not broken:
+            return
+        logger.error("An ingestion worker process died; parsing the remaining files on a fresh pool")
+        _retire_pool(broken)
+        pool = replacement = create_pool(workers)
+
+    def collect():
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            name, content_hash, submitted_to = in_flight.pop(future)
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                # Every file in flight on the pool fails with it, not only the one that killed the worker
+                replace_pool(submitted_to)
+                result = {'file': name, 'error': 'The parser process stopped while parsing this file.'}
+            result['content_hash'] = content_hash
+            record(result)
+
+    try:
+        for name, file_bytes in files:
+            content_hash = parse_cache.hash_bytes(file_bytes)
+            if content_hash in seen_hashes:
+                record({'file': name, 'content_hash': content_hash, 'duplicate_of': seen_hashes[content_hash]})
+                continue
+            seen_hashes[content_hash] = name
+
+            entry, current = parse_cache.get_cached_parse(content_hash, vocabulary_version)
+            if current:
+                record({'file': name, 'content_hash': content_hash, 'resume_id': entry.resume_id, 'cached': True})
+                continue
+
+            if pool is None:
+                result = parse_resume_bytes(name, file_bytes)
+                result['content_hash'] = content_hash
+                record(result)
+                continue
+
+            try:
+                future = pool.submit(parse_resume_bytes, name, file_bytes)
+            except BrokenProcessPool:
+                replace_pool(pool)
+                future = pool.submit(parse_resume_bytes, name, file_bytes)
+            in_flight[future] = (name, content_hash, pool)
+            # Bound the number of files held in memory at once
+            if len(in_flight) >= max_in_flight:
+                collect()
+
+        while in_flight:
+            collect()
+    finally:
+        # Parsed files are saved even if the batch stops part way
+        if pending_save:
+            _save_chunk(pending_save, vocabulary_version)
+        if replacement is not None:
+            replacement.shutdown(wait=False, cancel_futures=True)
+
+    for result in results:
+        # Parse output is only carried along for the bulk insert and the parse cache
+        for key in ('text', 'file_type', 'parsed_data'):
+            result.pop(key, None)
+    return results
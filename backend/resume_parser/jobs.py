@@ -0,0 +1,86 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import ParseJob
+
+logger = logging.getLogger(__name__)
+
+# Size of the in-process pool that parses queued uploads
+PARSE_WORKERS = getattr(settings, 'RESUME_PARSE_WORKERS', 2)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide parse worker pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix='resume-parse')
+    return _executor
+
+
+def enqueue_parse_job(file_name: str, file_bytes: bytes) -> ParseJob:
+    """Store the upload as a pending job and schedule it on the worker pool."""
+    job = ParseJob.objects.create(file_name=file_name, file_data=file_bytes)
+    # Only hand the job to a worker once the row is visible to other connections
+    transaction.on_commit(lambda: get_executor().submit(run_parse_job, job.pk))
+    logger.info(f"Queued {job}")
+    return job
+
+
+def claim_job(job_id) -> bool:
+    """Atomically move a job from pending to running; False if another worker got it first."""
+    # update() skips auto_now; the claim time is what --requeue-stale measures from
+    return ParseJob.objects.filter(pk=job_id, status=ParseJob.STATUS_PENDING).update(
+        status=ParseJob.STATUS_RUNNING, updated_at=timezone.now()
+    ) == 1
+
+
+def run_parse_job(job_id):
+    """Parse a queued upload and record the result on its job row."""
+    # Imported here because the views enqueue jobs through this module
+    from .views import parse_resume_upload
+
+    close_old_connections()
+    try:
+        if not claim_job(job_id):
+            return
+        job = ParseJob.objects.get(pk=job_id)
+        try:
+            parsed_data, resume_instance = parse_resume_upload(ContentFile(bytes(job.file_data), name=job.file_name))
+            if parsed_data is None:
+                raise ValueError('Unable to extract text from the file. Please try a different file.')
+
+            job.resume = resume_instance
+            job.result = parsed_data
+            job.status = ParseJob.STATUS_DONE
+        except Exception as e:
+            logger.error(f"Parse job {job_id} failed: {e}", exc_info=True)
+            job.error = str(e)
+            job.status = ParseJob.STATUS_FAILED
+        job.file_data = b''
+        job.save(update_fields=['resume', 'result', 'error', 'status', 'file_data', 'updated_at'])
+        logger.info(f"Finished {job}")
+    except Exception as e:
+        logger.error(f"Unexpected error running parse job {job_id}: {e}", exc_info=True)
+    finally:
+        close_old_connections()
+
+
+def run_pending_jobs() -> int:
+    """Run every pending job in the calling thread; returns how many were picked up."""
+    job_ids = list(
+        ParseJob.objects.filter(status=ParseJob.STATUS_PENDING).order_by('created_at').values_list('pk', flat=True)
+    )
+    for job_id in job_ids:
+        run_parse_job(job_id)
+    return len(job_ids)
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from resume_parser.models import Resume
+from resume_parser.skills import sync_skills_bulk
+
+
+class Command(BaseCommand):
+    help = 'Populate the normalized skill table from the comma-joined Resume.skills of existing rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Resumes converted per transaction',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        converted = links = 0
+        last_pk = 0
+        while True:
+            # Walk the table by primary key so each batch is an index range scan
+            batch = list(
+                Resume.objects.filter(pk__gt=last_pk).order_by('pk').only('pk', 'skills')[:batch_size]
+            )
+            if not batch:
+                break
+            with transaction.atomic():
+                links += sync_skills_bulk(batch)
+            converted += len(batch)
+            last_pk = batch[-1].pk
+            self.stdout.write(f"Converted {converted} resumes")
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {links} skill links for {converted} resumes."))
@@ -0,0 +1,60 @@
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from resume_parser.contact import extract_contact_info
+from resume_parser.views import extract_email, extract_name, extract_phone, preprocess_text
+
+SAMPLE_RESUME = """John Doe
+Senior Software Engineer | john.doe@example.com | +1 (555) 123-4567
+San Francisco, CA | linkedin.com/in/johndoe
+
+SUMMARY
+Backend engineer with 8 years of experience building Python and Django services.
+
+EXPERIENCE
+Acme Corp - Senior Software Engineer (2019 - 2024)
+Built data pipelines with Python, PostgreSQL, Docker and Kubernetes.
+
+EDUCATION
+Bachelor of Engineering in Computer Engineering
+"""
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the single-pass contact extractor against the per-pattern extractors'
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='*', help='Plain-text resumes to benchmark (defaults to a built-in sample)')
+        parser.add_argument('--number', type=int, default=1000, help='Calls per timing run')
+        parser.add_argument('--repeat', type=int, default=5, help='Timing runs; the fastest is reported')
+
+    def handle(self, *args, **options):
+        texts = []
+        for path in options['files']:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                texts.append((path, f.read()))
+        if not texts:
+            texts.append(('sample', SAMPLE_RESUME))
+
+        number, repeat = options['number'], options['repeat']
+        for label, text in texts:
+            cleaned_text = preprocess_text(text)
+
+            def legacy():
+                return {
+                    'name': extract_name(cleaned_text),
+                    'email': extract_email(cleaned_text),
+                    'phone': extract_phone(cleaned_text),
+                }
+
+            def single_pass():
+                return extract_contact_info(text)
+
+            legacy_us = min(timeit.repeat(legacy, number=number, repeat=repeat)) / number * 1e6
+            single_pass_us = min(timeit.repeat(single_pass, number=number, repeat=repeat)) / number * 1e6
+
+            self.stdout.write(f"{label}:")
+            self.stdout.write(f"  per-pattern: {legacy_us:10.1f} us/call  {legacy()}")
+            self.stdout.write(f"  single-pass: {single_pass_us:10.1f} us/call  {single_pass()}")
+            self.stdout.write(self.style.SUCCESS(f"  speedup: {legacy_us / single_pass_us:.1f}x"))
@@ -0,0 +1,55 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from resume_parser.benchmark import generate_corpus, run_benchmark
+
+
+class Command(BaseCommand):
+    help = 'Time each resume parsing stage over a generated corpus and report latency percentiles as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+        parser.add_argument('--repeat', type=int, default=3, help='Passes over the corpus per stage')
+        parser.add_argument('--docs-per-length', type=int, default=3, help='Resumes generated per length class')
+        parser.add_argument('--seed', type=int, default=0, help='Seed for the generated corpus')
+        parser.add_argument(
+            '--stage', action='append', dest='stages',
+            help='Only time this stage (repeatable), e.g. --stage extract_text_from_pdf',
+        )
+        parser.add_argument('--skip-ocr', action='store_true', help='Leave scanned PDFs out of the corpus')
+        parser.add_argument('--save-corpus', metavar='DIR', help='Also write the generated files to this directory')
+        parser.add_argument('--baseline', help='Earlier JSON report to compare p50 latencies against')
+
+    def handle(self, *args, **options):
+        kinds = ('text_pdf', 'docx') if options['skip_ocr'] else ('text_pdf', 'scanned_pdf', 'docx')
+        corpus = generate_corpus(options['docs_per_length'], seed=options['seed'], kinds=kinds)
+        self.stderr.write(f"Generated {len(corpus)} documents")
+
+        if options['save_corpus']:
+            os.makedirs(options['save_corpus'], exist_ok=True)
+            for doc in corpus:
+                with open(os.path.join(options['save_corpus'], doc.name), 'wb') as f:
+                    f.write(doc.data)
+
+        report = run_benchmark(corpus, repeat=options['repeat'], stages=options['stages'], log=self.stderr.write)
+        report['meta']['seed'] = options['seed']
+
+        if options['baseline']:
+            try:
+                with open(options['baseline'], 'r', encoding='utf-8') as f:
+                    baseline = json.load(f)['stages']
+            except (OSError, ValueError, KeyError) as e:
+                raise CommandError(f"Could not read baseline report: {e}")
+            for name, stats in report['stages'].items():
+                if name in baseline and stats['p50_ms']:
+                    stats['p50_speedup_vs_baseline'] = round(baseline[name]['p50_ms'] / stats['p50_ms'], 3)
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output + '\n')
+            self.stderr.write(self.style.SUCCESS(f"Wrote benchmark report to {options['output']}"))
+        else:
+            self.stdout.write(output)
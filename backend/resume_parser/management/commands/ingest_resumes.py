@@ -0,0 +1,67 @@
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from resume_parser import ingest
+
+
+class Command(BaseCommand):
+    help = 'Parse every PDF/DOCX in a zip archive or directory in parallel and bulk-insert the resumes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Zip archive or directory of resumes')
+        parser.add_argument(
+            '--workers', type=int, default=ingest.INGEST_WORKERS,
+            help='Parse processes to run (default: INGEST_WORKERS)',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=ingest.INGEST_CHUNK_SIZE,
+            help='Resumes written per bulk insert (default: INGEST_CHUNK_SIZE)',
+        )
+        parser.add_argument(
+            '--progress-every', type=int, default=100,
+            help='Print a progress line after this many files',
+        )
+        parser.add_argument('--report', help='Write per-file results to this JSON file')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f"{path} does not exist")
+
+        started = time.monotonic()
+        progress_every = max(1, options['progress_every'])
+
+        def progress(done, results):
+            if done % progress_every == 0:
+                failed = sum(1 for result in results if 'error' in result)
+                rate = done / max(time.monotonic() - started, 1e-9)
+                self.stdout.write(f"{done} files processed, {failed} failed ({rate:.1f} files/s)")
+
+        pool = ingest.create_pool(options['workers']) if options['workers'] > 1 else None
+        try:
+            results = ingest.ingest_files(
+                ingest.iter_resume_files(path), pool=pool,
+                chunk_size=options['chunk_size'], progress=progress,
+            )
+        finally:
+            if pool:
+                pool.shutdown()
+
+        failed = [result for result in results if 'error' in result]
+        for result in failed:
+            self.stderr.write(f"{result['file']}: {result['error']}")
+        if options['report']:
+            with open(options['report'], 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f"Wrote per-file report to {options['report']}")
+
+        cached = sum(1 for result in results if result.get('cached'))
+        duplicates = sum(1 for result in results if 'duplicate_of' in result)
+        created = len(results) - len(failed) - cached - duplicates
+        self.stdout.write(self.style.SUCCESS(
+            f"Ingested {len(results)} files in {time.monotonic() - started:.1f}s: "
+            f"{created} created, {cached} already parsed, {duplicates} duplicates, {len(failed)} failed."
+        ))
@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from resume_parser.jobs import run_pending_jobs
+from resume_parser.models import ParseJob
+
+
+class Command(BaseCommand):
+    help = 'Parse queued resume uploads, e.g. jobs left pending when a web worker restarted'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requeue-stale', type=int, metavar='MINUTES',
+            help='Requeue jobs stuck in "running" for longer than this many minutes',
+        )
+
+    def handle(self, *args, **options):
+        if options['requeue_stale']:
+            cutoff = timezone.now() - timedelta(minutes=options['requeue_stale'])
+            requeued = ParseJob.objects.filter(
+                status=ParseJob.STATUS_RUNNING, updated_at__lt=cutoff
+            ).update(status=ParseJob.STATUS_PENDING, updated_at=timezone.now())
+            self.stdout.write(f"Requeued {requeued} stale parse jobs.")
+
+        processed = run_pending_jobs()
+        self.stdout.write(self.style.SUCCESS(f"Finished processing {processed} parse jobs."))
@@ -0,0 +1,102 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _is_word_char(char: str) -> bool:
+    """Mirror the definition of ``\\w`` used by the ``re`` module for str patterns."""
+    return char.isalnum() or char == '_'
+
+
+class PhraseMatcher:
+    """Match a fixed vocabulary of phrases against text in a single pass.
+
+    The vocabulary is compiled once into an Aho-Corasick automaton over the
+    lowercased phrases. Every occurrence is then checked for word boundaries
+    with the same semantics as ``re.search(r'\\b' + re.escape(phrase) + r'\\b', text)``,
+    so results are identical to testing each phrase with its own regex.
+    """
+
+    def __init__(self, phrases):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        # Lowercased phrase -> every original spelling that lowercases to it
+        self._originals = {}
+        self._keys = []
+
+        for phrase in phrases:
+            key = phrase.lower()
+            if not key:
+                continue
+            if key not in self._originals:
+                self._originals[key] = []
+                self._add(key, len(self._keys))
+                self._keys.append(key)
+            self._originals[key].append(phrase)
+
+        self._build_failure_links()
+        logger.debug(f"Compiled phrase matcher with {len(self._keys)} phrases and {len(self._goto)} states")
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _add(self, key: str, key_id: int):
+        state = 0
+        for char in key:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].append(key_id)
+
+    def _build_failure_links(self):
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state].extend(self._output[self._fail[next_state]])
+
+    def find(self, text: str) -> set:
+        """Return the set of original phrases occurring in ``text`` as whole words."""
+        text_lower = text.lower()
+        goto, fail, output, keys = self._goto, self._fail, self._output, self._keys
+        length = len(text_lower)
+        found_ids = set()
+        state = 0
+
+        for end, char in enumerate(text_lower):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not output[state]:
+                continue
+
+            next_is_word = end + 1 < length and _is_word_char(text_lower[end + 1])
+            for key_id in output[state]:
+                if key_id in found_ids:
+                    continue
+                key = keys[key_id]
+                # \b after the phrase: last phrase char and following char differ in "wordness"
+                if _is_word_char(key[-1]) == next_is_word:
+                    continue
+                # \b before the phrase: preceding char and first phrase char differ in "wordness"
+                start = end - len(key) + 1
+                prev_is_word = start > 0 and _is_word_char(text_lower[start - 1])
+                if _is_word_char(key[0]) == prev_is_word:
+                    continue
+                found_ids.add(key_id)
+
+        matched = set()
+        for key_id in found_ids:
+            matched.update(self._originals[keys[key_id]])
+        return matched
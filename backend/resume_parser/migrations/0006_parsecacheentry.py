@@ -0,0 +1,29 @@
+# Generated by Django 5.2 on 2026-10-17 22:29
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_parser', '0005_parsejob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParseCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, unique=True)),
+                ('file_type', models.CharField(max_length=10)),
+                ('text', models.TextField()),
+                ('parsed_data', models.JSONField()),
+                ('vocabulary_version', models.CharField(max_length=32)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('resume', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='resume_parser.resume')),
+            ],
+        ),
+    ]
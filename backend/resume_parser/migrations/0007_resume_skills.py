@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-17 22:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_parser', '0006_parsecacheentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='skill_set',
+            field=models.ManyToManyField(blank=True, related_name='resumes', to='resume_parser.skill'),
+        ),
+    ]
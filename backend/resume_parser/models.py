@@ -10,15 +10,86 @@
 #     parsed_text = models.TextField()
 
 # jobalign/resume_parser/models.py
+import uuid
+
 from django.db import models
+from django.db.models import Count
+from django.utils import timezone
+
+class Skill(models.Model):
+    """A skill named in a resume or required by a job listing, stored lowercased so lookups are exact."""
+    name = models.CharField(max_length=255, unique=True)
+
+    def __str__(self):
+        return self.name
+
+class ResumeQuerySet(models.QuerySet):
+    def with_all_skills(self, *names):
+        """Resumes that have every one of the given skills."""
+        names = {name.strip().lower() for name in names}
+        return self.filter(skill_set__name__in=names).annotate(
+            matched_skill_count=Count('skill_set', distinct=True)
+        ).filter(matched_skill_count=len(names))
+
+    def with_any_skills(self, *names):
+        """Resumes that have at least one of the given skills."""
+        names = {name.strip().lower() for name in names}
+        return self.filter(skill_set__name__in=names).distinct()
 
 class Resume(models.Model):
     name = models.CharField(max_length=100, default="N/A")
     email = models.CharField(max_length=100, default="N/A")
     phone = models.CharField(max_length=20, default="N/A")
+    # Display copy of the matched skills; filter on skill_set instead
     skills = models.TextField(default="N/A")
     education = models.TextField(default="N/A")
+    skill_set = models.ManyToManyField(Skill, related_name='resumes', blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = ResumeQuerySet.as_manager()
+
+    def __str__(self):
+        return f"Resume (created at {self.created_at})"
+
+class ParseJob(models.Model):
+    """A resume upload waiting to be parsed by the background workers."""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    file_name = models.CharField(max_length=255)
+    # Raw upload, cleared once the job has finished
+    file_data = models.BinaryField(blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    resume = models.ForeignKey(Resume, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Parse job {self.id} ({self.status})"
+
+
+class ParseCacheEntry(models.Model):
+    """Extracted text and parsed fields for an uploaded file, keyed by its content hash."""
+    content_hash = models.CharField(max_length=64, unique=True)
+    file_type = models.CharField(max_length=10)
+    text = models.TextField()
+    parsed_data = models.JSONField()
+    # Vocabulary the parsed fields were matched against
+    vocabulary_version = models.CharField(max_length=32)
+    resume = models.ForeignKey(Resume, on_delete=models.SET_NULL, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now, db_index=True)
 
     def __str__(self):
-        return f"Resume (created at {self.created_at})"
\ No newline at end of file
+        return f"Parse cache {self.content_hash[:12]} ({self.vocabulary_version})"
@@ -0,0 +1,224 @@
+import logging
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# pytesseract, pdf2image and PIL are imported where they are used, so importing
+# this module (and the views that use it) stays cheap until a scan is OCR'd
+
+# Path to Tesseract executable (make configurable)
+TESSERACT_CMD = getattr(settings, 'TESSERACT_CMD', r'C:\Program Files\Tesseract-OCR\tesseract.exe')
+# Number of processes running Tesseract; 1 disables the pool
+OCR_WORKERS = getattr(settings, 'OCR_WORKERS', None) or os.cpu_count() or 1
+# Wall-clock seconds allowed for OCR of one document
+OCR_DOCUMENT_TIMEOUT = getattr(settings, 'OCR_DOCUMENT_TIMEOUT', 60)
+# Render resolution; Tesseract is most accurate around 300 DPI
+OCR_DPI = getattr(settings, 'OCR_DPI', 300)
+# Peak memory allowed for rendered pages of one document
+OCR_MAX_MEMORY_MB = getattr(settings, 'OCR_MAX_MEMORY_MB', 256)
+# Grayscale byte per pixel, plus the binarized copy and Tesseract's own buffers
+OCR_BYTES_PER_PIXEL = 4
+
+OCR_CONFIGS = [
+    '--psm 6',  # Assume a single uniform block of text
+    '--psm 3',  # Fully automatic page segmentation
+    '--psm 4',  # Assume a single column of text
+]
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def ocr_page(img, tesseract_cmd: str = TESSERACT_CMD) -> str:
+    """Run Tesseract on one page image, trying each page segmentation mode until one yields text."""
+    import pytesseract
+
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    # Convert to grayscale for better OCR
+    img = img.convert('L')
+    # Enhance contrast
+    img = img.point(lambda x: 0 if x < 128 else 255, '1')
+
+    for config in OCR_CONFIGS:
+        try:
+            ocr_text = pytesseract.image_to_string(img, config=config)
+            if ocr_text.strip():
+                return ocr_text
+        except Exception as e:
+            logger.error(f"OCR failed with config {config}: {e}")
+    return ""
+
+
+def ocr_page_file(path: str, tesseract_cmd: str = TESSERACT_CMD) -> str:
+    """Run Tesseract on a page rendered to disk, so only the path crosses the process boundary."""
+    from PIL import Image
+
+    with Image.open(path) as img:
+        return ocr_page(img, tesseract_cmd)
+
+
+def init_worker():
+    """Initializer for spawned parse processes: set up Django and OCR pages in-process.
+
+    Lives here rather than next to the models because a spawned process imports
+    its initializer before the app registry is ready.
+    """
+    global OCR_WORKERS
+    django.setup()
+    OCR_WORKERS = 1
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Return the process-wide OCR pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # Spawn rather than fork: forking a threaded web worker can deadlock
+                _pool = ProcessPoolExecutor(
+                    max_workers=OCR_WORKERS, mp_context=multiprocessing.get_context('spawn')
+                )
+    return _pool
+
+
+def _retire_pool(pool, terminate: bool = False):
+    """Stop using ``pool``, cancelling its queued tasks; with ``terminate``, also kill its busy workers.
+
+    The next get_pool() starts a fresh pool. Only ``pool`` is retired, so a
+    caller holding an older pool cannot discard one another caller just made.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    # Read before shutdown(), which forgets the worker processes
+    processes = list((getattr(pool, '_processes', None) or {}).values()) if terminate else []
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+
+def _run_inline(func, items, deadline: float) -> list:
+    page_texts = []
+    for index, item in enumerate(items):
+        if time.monotonic() > deadline:
+            logger.warning(f"OCR budget exhausted; skipping {len(items) - index} pages")
+            break
+        page_texts.append(func(item, TESSERACT_CMD))
+    return page_texts
+
+
+def _run(func, items, deadline: float) -> list:
+    """Apply an OCR function to each item on the pool, one page per task, returning texts in order.
+
+    Items not finished when the deadline passes come back empty. Queued ones
+    are cancelled, and if any are still running the pool is recycled and its
+    workers terminated, so a slow document cannot hold workers past its budget.
+    """
+    if OCR_WORKERS <= 1 or len(items) == 1:
+        page_texts = _run_inline(func, items, deadline)
+        return page_texts + [""] * (len(items) - len(page_texts))
+
+    pool = get_pool()
+    try:
+        futures = [pool.submit(func, item, TESSERACT_CMD) for item in items]
+    except BrokenProcessPool:
+        logger.error("OCR pool is broken; recreating it and running OCR inline")
+        _retire_pool(pool)
+        page_texts = _run_inline(func, items, deadline)
+        return page_texts + [""] * (len(items) - len(page_texts))
+
+    done, not_done = wait(futures, timeout=max(0, deadline - time.monotonic()))
+    if not_done:
+        running = sum(not future.cancel() for future in not_done)
+        logger.warning(f"OCR budget exhausted; {len(not_done)} of {len(futures)} pages dropped")
+        if running:
+            logger.warning(f"Recycling the OCR pool to stop {running} pages still running")
+            _retire_pool(pool, terminate=True)
+
+    page_texts = []
+    for index, future in enumerate(futures):
+        text = ""
+        if future in done:
+            try:
+                text = future.result()
+            except BrokenProcessPool:
+                logger.error("OCR worker died; recreating the pool")
+                _retire_pool(pool)
+            except CancelledError:
+                # The pool was recycled by another document that ran out of time
+                logger.warning(f"OCR of page {index + 1} was cancelled")
+            except Exception as e:
+                logger.error(f"OCR failed for page {index + 1}: {e}")
+        page_texts.append(text)
+    return page_texts
+
+
+def _page_ranges(page_numbers):
+    """Group sorted 1-based page numbers into (first, last) runs of consecutive pages."""
+    ranges = []
+    for page_number in page_numbers:
+        if ranges and ranges[-1][1] == page_number - 1:
+            ranges[-1][1] = page_number
+        else:
+            ranges.append([page_number, page_number])
+    return ranges
+
+
+def _page_window(pdf_info: dict) -> int:
+    """How many pages can be rendered at once without exceeding OCR_MAX_MEMORY_MB."""
+    match = re.match(r'([\d.]+) x ([\d.]+)', pdf_info.get('Page size', ''))
+    width_pts, height_pts = (float(match.group(1)), float(match.group(2))) if match else (612.0, 792.0)
+    page_bytes = (width_pts / 72 * OCR_DPI) * (height_pts / 72 * OCR_DPI) * OCR_BYTES_PER_PIXEL
+    fits = int(OCR_MAX_MEMORY_MB * 1024 * 1024 // page_bytes)
+    return max(1, min(fits, max(OCR_WORKERS, 1)))
+
+
+def ocr_pdf(pdf_bytes: bytes, page_numbers=None, timeout: float = None) -> list:
+    """OCR pages of a PDF, rendering a small window of pages at a time to temp files.
+
+    ``page_numbers`` are 1-based and default to every page. Returns one text
+    per requested page, in order. At most one window of rendered pages exists
+    at any time, which keeps peak memory bounded for long scanned documents.
+    """
+    from pdf2image import convert_from_bytes, pdfinfo_from_bytes
+
+    timeout = OCR_DOCUMENT_TIMEOUT if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+
+    pdf_info = pdfinfo_from_bytes(pdf_bytes)
+    if page_numbers is None:
+        page_numbers = range(1, int(pdf_info.get('Pages', 0)) + 1)
+    page_numbers = sorted(page_numbers)
+    window = _page_window(pdf_info)
+
+    page_texts = []
+    with tempfile.TemporaryDirectory(prefix='ocr-') as output_folder:
+        for start in range(0, len(page_numbers), window):
+            batch = page_numbers[start:start + window]
+            if time.monotonic() > deadline:
+                logger.warning(f"OCR budget exhausted; skipping {len(page_numbers) - start} pages")
+                break
+            paths = []
+            for first_page, last_page in _page_ranges(batch):
+                paths.extend(convert_from_bytes(
+                    pdf_bytes, dpi=OCR_DPI, first_page=first_page, last_page=last_page,
+                    output_folder=output_folder, output_file=f'page-{first_page:05d}',
+                    fmt='png', grayscale=True, paths_only=True,
+                ))
+            page_texts.extend(_run(ocr_page_file, paths, deadline))
+            for path in paths:
+                os.remove(path)
+
+    return page_texts + [""] * (len(page_numbers) - len(page_texts))
+
@@ -0,0 +1,71 @@
+import hashlib
+import logging
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.utils import timezone
+
+from .models import ParseCacheEntry
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on cached uploads; the least recently used entries are evicted first
+MAX_ENTRIES = getattr(settings, 'PARSE_CACHE_MAX_ENTRIES', 10000)
+
+
+def hash_bytes(file_bytes: bytes) -> str:
+    """Return the SHA-256 of an uploaded file's content."""
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+def lookup(content_hash: str):
+    """Return the cache entry for a content hash and mark it as recently used, or None."""
+    entry = ParseCacheEntry.objects.select_related('resume').filter(content_hash=content_hash).first()
+    if entry is not None:
+        entry.last_used_at = timezone.now()
+        ParseCacheEntry.objects.filter(pk=entry.pk).update(last_used_at=entry.last_used_at)
+    return entry
+
+
+def get_cached_parse(content_hash: str, vocabulary_version: str):
+    """Return ``(entry, current)`` for a content hash: its cache entry or None, and whether it can be served as is.
+
+    An entry is current when it has a saved resume and was matched against
+    ``vocabulary_version``; a stale one still carries the extracted text, so
+    only the matching has to be redone.
+    """
+    entry = lookup(content_hash)
+    return entry, bool(entry and entry.resume_id and entry.vocabulary_version == vocabulary_version)
+
+
+def store(content_hash: str, file_type: str, text: str, parsed_data: dict, resume, vocabulary_version: str):
+    """Insert or refresh the entry for a content hash, then enforce the size bound."""
+    values = {
+        'file_type': file_type,
+        'text': text,
+        'parsed_data': parsed_data,
+        'resume': resume,
+        'vocabulary_version': vocabulary_version,
+        'last_used_at': timezone.now(),
+    }
+    try:
+        ParseCacheEntry.objects.update_or_create(content_hash=content_hash, defaults=values)
+    except IntegrityError:
+        # A concurrent upload of the same file stored it first
+        logger.debug(f"Parse cache entry {content_hash[:12]} already stored")
+        return
+    evict()
+
+
+def evict(max_entries: int = None) -> int:
+    """Delete the least recently used entries beyond the size bound; returns how many were removed."""
+    max_entries = MAX_ENTRIES if max_entries is None else max_entries
+    excess = ParseCacheEntry.objects.count() - max_entries
+    if excess <= 0:
+        return 0
+    stale_ids = list(
+        ParseCacheEntry.objects.order_by('last_used_at').values_list('pk', flat=True)[:excess]
+    )
+    deleted, _ = ParseCacheEntry.objects.filter(pk__in=stale_ids).delete()
+    logger.info(f"Evicted {deleted} parse cache entries")
+    return deleted
@@ -0,0 +1,20 @@
+import io
+
+from pdfminer.high_level import extract_pages
+from pdfminer.layout import LTContainer, LTText, LTTextBox
+
+
+def _layout_text(item) -> str:
+    """Render a pdfminer layout item to text the way ``extract_text`` does."""
+    if isinstance(item, LTTextBox):
+        return ''.join(_layout_text(child) for child in item) + '\n'
+    if isinstance(item, LTContainer):
+        return ''.join(_layout_text(child) for child in item)
+    if isinstance(item, LTText):
+        return item.get_text()
+    return ''
+
+
+def page_texts(pdf_bytes: bytes) -> list:
+    """Text layer of each page of a PDF, in page order."""
+    return [_layout_text(page) for page in extract_pages(io.BytesIO(pdf_bytes))]
@@ -0,0 +1,50 @@
+import logging
+
+from .models import Resume, Skill
+
+logger = logging.getLogger(__name__)
+
+
+def split_skills(skills_text: str) -> set:
+    """Normalized skill names from a Resume.skills display string."""
+    if not skills_text or skills_text == "N/A":
+        return set()
+    return {name.strip().lower() for name in skills_text.split(',') if name.strip()}
+
+
+def get_skills(names) -> dict:
+    """Return Skill rows for the given normalized names, creating missing ones, keyed by name."""
+    names = set(names)
+    if not names:
+        return {}
+    existing = {skill.name: skill for skill in Skill.objects.filter(name__in=names)}
+    missing = names - existing.keys()
+    if missing:
+        # Concurrent parses may create the same skill; re-read instead of trusting the returned pks
+        Skill.objects.bulk_create([Skill(name=name) for name in missing], ignore_conflicts=True)
+        existing.update((skill.name, skill) for skill in Skill.objects.filter(name__in=missing))
+    return existing
+
+
+def sync_resume_skills(resume: Resume):
+    """Point a single resume's skill_set at the skills in its skills string."""
+    resume.skill_set.set(get_skills(split_skills(resume.skills)).values())
+
+
+def sync_skills_bulk(resumes) -> int:
+    """Replace skill_set links for many resumes with one delete and one insert; returns links written."""
+    resumes = list(resumes)
+    if not resumes:
+        return 0
+    names_by_resume = {resume.pk: split_skills(resume.skills) for resume in resumes}
+    skills = get_skills(set().union(*names_by_resume.values()))
+
+    Through = Resume.skill_set.through
+    Through.objects.filter(resume_id__in=names_by_resume).delete()
+    links = [
+        Through(resume_id=resume_id, skill_id=skills[name].pk)
+        for resume_id, names in names_by_resume.items()
+        for name in names
+    ]
+    Through.objects.bulk_create(links, ignore_conflicts=True)
+    return len(links)
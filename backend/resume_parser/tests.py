@@ -1,3 +1,295 @@
-from django.test import TestCase
+import io
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import zipfile
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase
+
+from .contact import HEADER_MAX_LINES, extract_contact_info
+from . import ingest, parse_cache
+from .docx_text import extract_docx_text
+from .matcher import PhraseMatcher
+from .models import ParseCacheEntry
 
 # Create your tests here.
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds a fresh interpreter may spend on django.setup() plus importing the views
+IMPORT_TIME_BUDGET = float(os.getenv('IMPORT_TIME_BUDGET', 2.0))
+
+# Libraries that must only be loaded when a request actually needs them
+DEFERRED_MODULES = [
+    'pdfminer', 'docx', 'pytesseract', 'pdf2image', 'PIL', 'google.generativeai', 'nltk',
+    'numpy',
+]
+
+IMPORT_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+import resume_parser.views, job_matcher.views, jobalign.urls
+elapsed = time.perf_counter() - started
+print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))
+"""
+
+
+class ImportTimeTests(SimpleTestCase):
+    """Startup cost of a worker: no heavy libraries and no network calls at import."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE))
+        # Best of three, so a cold disk cache on the first run does not fail the budget
+        runs = []
+        for _ in range(3):
+            output = subprocess.run(
+                [sys.executable, '-c', IMPORT_SCRIPT], cwd=BACKEND_DIR, env=env,
+                capture_output=True, text=True, check=True,
+            ).stdout
+            runs.append(json.loads(output.strip().splitlines()[-1]))
+        cls.elapsed = min(run['elapsed'] for run in runs)
+        cls.modules = set(runs[0]['modules'])
+
+    def test_heavy_libraries_are_deferred(self):
+        loaded = [name for name in DEFERRED_MODULES if name in self.modules]
+        self.assertEqual(loaded, [], f"Imported at startup: {', '.join(loaded)}")
+
+    def test_startup_within_budget(self):
+        self.assertLess(
+            self.elapsed, IMPORT_TIME_BUDGET,
+            f"Startup took {self.elapsed:.2f}s, budget is {IMPORT_TIME_BUDGET:.2f}s",
+        )
+
+
+def regex_find(phrases, text):
+    """What PhraseMatcher replaced: one word-boundary regex search per phrase."""
+    text_lower = text.lower()
+    return {phrase for phrase in phrases if phrase and re.search(r'\b' + re.escape(phrase.lower()) + r'\b', text_lower)}
+
+
+class PhraseMatcherTests(SimpleTestCase):
+    """The single-pass matcher finds exactly what the per-phrase regexes found."""
+
+    PHRASES = [
+        'Java', 'JavaScript', 'C', 'C++', 'C#', '.NET', 'Node.js', 'R', 'Go', 'SQL', 'NoSQL', 'MySQL',
+        'Machine Learning', 'Learning', 'Deep Learning', 'machine', 'data_science', 'Bachelor of Engineering',
+        'Engineering', 'AI', 'ai', 'A/B Testing', 'CI/CD', 'Résumé',
+    ]
+
+    def assertSameAsRegex(self, text, phrases=None):
+        phrases = self.PHRASES if phrases is None else phrases
+        self.assertEqual(PhraseMatcher(phrases).find(text), regex_find(phrases, text), text)
+
+    def test_word_boundaries(self):
+        for text in [
+            'Java and JavaScript', 'javascript only', 'Java.', '(Java)', 'Javas', 'xJava',
+            'C, C++ and C# developer', 'C++', 'c++11', 'learned C.', 'ASP.NET and .NET Core', 'node.js',
+            'NoSQL not SQL', 'MySQLdb', 'Go-lang and Go', 'R&D in R', 'data_science', 'big_data_science',
+            'CI/CD pipelines', 'A/B testing', '', '   ',
+        ]:
+            self.assertSameAsRegex(text)
+
+    def test_overlapping_phrases(self):
+        for text in [
+            'Machine Learning and Deep Learning', 'deep machine learning', 'machine-learning',
+            'Bachelor of Engineering (Computer Engineering)', 'engineering bachelor of engineering',
+            'learninglearning', 'machine machine learning',
+        ]:
+            self.assertSameAsRegex(text)
+        self.assertSameAsRegex('aaa ab aab', ['a', 'aa', 'aaa', 'ab', 'aab', 'b'])
+
+    def test_case_insensitive_and_spellings(self):
+        for text in ['PYTHON JAVA', 'Machine LEARNING', 'AI and ai', 'RÉSUMÉ', 'résumé writing']:
+            self.assertSameAsRegex(text)
+        # Every original spelling of a matched phrase is reported
+        self.assertEqual(PhraseMatcher(['AI', 'ai', 'Ai']).find('built AI tools'), {'AI', 'ai', 'Ai'})
+
+    def test_random_text(self):
+        rng = random.Random(1)
+        alphabet = ['a', 'b', 'c', ' ', '.', '+', '_', '-', 'A', '1']
+        phrases = {''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(40)}
+        phrases = [phrase for phrase in phrases if phrase.strip()]
+        for _ in range(300):
+            text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+            self.assertSameAsRegex(text, phrases)
+
+
+class ContactInfoTests(SimpleTestCase):
+    BODY = '\n'.join(f'Experience line {number}: built things' for number in range(HEADER_MAX_LINES * 2))
+
+    def test_header(self):
+        text = f'Jane Doe\njane.doe@example.com | +1 (555) 123-4567\n{self.BODY}'
+        self.assertEqual(extract_contact_info(text), {
+            'name': 'Jane Doe', 'email': 'jane.doe@example.com', 'phone': '+15551234567',
+        })
+
+    def test_footer_when_header_has_no_email(self):
+        text = f'Jane Doe\nSoftware Engineer\n{self.BODY}\nContact: Jane.Doe@Example.com, 555-123-4567'
+        self.assertEqual(extract_contact_info(text), {
+            'name': 'Jane Doe', 'email': 'jane.doe@example.com', 'phone': '5551234567',
+        })
+
+    def test_header_phone_kept_over_footer_phone(self):
+        text = f'Jane Doe\n+44 20 7946 0958\n{self.BODY}\njane@example.com 555-123-4567'
+        contact = extract_contact_info(text)
+        self.assertEqual(contact['phone'], '+442079460958')
+        self.assertEqual(contact['email'], 'jane@example.com')
+
+    def test_name_only_from_header(self):
+        text = f'{self.BODY}\nJane Doe\njane@example.com'
+        contact = extract_contact_info(text)
+        self.assertEqual(contact['name'], 'N/A')
+        self.assertEqual(contact['email'], 'jane@example.com')
+
+    def test_no_contact_details(self):
+        self.assertEqual(extract_contact_info(self.BODY)['email'], 'N/A')
+        self.assertEqual(extract_contact_info(''), {'name': 'N/A', 'email': 'N/A', 'phone': 'N/A'})
+
+
+WORD_NAMESPACES = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+)
+
+
+def word_part(body: str, root: str = 'w:document') -> str:
+    return f'<?xml version="1.0" encoding="UTF-8"?><{root} {WORD_NAMESPACES}>{body}</{root}>'
+
+
+def paragraph(text: str) -> str:
+    return f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p>'
+
+
+def cell(text: str, properties: str = '') -> str:
+    return f'<w:tc><w:tcPr>{properties}</w:tcPr>{paragraph(text)}</w:tc>'
+
+
+def make_docx(body: str, headers=(), footers=()) -> io.BytesIO:
+    """A DOCX holding only the parts the extractor reads."""
+    docx_file = io.BytesIO()
+    with zipfile.ZipFile(docx_file, 'w') as archive:
+        archive.writestr('word/document.xml', word_part(f'<w:body>{body}</w:body>'))
+        for number, text in enumerate(headers, 1):
+            archive.writestr(f'word/header{number}.xml', word_part(paragraph(text), 'w:hdr'))
+        for number, text in enumerate(footers, 1):
+            archive.writestr(f'word/footer{number}.xml', word_part(paragraph(text), 'w:ftr'))
+    docx_file.seek(0)
+    return docx_file
+
+
+class DocxTextTests(SimpleTestCase):
+    def test_paragraphs_and_special_characters(self):
+        body = (
+            paragraph('Jane Doe')
+            + '<w:p><w:r><w:t>Python</w:t><w:tab/><w:t>Django</w:t><w:br/><w:t>SQL</w:t></w:r></w:p>'
+            + '<w:p><w:r><w:t xml:space="preserve">   </w:t></w:r></w:p>'
+            + '<w:p><w:r><w:t>full</w:t><w:noBreakHyphen/><w:t>stack</w:t></w:r></w:p>'
+        )
+        self.assertEqual(extract_docx_text(make_docx(body)), 'Jane Doe\nPython\tDjango\nSQL\nfull-stack')
+
+    def test_grid_span_cell_read_once(self):
+        span = '<w:gridSpan w:val="2"/>'
+        body = (
+            '<w:tbl>'
+            f'<w:tr>{cell("Skills", span)}</w:tr>'
+            f'<w:tr>{cell("Python")}{cell("SQL")}</w:tr>'
+            '</w:tbl>'
+        )
+        self.assertEqual(extract_docx_text(make_docx(body)), 'Skills\nPython\nSQL')
+
+    def test_vertical_merge_continuations_skipped(self):
+        restart, bare, explicit = '<w:vMerge w:val="restart"/>', '<w:vMerge/>', '<w:vMerge w:val="continue"/>'
+        body = (
+            '<w:tbl>'
+            f'<w:tr>{cell("Acme Corp", restart)}{cell("2019")}</w:tr>'
+            f'<w:tr>{cell("Acme Corp", bare)}{cell("2020")}</w:tr>'
+            f'<w:tr>{cell("Beta Inc", explicit)}{cell("2021")}</w:tr>'
+            '</w:tbl>'
+        )
+        self.assertEqual(extract_docx_text(make_docx(body)), 'Acme Corp\n2019\n2020\n2021')
+
+    def test_alternate_content_fallback_skipped(self):
+        body = (
+            '<w:p><w:r><mc:AlternateContent>'
+            f'<mc:Choice Requires="wps"><w:txbxContent>{paragraph("Text box")}</w:txbxContent></mc:Choice>'
+            f'<mc:Fallback><w:pict><w:txbxContent>{paragraph("Text box")}</w:txbxContent></w:pict></mc:Fallback>'
+            '</mc:AlternateContent></w:r></w:p>'
+            + paragraph('After')
+        )
+        self.assertEqual(extract_docx_text(make_docx(body)), 'Text box\nAfter')
+
+    def test_headers_and_footers(self):
+        docx_file = make_docx(
+            paragraph('Body'), headers=['jane@example.com', 'jane@example.com'], footers=['Page footer'],
+        )
+        self.assertEqual(extract_docx_text(docx_file), 'jane@example.com\nBody\nPage footer')
+
+
+class FakePool:
+    """Stands in for the ingestion pool; a file named in ``crash`` kills its worker, breaking the pool."""
+
+    _max_workers = 2
+
+    def __init__(self, crash=()):
+        self.crash = set(crash)
+        self.broken = False
+        self.submitted = []
+        self.shut_down = False
+
+    def submit(self, func, name, file_bytes):
+        if self.broken:
+            raise BrokenProcessPool('A process in the process pool was terminated abruptly')
+        self.submitted.append(name)
+        future = Future()
+        if name in self.crash:
+            self.broken = True
+            future.set_exception(BrokenProcessPool('A process in the process pool was terminated abruptly'))
+        else:
+            future.set_result({'file': name, 'error': 'Unable to extract text from the file.'})
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+class IngestPoolTests(TestCase):
+    """A worker process dying fails only the files it had, and the shared pool is replaced."""
+
+    def setUp(self):
+        patcher = mock.patch.object(ingest, 'get_vocabulary', return_value=mock.Mock(version='test'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_broken_pool_is_replaced(self):
+        broken, fresh = FakePool(crash={'b.pdf'}), FakePool()
+        files = [(f'{name}.pdf', name.encode()) for name in 'abcde']
+        with mock.patch.object(ingest, '_pool', broken), mock.patch.object(ingest, 'create_pool', return_value=fresh):
+            results = ingest.ingest_files(files, pool=broken)
+            self.assertIsNone(ingest._pool)
+
+        errors = {result['file']: result['error'] for result in results}
+        self.assertEqual(sorted(errors), [name for name, _ in files])
+        self.assertIn('stopped', errors.pop('b.pdf'))
+        self.assertTrue(all('extract text' in error for error in errors.values()))
+        self.assertTrue(broken.shut_down)
+        self.assertTrue(fresh.shut_down)
+        self.assertEqual(fresh.submitted, ['c.pdf', 'd.pdf', 'e.pdf'])
+
+    def test_chunk_inserts_keep_the_parse_cache_bound(self):
+        files = [(f'{name}.docx', make_docx(paragraph(f'{name} Doe {name}@example.com Python')).getvalue())
+                 for name in ('Ann', 'Bob', 'Cid')]
+        with mock.patch.object(parse_cache, 'MAX_ENTRIES', 2):
+            results = ingest.ingest_files(files, chunk_size=1)
+        self.assertTrue(all('resume_id' in result for result in results), results)
+        self.assertEqual(ParseCacheEntry.objects.count(), 2)
@@ -21,4 +21,6 @@ from . import views
 urlpatterns = [
     path('upload/', views.upload_resume, name='upload_resume'),
     path('api/upload-resume/', views.api_upload_resume, name='api_upload_resume'),
+    path('api/upload-resume/<uuid:job_id>/', views.api_parse_job_status, name='api_parse_job_status'),
+    path('api/upload-resumes/', views.api_batch_upload_resumes, name='api_batch_upload_resumes'),
 ]
\ No newline at end of file
@@ -1,11 +1,28 @@
 import re
-import pdfminer.high_level
-import docx
-import nltk
 
-nltk.download('punkt')
+from django.conf import settings
+
+_nltk_ready = False
+
+def _load_nltk():
+    """Import nltk and fetch the punkt tokenizer on first use instead of at import."""
+    global _nltk_ready
+    import nltk
+
+    if not _nltk_ready:
+        nltk_data_path = getattr(settings, 'NLTK_DATA_PATH', None)
+        if nltk_data_path and nltk_data_path not in nltk.data.path:
+            nltk.data.path.append(nltk_data_path)
+        try:
+            nltk.data.find('tokenizers/punkt')
+        except LookupError:
+            nltk.download('punkt', download_dir=nltk_data_path, quiet=True)
+        _nltk_ready = True
+    return nltk
 
 def extract_text_from_pdf(pdf_path):
+    import pdfminer.high_level
+
     try:
         return pdfminer.high_level.extract_text(pdf_path)
     except Exception as e:
@@ -13,6 +30,8 @@ def extract_text_from_pdf(pdf_path):
         return ""
 
 def extract_text_from_docx(docx_path):
+    import docx
+
     try:
         doc = docx.Document(docx_path)
         return "\n".join([para.text for para in doc.paragraphs])
@@ -22,5 +41,5 @@ def extract_text_from_docx(docx_path):
 
 def clean_and_tokenize_text(text):
     text = re.sub(r'\s+', ' ', text)  # Remove extra whitespaces
-    tokens = nltk.word_tokenize(text)
+    tokens = _load_nltk().word_tokenize(text)
     return tokens
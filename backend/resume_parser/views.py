@@ -1,105 +1,37 @@
 from django.shortcuts import render, redirect
 from django.core.exceptions import ValidationError
 from django.contrib import messages
-from .models import Resume
+from .models import Resume, ParseJob
+from .jobs import enqueue_parse_job
+from . import ingest
+from .vocabulary import get_vocabulary
+from .contact import extract_contact_info
+from .docx_text import extract_docx_text
+from .ocr import ocr_pdf
+from . import parse_cache
+from .skills import sync_resume_skills
 import re
-from pdfminer.high_level import extract_text
-import docx
-import pytesseract
-from pdf2image import convert_from_bytes
-from PIL import Image
 import io
-import json
-import os
-import google.generativeai as genai
 from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
 import logging
-import tempfile
+import zipfile
 from django.http import JsonResponse
+from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Configure Gemini API
-try:
-    genai.configure(api_key=settings.GOOGLE_GEMINI_API_KEY)
-except AttributeError:
-    logger.error("Google Gemini API key is missing in settings.")
-    raise Exception("Google Gemini API key not configured.")
-
-# Cache file for skills and degrees
-CACHE_FILE = os.path.join(settings.BASE_DIR, "cached_skills_degrees.json")
 ALLOWED_EXTENSIONS = {'pdf', 'docx'}
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+# Most files accepted by one batch upload, across uploaded files and archive members
+BATCH_MAX_FILES = getattr(settings, 'BATCH_MAX_FILES', 200)
+# Pages with fewer characters in their text layer are treated as scanned
+MIN_PAGE_TEXT_CHARS = getattr(settings, 'PDF_MIN_PAGE_TEXT_CHARS', 50)
 
 
-def get_cached_data():
-    """Load skills and degrees from cache or fetch from Gemini API if not available."""
-    if os.path.exists(CACHE_FILE):
-        try:
-            with open(CACHE_FILE, "r") as file:
-                logger.debug(f"Loading cached data from {CACHE_FILE}")
-                data = json.load(file)
-                logger.debug(f"Loaded data: {data}")
-                return data
-        except (json.JSONDecodeError, IOError) as e:
-            logger.error(f"Failed to load cached data: {e}")
-            return fetch_skills_degrees_from_gemini()
-    logger.info(f"Cache file {CACHE_FILE} not found. Fetching from Gemini API.")
-    return fetch_skills_degrees_from_gemini()
-
-def fetch_skills_degrees_from_gemini():
-    """Fetch skills and degrees from Gemini API and cache them."""
-    prompt = """
-    Generate two JSON lists and return the result as a valid JSON string only, with no additional text, markdown, or formatting:
-    - "skills": A list of 5000 job-related skills across all industries, including both soft skills (e.g., Communication, Leadership) and technical skills (e.g., Python, Java, HTML, CSS, JavaScript, SQL, Django, React, Git, Github, MySQL, MongoDB, Tailwind CSS, Swift, Go, R, Node.js, AWS, Docker, Kubernetes, Machine Learning, Data Science).
-    - "degrees": A list of 150 academic degrees worldwide, including variations of engineering degrees (e.g., Bachelor of Engineering, BEng, Master of Engineering, MEng, Computer Engineering) and other common degrees (e.g., B.Tech, M.Sc, PhD, B.A., M.A.).
-    """
-    try:
-        logger.debug("Attempting to fetch data from Gemini API...")
-        model = genai.GenerativeModel("gemini-1.5-pro-latest")
-        response = model.generate_content(prompt)
-        logger.debug(f"Raw response from Gemini API: {response.text}")
-        # Clean the response to extract JSON
-        cleaned_response = response.text.strip()
-        cleaned_response = re.sub(r'```json\s*\n|\n\s*```', '', cleaned_response, flags=re.MULTILINE)
-        cleaned_response = re.sub(r'```\s*\n|\n\s*```', '', cleaned_response, flags=re.MULTILINE)
-        cleaned_response = re.sub(r'^.*?{', '{', cleaned_response, flags=re.DOTALL)
-        cleaned_response = re.sub(r'}[^}]*$', '}', cleaned_response, flags=re.DOTALL)
-        cleaned_response = cleaned_response.strip()
-        logger.debug(f"Cleaned response: {cleaned_response}")
-        # Parse the cleaned response as JSON
-        data = json.loads(cleaned_response)
-        logger.debug(f"Parsed JSON data: {data}")
-        if not isinstance(data, dict) or "skills" not in data or "degrees" not in data:
-            logger.error(f"Gemini API returned invalid data: {data}")
-            return {"skills": [], "degrees": []}
-        logger.debug(f"Writing to cache file: {CACHE_FILE}")
-        with open(CACHE_FILE, "w") as file:
-            json.dump(data, file, indent=4)
-        logger.info(f"Successfully created cache file: {CACHE_FILE}")
-        return data
-    except json.JSONDecodeError as e:
-        logger.error(f"JSON parsing error: {e}, Raw response: {response.text}")
-        return {"skills": [], "degrees": []}
-    except Exception as e:
-        logger.error(f"Gemini API error: {e}")
-        return {"skills": [], "degrees": []}
-
-CACHED_DATA = get_cached_data()
-ALL_SKILLS = set(CACHED_DATA.get("skills", []))
-ALL_DEGREES = set(CACHED_DATA.get("degrees", []))
-logger.debug(f"ALL_SKILLS: {ALL_SKILLS}")
-logger.debug(f"ALL_DEGREES: {ALL_DEGREES}")
-
-
-# Path to Tesseract executable (make configurable)
-TESSERACT_CMD = getattr(settings, 'TESSERACT_CMD', r'C:\Program Files\Tesseract-OCR\tesseract.exe')
-pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
-
 # File validation
 def validate_file(uploaded_file: UploadedFile):
     """Validate file type and size."""
@@ -115,80 +47,49 @@ def validate_file(uploaded_file: UploadedFile):
 
 # PDF text extraction
 def extract_text_from_pdf(pdf_file: UploadedFile) -> str:
-    """Extract text from a PDF file using pdfminer and OCR."""
+    """Extract text from a PDF page by page, running OCR only on pages without a usable text layer."""
+    # pdfminer is only loaded once a PDF is actually parsed
+    from .pdf_text import page_texts as read_page_texts
+
     try:
-        # First try pdfminer
         pdf_bytes = pdf_file.read()
-        pdf_stream = io.BytesIO(pdf_bytes)
-        text = extract_text(pdf_stream)
-        
-        # If pdfminer fails or returns very little text, try OCR
-        if not text or len(text.strip()) < 100:  # If less than 100 characters
-            logger.debug("PDF text extraction returned little text, trying OCR")
-            pdf_file.seek(0)  # Reset file pointer
-            return extract_text_with_ocr(pdf_file)
-            
-        return text
+        page_texts = read_page_texts(pdf_bytes)
     except Exception as e:
         logger.error(f"Error extracting text from PDF: {e}")
         return ""
 
+    # 1-based numbers of pages whose text layer is missing or too thin to trust
+    scanned_pages = [
+        index + 1 for index, text in enumerate(page_texts)
+        if len(text.strip()) < MIN_PAGE_TEXT_CHARS
+    ]
+    if scanned_pages:
+        logger.debug(f"OCR needed for {len(scanned_pages)} of {len(page_texts)} PDF pages")
+        try:
+            for page_number, ocr_text in zip(scanned_pages, ocr_pdf(pdf_bytes, scanned_pages)):
+                # Keep whatever text layer there was unless OCR found more
+                if len(ocr_text.strip()) > len(page_texts[page_number - 1].strip()):
+                    page_texts[page_number - 1] = ocr_text
+        except Exception as e:
+            logger.error(f"OCR extraction failed: {e}")
+
+    return "\n".join(text.strip() for text in page_texts if text.strip())
+
 # OCR for scanned PDFs
 def extract_text_with_ocr(pdf_file: UploadedFile) -> str:
-    """Extract text from PDF using OCR with improved settings."""
+    """Extract text from every page of a PDF using OCR, one page per worker process."""
     try:
         pdf_bytes = pdf_file.read()
-        images = convert_from_bytes(pdf_bytes)
-        text = ""
-        
-        for img in images:
-            # Convert to grayscale for better OCR
-            img = img.convert('L')
-            # Enhance contrast
-            img = img.point(lambda x: 0 if x < 128 else 255, '1')
-            
-            # Try different OCR configurations
-            configs = [
-                '--psm 6',  # Assume a single uniform block of text
-                '--psm 3',  # Fully automatic page segmentation
-                '--psm 4',  # Assume a single column of text
-            ]
-            
-            for config in configs:
-                try:
-                    ocr_text = pytesseract.image_to_string(img, config=config)
-                    if ocr_text.strip():
-                        text += ocr_text + "\n"
-                        break
-                except Exception as e:
-                    logger.error(f"OCR failed with config {config}: {e}")
-                    continue
-        
-        return text.strip()
+        return "\n".join(text for text in ocr_pdf(pdf_bytes) if text).strip()
     except Exception as e:
         logger.error(f"OCR extraction failed: {e}")
         return ""
 
 # DOCX text extraction
 def extract_text_from_docx(docx_file: UploadedFile) -> str:
-    """Extract text from a DOCX file with improved handling."""
+    """Extract text from a DOCX file by streaming its XML, without building the python-docx object model."""
     try:
-        doc = docx.Document(docx_file)
-        text = []
-        
-        # Extract text from paragraphs
-        for para in doc.paragraphs:
-            if para.text.strip():
-                text.append(para.text)
-        
-        # Extract text from tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    if cell.text.strip():
-                        text.append(cell.text)
-        
-        return "\n".join(text)
+        return extract_docx_text(docx_file)
     except Exception as e:
         logger.error(f"Error reading DOCX: {e}")
         return ""
@@ -213,45 +114,32 @@ def preprocess_text(text: str) -> str:
 # Field extraction
 def extract_skills(text: str) -> str:
     """Extract skills by matching against the cached skills list."""
-    if not ALL_SKILLS:
+    vocabulary = get_vocabulary()
+    if not vocabulary.skills:
         logger.warning("Skills list is empty. Check Gemini API or cache.")
         return "N/A"
-    text_lower = text.lower()
-    matched_skills = set()
-    for skill in ALL_SKILLS:
-        skill_lower = skill.lower()
-        # Match whole words to avoid partial matches (e.g., "Java" in "JavaScript")
-        # Use word boundaries and ensure the skill is a standalone word or phrase
-        pattern = r'\b' + re.escape(skill_lower) + r'\b'
-        if re.search(pattern, text_lower):
-            matched_skills.add(skill)
+    # Whole-word matches only, so "Java" is not found inside "JavaScript"
+    matched_skills = vocabulary.skill_matcher.find(text)
     logger.debug(f"Matched Skills: {matched_skills}")
     return ', '.join(sorted(matched_skills)) if matched_skills else "N/A"
 
 def extract_education(text: str) -> str:
     """Extract education by matching against the cached degrees list."""
-    if not ALL_DEGREES:
+    vocabulary = get_vocabulary()
+    if not vocabulary.degrees:
         logger.warning("Degrees list is empty. Check Gemini API or cache.")
         return "N/A"
     text_lower = text.lower()
-    matched_degrees = set()
-    for degree in ALL_DEGREES:
-        degree_lower = degree.lower()
-        # Match whole phrases with word boundaries
-        pattern = r'\b' + re.escape(degree_lower) + r'\b'
-        if re.search(pattern, text_lower):
-            matched_degrees.add(degree)
-        # Handle variations for engineering degrees
-        elif "bachelor of engineering" in degree_lower and "bachelor of engineering" in text_lower:
-            matched_degrees.add(degree)
-        elif "beng" in degree_lower and "bachelor of engineering" in text_lower:
-            matched_degrees.add(degree)
-        # Match "Computer Engineering" specifically
-        elif "computer engineering" in degree_lower and "computer engineering" in text_lower:
-            matched_degrees.add(degree)
+    matched_degrees = vocabulary.degree_matcher.find(text)
+    # Handle variations for engineering degrees
+    for text_phrase, degrees in vocabulary.degree_variations.items():
+        if text_phrase in text_lower:
+            matched_degrees.update(degrees)
     logger.debug(f"Matched Degrees: {matched_degrees}")
     return ', '.join(sorted(matched_degrees)) if matched_degrees else "N/A"
 
+# Per-pattern contact extractors, superseded by contact.extract_contact_info and
+# kept as the baseline for the benchmark_contact management command
 def extract_name(text: str) -> str:
     """Extract name from resume text using common resume patterns."""
     try:
@@ -374,6 +262,68 @@ def extract_phone(text: str) -> str:
         logger.error(f"Error extracting phone: {e}")
     return "N/A"
 
+def extract_resume_text(uploaded_file, file_type: str) -> str:
+    """Extract raw text from an uploaded PDF or DOCX file."""
+    file_text = ""
+    if file_type == 'pdf':
+        logger.debug("Processing PDF file")
+        # Pages without a text layer are OCR'd inside, so there is no second pass here
+        file_text = extract_text_from_pdf(uploaded_file)
+    elif file_type == 'docx':
+        logger.debug("Processing DOCX file")
+        file_text = extract_text_from_docx(uploaded_file)
+    return file_text
+
+def parse_resume_text(file_text: str) -> dict:
+    """Preprocess extracted text and pull out the resume fields."""
+    cleaned_text = preprocess_text(file_text)
+    logger.debug(f"Cleaned Text length: {len(cleaned_text)}")
+
+    parsed_data = {
+        # Contact details are read from the raw text, where line breaks still mark the header
+        **extract_contact_info(file_text),
+        'skills': extract_skills(cleaned_text) or "N/A",
+        'education': extract_education(cleaned_text) or "N/A",
+    }
+    logger.debug(f"Parsed Data: {parsed_data}")
+    return parsed_data
+
+def parse_resume_upload(uploaded_file):
+    """Extract, parse and save an upload, reusing earlier results for an identical file.
+
+    Returns ``(parsed_data, resume)``, or ``(None, None)`` if no text could be extracted.
+    """
+    # Read the upload once; hashing and extraction share the same bytes
+    file_bytes = uploaded_file.read()
+    content_hash = parse_cache.hash_bytes(file_bytes)
+    entry, current = parse_cache.get_cached_parse(content_hash, get_vocabulary().version)
+    if current:
+        logger.debug(f"Parse cache hit for {content_hash[:12]}")
+        return entry.parsed_data, entry.resume
+
+    file_type = uploaded_file.name.split('.')[-1].lower()
+    if entry:
+        # Same file, different vocabulary: only the matching has to be redone
+        file_text = entry.text
+    else:
+        file_text = extract_resume_text(io.BytesIO(file_bytes), file_type)
+    if not file_text.strip():
+        return None, None
+
+    # Preprocess and parse the text
+    parsed_data = parse_resume_text(file_text)
+
+    # Save to database, updating the row created for an earlier upload of this file
+    resume_instance = entry.resume if entry and entry.resume else Resume()
+    for field, value in parsed_data.items():
+        setattr(resume_instance, field, value)
+    resume_instance.full_clean()
+    resume_instance.save()
+    sync_resume_skills(resume_instance)
+
+    parse_cache.store(content_hash, file_type, file_text, parsed_data, resume_instance, get_vocabulary().version)
+    return parsed_data, resume_instance
+
 # Main parsing logic
 def upload_resume(request):
     """Handle resume upload, parsing, and storage."""
@@ -390,48 +340,16 @@ def upload_resume(request):
         uploaded_file = request.FILES.get('resume')
         validate_file(uploaded_file)
 
-        file_type = uploaded_file.name.split('.')[-1].lower()
-        file_text = ""
-
-        # Extract text based on file type
-        if file_type == 'pdf':
-            file_text = extract_text_from_pdf(uploaded_file)
-            if not file_text.strip():
-                uploaded_file.seek(0)  # Reset file pointer
-                file_text = extract_text_with_ocr(uploaded_file)
-        elif file_type == 'docx':
-            file_text = extract_text_from_docx(uploaded_file)
-
-        if not file_text.strip():
-            messages.error(request, "Unable to extract text from the file. Please try a different file.")
-            return redirect('upload_resume')
-
-        # Preprocess and parse the text
-        cleaned_text = preprocess_text(file_text)
-        logger.debug(f"Cleaned Text: {cleaned_text}")
-
-        parsed_data = {
-            'name': extract_name(cleaned_text),
-            'email': extract_email(cleaned_text),
-            'phone': extract_phone(cleaned_text),
-            'skills': extract_skills(cleaned_text) or "N/A",
-            'education': extract_education(cleaned_text) or "N/A",
-        }
-
-        logger.debug(f"Parsed Data: {parsed_data}")
-
-        # Save to database with validation
+        # Extract, parse and save with validation
         try:
-            resume_instance = Resume(**parsed_data)
-            resume_instance.full_clean()  # Validate the instance
-            resume_instance.save()
+            parsed_data, resume_instance = parse_resume_upload(uploaded_file)
         except ValidationError as ve:
             logger.error(f"Validation error saving resume: {ve}")
             messages.error(request, f"Invalid data in resume: {str(ve)}. Please check the file and try again.")
             return redirect('upload_resume')
-        except Exception as e:
-            logger.error(f"Error saving to database: {e}")
-            messages.error(request, "Error saving resume data. Please try again.")
+
+        if parsed_data is None:
+            messages.error(request, "Unable to extract text from the file. Please try a different file.")
             return redirect('upload_resume')
 
         messages.success(request, "Resume parsed and saved successfully!")
@@ -469,46 +387,33 @@ def api_upload_resume(request):
         
         validate_file(uploaded_file)
 
-        file_type = uploaded_file.name.split('.')[-1].lower()
-        file_text = ""
-
-        # Extract text based on file type
-        if file_type == 'pdf':
-            logger.debug("Processing PDF file")
-            file_text = extract_text_from_pdf(uploaded_file)
-            if not file_text.strip():
-                logger.debug("PDF text extraction failed, trying OCR")
-                uploaded_file.seek(0)  # Reset file pointer
-                file_text = extract_text_with_ocr(uploaded_file)
-        elif file_type == 'docx':
-            logger.debug("Processing DOCX file")
-            file_text = extract_text_from_docx(uploaded_file)
-
-        if not file_text.strip():
+        # Hand the file to the background parse workers and return immediately,
+        # unless the same file has already been parsed
+        if is_async_request(request):
+            file_bytes = uploaded_file.read()
+            entry, current = parse_cache.get_cached_parse(parse_cache.hash_bytes(file_bytes), get_vocabulary().version)
+            if current:
+                return JsonResponse({
+                    'status': 'success',
+                    'message': 'Resume parsed successfully',
+                    'data': entry.parsed_data
+                })
+            job = enqueue_parse_job(uploaded_file.name, file_bytes)
+            return JsonResponse({
+                'status': job.status,
+                'message': 'Resume queued for parsing',
+                'job_id': str(job.id),
+                'status_url': reverse('api_parse_job_status', args=[job.id]),
+            }, status=202)
+
+        parsed_data, resume_instance = parse_resume_upload(uploaded_file)
+
+        if parsed_data is None:
             logger.error("Failed to extract text from file")
             return JsonResponse({
                 'error': 'Unable to extract text from the file. Please try a different file.'
             }, status=400)
 
-        # Preprocess and parse the text
-        cleaned_text = preprocess_text(file_text)
-        logger.debug(f"Cleaned Text length: {len(cleaned_text)}")
-
-        parsed_data = {
-            'name': extract_name(cleaned_text),
-            'email': extract_email(cleaned_text),
-            'phone': extract_phone(cleaned_text),
-            'skills': extract_skills(cleaned_text) or "N/A",
-            'education': extract_education(cleaned_text) or "N/A",
-        }
-
-        logger.debug(f"Parsed Data: {parsed_data}")
-
-        # Save to database
-        resume_instance = Resume(**parsed_data)
-        resume_instance.full_clean()
-        resume_instance.save()
-
         return JsonResponse({
             'status': 'success',
             'message': 'Resume parsed successfully',
@@ -526,4 +431,125 @@ def api_upload_resume(request):
             'error': 'An unexpected error occurred. Please try again later.'
         }, status=500)
 
+def batch_files(uploads, zip_archive, entries, results):
+    """Yield (name, bytes) for validated uploads, then archive entries, reading each only when it is parsed.
+
+    Archive entries that fail to decompress get an error in ``results``.
+    """
+    for uploaded_file in uploads:
+        yield uploaded_file.name, uploaded_file.read()
+    for info in entries:
+        try:
+            file_bytes = zip_archive.read(info)
+        except zipfile.BadZipFile as e:
+            logger.warning(f"Unreadable archive entry {info.filename}: {e}")
+            results.append({'file': info.filename, 'error': 'File could not be read from the archive.'})
+            continue
+        yield info.filename, file_bytes
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def api_batch_upload_resumes(request):
+    """API endpoint for parsing many resumes at once, sent as ``resumes`` files and/or a zip ``archive``."""
+    try:
+        uploads = request.FILES.getlist('resumes')
+        if len(uploads) > BATCH_MAX_FILES:
+            return JsonResponse({
+                'error': f'Too many files. Maximum {BATCH_MAX_FILES} files per batch.'
+            }, status=400)
 
+        valid_uploads = []
+        results = []
+        for uploaded_file in uploads:
+            try:
+                validate_file(uploaded_file)
+            except ValidationError as ve:
+                results.append({'file': uploaded_file.name, 'error': ' '.join(ve.messages)})
+                continue
+            valid_uploads.append(uploaded_file)
+
+        archive = request.FILES.get('archive')
+        zip_archive = None
+        entries = []
+        if archive:
+            if not zipfile.is_zipfile(archive):
+                return JsonResponse({
+                    'error': 'Archive must be a zip file'
+                }, status=400)
+            zip_archive = zipfile.ZipFile(archive)
+        try:
+            if zip_archive is not None:
+                # Counted and size-checked from the zip directory before any entry is decompressed
+                try:
+                    entries = ingest.zip_resume_entries(zip_archive, BATCH_MAX_FILES - len(uploads))
+                except ingest.TooManyFiles as e:
+                    logger.info(f"Rejected batch archive: {e}")
+                    return JsonResponse({
+                        'error': f'Too many files. Maximum {BATCH_MAX_FILES} files per batch.'
+                    }, status=400)
+                for info in [info for info in entries if info.file_size > MAX_FILE_SIZE]:
+                    results.append({
+                        'file': info.filename,
+                        'error': f"File too large. Maximum size allowed is {MAX_FILE_SIZE / (1024 * 1024)} MB."
+                    })
+                entries = [info for info in entries if info.file_size <= MAX_FILE_SIZE]
+
+            file_count = len(valid_uploads) + len(entries)
+            if not file_count and not results:
+                return JsonResponse({
+                    'error': 'No files uploaded'
+                }, status=400)
+
+            logger.info(f"Batch upload of {file_count} files")
+            files = batch_files(valid_uploads, zip_archive, entries, results)
+            results.extend(ingest.ingest_files(files, pool=ingest.get_pool() if file_count > 1 else None))
+        finally:
+            if zip_archive is not None:
+                zip_archive.close()
+        failed = sum(1 for result in results if 'error' in result)
+        return JsonResponse({
+            'status': 'success',
+            'message': f'Parsed {len(results) - failed} of {len(results)} resumes',
+            'succeeded': len(results) - failed,
+            'failed': failed,
+            'results': results,
+        })
+
+    except zipfile.BadZipFile as e:
+        logger.error(f"Corrupt archive in batch upload: {e}")
+        return JsonResponse({
+            'error': 'Archive could not be read'
+        }, status=400)
+    except Exception as e:
+        logger.error(f"Unexpected error in api_batch_upload_resumes: {str(e)}", exc_info=True)
+        return JsonResponse({
+            'error': 'An unexpected error occurred. Please try again later.'
+        }, status=500)
+
+def is_async_request(request) -> bool:
+    """Whether the client asked for background parsing via an ``async`` flag."""
+    flag = request.POST.get('async') or request.GET.get('async') or ''
+    return flag.lower() in ('1', 'true', 'yes')
+
+@require_http_methods(["GET"])
+def api_parse_job_status(request, job_id):
+    """API endpoint for polling the status and result of a queued resume parse."""
+    try:
+        job = ParseJob.objects.get(pk=job_id)
+    except ParseJob.DoesNotExist:
+        return JsonResponse({
+            'error': 'Parse job not found'
+        }, status=404)
+
+    response = {
+        'job_id': str(job.id),
+        'status': job.status,
+        'created_at': job.created_at.isoformat(),
+        'updated_at': job.updated_at.isoformat(),
+    }
+    if job.status == ParseJob.STATUS_DONE:
+        response['message'] = 'Resume parsed successfully'
+        response['data'] = job.result
+    elif job.status == ParseJob.STATUS_FAILED:
+        response['error'] = job.error
+    return JsonResponse(response)
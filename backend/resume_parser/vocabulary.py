@@ -0,0 +1,207 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+from .matcher import PhraseMatcher
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the in-process lock only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Cache file for skills and degrees
+CACHE_FILE = os.path.join(settings.BASE_DIR, "cached_skills_degrees.json")
+LOCK_FILE = CACHE_FILE + ".lock"
+# Seconds to wait before asking Gemini again after a failed rebuild
+RETRY_INTERVAL = getattr(settings, 'VOCABULARY_RETRY_INTERVAL', 60)
+
+_lock = threading.Lock()
+_vocabulary = None
+_last_failure = None
+
+
+class Vocabulary:
+    """A snapshot of the skills/degrees artifact and its compiled matchers."""
+
+    def __init__(self, data: dict, version: str, mtime: float = None):
+        self.skills = set(data.get("skills", []))
+        self.degrees = set(data.get("degrees", []))
+        self.version = version
+        self.mtime = mtime
+        # Lowercased skills in a fixed order: a skill's position is its bit in job skill bitsets
+        self.skill_names = sorted({skill.lower() for skill in self.skills})
+        self.skill_index = {name: position for position, name in enumerate(self.skill_names)}
+        # Compile the vocabularies once so each upload is matched in a single pass
+        self.skill_matcher = PhraseMatcher(self.skills)
+        self.degree_matcher = PhraseMatcher(self.degrees)
+        # Degrees also reported when the text merely contains a phrase,
+        # e.g. "BEng" whenever "bachelor of engineering" appears anywhere
+        self.degree_variations = {
+            "bachelor of engineering": {
+                degree for degree in self.degrees
+                if "bachelor of engineering" in degree.lower() or "beng" in degree.lower()
+            },
+            "computer engineering": {
+                degree for degree in self.degrees if "computer engineering" in degree.lower()
+            },
+        }
+
+    def __repr__(self):
+        return f"Vocabulary(version={self.version}, skills={len(self.skills)}, degrees={len(self.degrees)})"
+
+
+def _checksum(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+class _FileLock:
+    """Cross-process exclusive lock so only one worker rebuilds the artifact."""
+
+    def __enter__(self):
+        self._fd = os.open(LOCK_FILE, os.O_CREAT | os.O_RDWR)
+        if fcntl:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+
+
+def _read_artifact():
+    """Return (data, version, mtime) for the cache file, or None if it is missing or invalid."""
+    try:
+        mtime = os.stat(CACHE_FILE).st_mtime
+        with open(CACHE_FILE, "rb") as file:
+            raw = file.read()
+        data = json.loads(raw)
+    except FileNotFoundError:
+        return None
+    except (json.JSONDecodeError, UnicodeDecodeError, IOError) as e:
+        logger.error(f"Failed to load cached data: {e}")
+        return None
+    if not isinstance(data, dict) or "skills" not in data or "degrees" not in data:
+        logger.error(f"Cache file {CACHE_FILE} does not contain skills and degrees")
+        return None
+    return data, _checksum(raw), mtime
+
+
+def _write_artifact(data: dict):
+    """Atomically replace the cache file so readers never see a partial write."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(CACHE_FILE), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as file:
+            json.dump(data, file, indent=4)
+        os.replace(tmp_path, CACHE_FILE)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    logger.info(f"Successfully created cache file: {CACHE_FILE}")
+
+
+def fetch_skills_degrees_from_gemini():
+    """Fetch skills and degrees from Gemini API."""
+    import google.generativeai as genai
+
+    prompt = """
+    Generate two JSON lists and return the result as a valid JSON string only, with no additional text, markdown, or formatting:
+    - "skills": A list of 5000 job-related skills across all industries, including both soft skills (e.g., Communication, Leadership) and technical skills (e.g., Python, Java, HTML, CSS, JavaScript, SQL, Django, React, Git, Github, MySQL, MongoDB, Tailwind CSS, Swift, Go, R, Node.js, AWS, Docker, Kubernetes, Machine Learning, Data Science).
+    - "degrees": A list of 150 academic degrees worldwide, including variations of engineering degrees (e.g., Bachelor of Engineering, BEng, Master of Engineering, MEng, Computer Engineering) and other common degrees (e.g., B.Tech, M.Sc, PhD, B.A., M.A.).
+    """
+    response = None
+    try:
+        logger.debug("Attempting to fetch data from Gemini API...")
+        genai.configure(api_key=settings.GOOGLE_GEMINI_API_KEY)
+        model = genai.GenerativeModel("gemini-1.5-pro-latest")
+        response = model.generate_content(prompt)
+        logger.debug(f"Raw response from Gemini API: {response.text}")
+        # Clean the response to extract JSON
+        cleaned_response = response.text.strip()
+        cleaned_response = re.sub(r'```json\s*\n|\n\s*```', '', cleaned_response, flags=re.MULTILINE)
+        cleaned_response = re.sub(r'```\s*\n|\n\s*```', '', cleaned_response, flags=re.MULTILINE)
+        cleaned_response = re.sub(r'^.*?{', '{', cleaned_response, flags=re.DOTALL)
+        cleaned_response = re.sub(r'}[^}]*$', '}', cleaned_response, flags=re.DOTALL)
+        cleaned_response = cleaned_response.strip()
+        logger.debug(f"Cleaned response: {cleaned_response}")
+        # Parse the cleaned response as JSON
+        data = json.loads(cleaned_response)
+        if not isinstance(data, dict) or "skills" not in data or "degrees" not in data:
+            logger.error(f"Gemini API returned invalid data: {data}")
+            return None
+        return data
+    except json.JSONDecodeError as e:
+        logger.error(f"JSON parsing error: {e}, Raw response: {response.text if response else ''}")
+        return None
+    except Exception as e:
+        logger.error(f"Gemini API error: {e}")
+        return None
+
+
+def _rebuild_artifact():
+    """Regenerate the cache file, letting only one process call Gemini at a time."""
+    with _FileLock():
+        # Another worker may have written the file while we waited for the lock
+        artifact = _read_artifact()
+        if artifact:
+            return artifact
+        logger.info(f"Cache file {CACHE_FILE} missing or invalid. Fetching from Gemini API.")
+        data = fetch_skills_degrees_from_gemini()
+        if data is None:
+            return None
+        _write_artifact(data)
+        return _read_artifact()
+
+
+def get_vocabulary() -> Vocabulary:
+    """Return the current vocabulary, loading it on first use and reloading it when the file changes."""
+    global _vocabulary, _last_failure
+
+    try:
+        mtime = os.stat(CACHE_FILE).st_mtime
+    except OSError:
+        mtime = None
+
+    current = _vocabulary
+    if current is not None and mtime is not None and current.mtime == mtime:
+        return current
+
+    with _lock:
+        current = _vocabulary
+        if current is not None and mtime is not None and current.mtime == mtime:
+            return current
+
+        artifact = _read_artifact() if mtime is not None else None
+        retry_due = _last_failure is None or time.monotonic() - _last_failure >= RETRY_INTERVAL
+        if artifact is None and retry_due:
+            artifact = _rebuild_artifact()
+            if artifact is None:
+                _last_failure = time.monotonic()
+        if artifact is None:
+            if current is not None:
+                logger.warning("Keeping previously loaded vocabulary; cache file is unusable.")
+                # Do not re-read the broken file until it changes again
+                current.mtime = mtime
+                return current
+            # Not cached, so a request after RETRY_INTERVAL tries again
+            return Vocabulary({"skills": [], "degrees": []}, version="empty")
+
+        data, version, loaded_mtime = artifact
+        if current is not None and current.version == version:
+            # Touched but unchanged: keep the compiled matchers
+            current.mtime = loaded_mtime
+            return current
+
+        _vocabulary = Vocabulary(data, version=version, mtime=loaded_mtime)
+        logger.info(f"Loaded {_vocabulary}")
+        return _vocabulary